@@ -0,0 +1,306 @@
+import atexit
+import json
+import os
+import sys
+import time
+from collections import deque
+from threading import Lock, Thread
+
+# Formatos de registro admitidos
+LOG_FORMATS = ("common", "combined", "json")
+
+# Registros que pueden esperar al hilo escritor; los que excedan se descartan
+DEFAULT_QUEUE_SIZE = 16384
+
+# Segundos máximos que un registro espera en el buffer antes de escribirse
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Bytes acumulados a partir de los cuales se escribe sin esperar al intervalo
+DEFAULT_FLUSH_BYTES = 64 * 1024
+
+# Segundos entre revisiones de la cola por parte del hilo escritor
+POLL_INTERVAL = 0.05
+
+# Segundos máximos que close() espera a que el hilo escritor vacíe la cola
+CLOSE_TIMEOUT = 5
+
+# Registros formateados seguidos antes de ceder el GIL a los hilos que atienden solicitudes
+FORMAT_SLICE = 64
+
+# Nombres abreviados de los meses para la fecha del Common Log Format
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+class AccessLog:
+    """
+    Registro de accesos asíncrono. Los hilos que atienden solicitudes solo agregan
+    una tupla a una cola (deque.append es atómico, no toma candados) y nunca se
+    bloquean: si la cola está llena el registro se descarta y se cuenta en dropped.
+    Un hilo escritor formatea los registros, los escribe en lotes con un único
+    write y rota el archivo al superar max_bytes.
+
+    Con varios procesos escribiendo el mismo archivo (multiprocess_server) solo el
+    supervisor rota, llamando a rotate_if_needed; los procesos marcan
+    external_rotation y reabren el archivo cuando detectan que fue renombrado.
+
+    Atributos:
+      path           -> Ruta del archivo ("-" para la salida estándar)
+      log_format     -> "common", "combined" o "json"
+      queue_size     -> Registros que pueden esperar a ser escritos
+      flush_interval -> Segundos máximos entre escrituras
+      flush_bytes    -> Bytes acumulados que fuerzan una escritura
+      max_bytes      -> Tamaño a partir del cual se rota el archivo (0 para no rotar)
+      backups        -> Archivos rotados que se conservan (path.1, path.2, ...)
+      external_rotation -> Si es True la rotación la hace otro proceso (ver rotate_if_needed)
+      dropped        -> Registros descartados (cola llena, error de escritura o tras close)
+      written        -> Registros escritos
+    """
+
+    def __init__(
+        self,
+        path="-",
+        log_format="combined",
+        queue_size=DEFAULT_QUEUE_SIZE,
+        flush_interval=DEFAULT_FLUSH_INTERVAL,
+        flush_bytes=DEFAULT_FLUSH_BYTES,
+        max_bytes=0,
+        backups=5,
+    ):
+        if log_format not in LOG_FORMATS:
+            raise ValueError(f"Unknown access log format: {log_format}")
+        self.path = path
+        self.log_format = log_format
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.external_rotation = False
+        self.dropped = 0
+        self.written = 0
+        self._queue = deque()
+        self._dropped_lock = Lock()
+        self._start_lock = Lock()
+        self._thread = None
+        self._running = False
+        self._file = None
+
+    def log(self, address, method, uri, version, status, sent, duration, referer="-", user_agent="-"):
+        """
+        Encola un registro de acceso sin bloquear. El formato se aplica en el hilo escritor.
+
+        Parámetros:
+          address    -> (host, puerto) del cliente
+          method     -> Método de la solicitud ("-" si no pudo analizarse)
+          uri        -> URI solicitada
+          version    -> Versión HTTP de la solicitud
+          status     -> Código de estado de tres dígitos
+          sent       -> Bytes enviados (encabezados incluidos)
+          duration   -> Segundos desde el análisis hasta el último byte enviado
+          referer    -> Encabezado Referer
+          user_agent -> Encabezado User-Agent
+        """
+        if self._thread is None:
+            self._start()
+        if len(self._queue) >= self.queue_size or not self._running:
+            with self._dropped_lock:
+                self.dropped += 1
+            return
+        self._queue.append(
+            (time.time(), address, method, uri, version, status, sent, duration, referer, user_agent)
+        )
+
+    def _start(self):
+        """
+        Inicia el hilo escritor en el primer registro (y no al crear el objeto, de modo
+        que cada proceso de multiprocess_server inicia el suyo después del fork).
+        """
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._running = True
+            self._thread = Thread(target=self._run, name="access-log", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def close(self):
+        """
+        Detiene el hilo escritor y espera a que escriba los registros pendientes.
+        Se registra con atexit, pero quien termine el proceso con os._exit debe
+        llamarla explícitamente (ver multiprocess_server.worker_cleanup). Los registros
+        que no alcanzan a escribirse en CLOSE_TIMEOUT se cuentan en dropped.
+        """
+        thread = self._thread
+        if thread is None or not self._running:
+            return
+        self._running = False
+        thread.join(CLOSE_TIMEOUT)
+        if thread.is_alive():
+            self._drop(len(self._queue))
+
+    def _drop(self, count):
+        with self._dropped_lock:
+            self.dropped += count
+
+    def rotate_if_needed(self):
+        """
+        Rota el archivo si superó max_bytes. La usa el supervisor de multiprocess_server
+        para que un solo proceso rote el archivo que comparten todos.
+        """
+        if not self.max_bytes or self.path == "-":
+            return
+        try:
+            if os.path.getsize(self.path) >= self.max_bytes:
+                self._rotate_files()
+        except OSError:
+            pass
+
+    def _run(self):
+        self._open()
+        buffer = []
+        buffered = 0
+        last_flush = time.monotonic()
+        try:
+            while True:
+                running = self._running
+                formatted = 0
+                while self._queue:
+                    line = self.format(self._queue.popleft())
+                    buffer.append(line)
+                    buffered += len(line)
+                    formatted += 1
+                    if formatted % FORMAT_SLICE == 0:
+                        # Se cede el GIL para no demorar las respuestas mientras se formatea un lote
+                        time.sleep(0)
+                now = time.monotonic()
+                if buffer and (
+                    buffered >= self.flush_bytes
+                    or now - last_flush >= self.flush_interval
+                    or not running
+                ):
+                    self._write("".join(buffer))
+                    buffer.clear()
+                    buffered = 0
+                    last_flush = now
+                if not running:
+                    return
+                if not self._queue:
+                    time.sleep(POLL_INTERVAL)
+        finally:
+            if self._file is not sys.stdout:
+                self._file.close()
+
+    def _open(self):
+        if self.path == "-":
+            self._file = sys.stdout
+        else:
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def _write(self, text):
+        """
+        Escribe un lote y rota el archivo si superó max_bytes. Un error de escritura
+        (disco lleno, salida cerrada) descarta el lote sin detener el hilo.
+        """
+        if self.external_rotation and self._file is not sys.stdout:
+            self._reopen_if_rotated()
+        try:
+            self._file.write(text)
+            self._file.flush()
+        except (OSError, ValueError):
+            self._drop(text.count("\n"))
+            return
+        self.written += text.count("\n")
+        if (
+            self.max_bytes
+            and not self.external_rotation
+            and self._file is not sys.stdout
+            and self._file.tell() >= self.max_bytes
+        ):
+            self._file.close()
+            self._rotate_files()
+            self._open()
+
+    def _reopen_if_rotated(self):
+        """
+        Reabre path si otro proceso lo renombró al rotarlo (ya no es el archivo abierto).
+        """
+        try:
+            rotated = os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except OSError:
+            rotated = True
+        if rotated:
+            self._file.close()
+            self._open()
+
+    def _rotate_files(self):
+        """
+        Renombra path -> path.1 -> path.2 ... (se descarta el más antiguo).
+        """
+        try:
+            for index in range(self.backups - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            if self.backups > 0:
+                os.replace(self.path, f"{self.path}.1")
+            else:
+                os.remove(self.path)
+        except OSError:
+            pass
+
+    def format(self, record):
+        """
+        Convierte un registro de la cola en una línea del formato configurado.
+        """
+        timestamp, address, method, uri, version, status, sent, duration, referer, user_agent = record
+        host = address[0] if address else "-"
+        if self.log_format == "json":
+            return json.dumps(
+                {
+                    "time": round(timestamp, 3),
+                    "remote": host,
+                    "method": method,
+                    "uri": uri,
+                    "version": version,
+                    "status": int(status) if status.isdigit() else status,
+                    "bytes": sent,
+                    "duration_ms": round(duration * 1000, 3),
+                    "referer": referer,
+                    "user_agent": user_agent,
+                },
+                ensure_ascii=False,
+            ) + "\n"
+
+        request_line = f"{method} {uri} {version}" if method != "-" else "-"
+        line = f'{host} - - [{clf_time(timestamp)}] "{escape(request_line)}" {status} {sent}'
+        if self.log_format == "combined":
+            line += f' "{escape(referer)}" "{escape(user_agent)}"'
+        return line + "\n"
+
+
+# Último segundo formateado por clf_time y su texto (solo lo usa el hilo escritor)
+_clf_cache = [None, ""]
+
+
+def clf_time(timestamp):
+    """
+    Fecha en el formato del Common Log Format, por ejemplo "10/Oct/2024:13:55:36 +0000".
+    Los registros de un mismo segundo reutilizan el texto ya formateado.
+    """
+    second = int(timestamp)
+    if _clf_cache[0] != second:
+        t = time.gmtime(second)
+        _clf_cache[0] = second
+        _clf_cache[1] = (
+            f"{t.tm_mday:02d}/{_MONTHS[t.tm_mon - 1]}/{t.tm_year}:"
+            f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d} +0000"
+        )
+    return _clf_cache[1]
+
+
+def escape(value):
+    """
+    Escapa comillas y caracteres de control para que un valor del cliente no pueda
+    romper ni falsificar líneas del registro.
+    """
+    return value.encode("unicode_escape").decode("ascii").replace('"', '\\"')
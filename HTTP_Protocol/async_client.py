@@ -0,0 +1,302 @@
+import asyncio
+import time
+
+from client import (
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_MAX_PER_HOST,
+    DEFAULT_MAX_REDIRECTS,
+    build_request_bytes,
+    can_retry,
+    content_charset,
+    parse_response_head,
+    parse_url,
+    prepare_headers,
+    redirect_target,
+)
+from compression import decompress
+from fd_limit import raise_fd_limit
+from resolver import CONNECTION_ATTEMPT_DELAY
+
+# Solicitudes en curso simultáneas por defecto en gather_requests
+DEFAULT_CONCURRENCY = 100
+
+# Segundos máximos para conectar y para recibir cada respuesta
+DEFAULT_TIMEOUT = 10
+
+# Límite del buffer de cada StreamReader (tamaño máximo de la sección de encabezados)
+STREAM_LIMIT = 256 * 1024
+
+def default_ssl_context():
+    """
+    Retorna el contexto TLS por defecto, compartido con el cliente síncrono
+    (crearlo carga los certificados del sistema, lo que es costoso para miles de conexiones).
+    """
+    from tls import client_context
+
+    return client_context()
+
+
+class AsyncConnectionPool:
+    """
+    Pool de conexiones persistentes para el cliente asyncio, indexado por
+    (host, puerto, is_secure) igual que client.ConnectionPool. Cada destino tiene un
+    semáforo que limita las conexiones en uso simultáneas.
+    """
+
+    def __init__(
+        self, max_per_host=DEFAULT_MAX_PER_HOST, idle_timeout=DEFAULT_IDLE_TIMEOUT, ssl_context=None
+    ):
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.ssl_context = ssl_context  # None para default_ssl_context()
+        self._idle = {}  # clave -> lista de (reader, writer, instante de liberación)
+        self._slots = {}  # clave -> asyncio.Semaphore
+
+    async def acquire(self, host, port, is_secure, timeout=DEFAULT_TIMEOUT):
+        """
+        Obtiene una conexión al destino: la inactiva más reciente que siga viva o una nueva.
+
+        Retorna:
+          (reader, writer, reused)
+        """
+        key = (host, port, is_secure)
+        slots = self._slots.get(key)
+        if slots is None:
+            slots = self._slots[key] = asyncio.Semaphore(self.max_per_host)
+        await slots.acquire()
+
+        idle = self._idle.get(key)
+        now = time.monotonic()
+        while idle:
+            reader, writer, released_at = idle.pop()
+            # Si el servidor cerró la conexión mientras estaba inactiva, el lector ya vio EOF
+            if now - released_at < self.idle_timeout and not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    host,
+                    port,
+                    ssl=(self.ssl_context or default_ssl_context()) if is_secure else None,
+                    limit=STREAM_LIMIT,
+                    # Mismo escalonamiento IPv6/IPv4 que resolver.connect (RFC 8305)
+                    happy_eyeballs_delay=CONNECTION_ATTEMPT_DELAY,
+                ),
+                timeout,
+            )
+        except BaseException:
+            slots.release()
+            raise
+        return reader, writer, False
+
+    def release(self, key, reader, writer, reusable):
+        """
+        Devuelve una conexión al pool; si no es reutilizable se cierra.
+        """
+        if reusable:
+            self._idle.setdefault(key, []).append((reader, writer, time.monotonic()))
+        elif writer is not None:
+            writer.close()
+        self._slots[key].release()
+
+    def close(self):
+        """
+        Cierra todas las conexiones inactivas del pool.
+        """
+        for idle in self._idle.values():
+            for _, writer, _ in idle:
+                writer.close()
+        self._idle.clear()
+
+
+class AsyncSession:
+    """
+    Sesión del cliente asyncio: equivalente a client.Session pero sin bloquear, de
+    modo que un solo proceso puede mantener miles de solicitudes en curso.
+
+    Uso:
+      async with AsyncSession() as session:
+          status, headers, body = await session.request("GET", "http://localhost:8080/")
+    """
+
+    def __init__(self, pool=None, timeout=DEFAULT_TIMEOUT):
+        self.pool = pool if pool is not None else AsyncConnectionPool()
+        self.timeout = timeout
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.pool.close()
+
+    async def request(self, method, url, headers="", body="", max_redirects=DEFAULT_MAX_REDIRECTS):
+        """
+        Envía una solicitud HTTP siguiendo las mismas reglas de redirección que client.request.
+
+        Parámetros:
+          method        -> Método HTTP (GET, POST, etc.)
+          url           -> URL completa a la que se hace la solicitud
+          headers       -> Lista de tuplas con encabezados [(clave, valor), ...]
+          body          -> Contenido del cuerpo de la solicitud
+          max_redirects -> Redirecciones máximas a seguir
+
+        Retorna:
+          status_code, response_headers, body -> El cuerpo se decodifica con el charset de Content-Type.
+        """
+        for _ in range(max_redirects + 1):
+            head, data = await self.send(method, url, headers, body)
+            target = redirect_target(method, url, body, head.status, head.headers)
+            if target is None:
+                break
+            method, url, body = target
+        else:
+            raise ValueError("Too many redirects")
+
+        content_encoding = head.fields.get("content-encoding")
+        if content_encoding:
+            data = decompress(data, content_encoding)
+        charset = content_charset(head.fields.get("content-type", ""))
+        try:
+            text = data.decode(charset, errors="replace")
+        except LookupError:
+            text = data.decode("utf-8", errors="replace")  # Charset desconocido
+        return head.status, head.headers, text
+
+    async def send(self, method, url, headers="", body=""):
+        """
+        Envía una única solicitud por una conexión del pool y lee la respuesta completa.
+
+        Retorna:
+          (ResponseHead, cuerpo en bytes sin la delimitación chunked)
+        """
+        host, port, uri, is_secure = parse_url(url)
+        pool_key = (host, port, is_secure)
+        body = body or ""
+        headers, close_requested = prepare_headers(headers, body)
+        data = build_request_bytes(method, host, uri, headers, body)
+
+        # Una conexión reutilizada que el servidor ya cerró se reintenta una vez con una
+        # nueva, con los mismos criterios que client.Session.send (ver can_retry)
+        for attempt in range(2):
+            reader, writer, reused = await self.pool.acquire(host, port, is_secure, self.timeout)
+            head, response_body, reusable = None, b"", False
+            sent = False
+            try:
+                writer.write(data)
+                await writer.drain()
+                sent = True
+                head, response_body, reusable = await asyncio.wait_for(
+                    read_response(reader, method), self.timeout
+                )
+            except (BrokenPipeError, ConnectionResetError, asyncio.IncompleteReadError) as e:
+                received = isinstance(e, asyncio.IncompleteReadError) and bool(e.partial)
+                if attempt or not can_retry(method, reused, sent, received):
+                    raise
+            finally:
+                self.pool.release(pool_key, reader, writer, reusable and not close_requested)
+            if head is not None:
+                return head, response_body
+
+
+async def read_response(reader, method):
+    """
+    Lee una respuesta completa de un StreamReader según su delimitación.
+
+    Retorna:
+      (ResponseHead, cuerpo, reusable)
+
+    Lanza:
+      asyncio.IncompleteReadError si la conexión se cierra antes de los encabezados.
+    """
+    head = parse_response_head(await reader.readuntil(b"\r\n\r\n"), method)
+    try:
+        if head.framing == "length":
+            return head, await reader.readexactly(head.length), head.reusable
+        if head.framing == "chunked":
+            body = bytearray()
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";", 1)[0], 16)
+                if size == 0:
+                    break
+                body += (await reader.readexactly(size + 2))[:-2]
+            # Encabezados finales (trailers) opcionales hasta la línea vacía
+            while await reader.readuntil(b"\r\n") != b"\r\n":
+                pass
+            return head, bytes(body), head.reusable
+        if head.framing == "close":
+            return head, await reader.read(), False
+        return head, b"", head.reusable
+    except asyncio.IncompleteReadError as e:
+        # Cuerpo truncado: se retorna lo recibido y la conexión no se reutiliza
+        return head, e.partial, False
+
+
+async def request(method, url, headers="", body="", session=None):
+    """
+    Versión asyncio de client.request. Sin sesión se usa una temporaria, por lo que
+    para muchas solicitudes conviene compartir una AsyncSession.
+    """
+    if session is not None:
+        return await session.request(method, url, headers, body)
+    async with AsyncSession() as session:
+        return await session.request(method, url, headers, body)
+
+
+async def gather_requests(
+    urls, concurrency=DEFAULT_CONCURRENCY, method="GET", headers="", session=None
+):
+    """
+    Realiza una solicitud por URL con como máximo concurrency solicitudes en curso,
+    reutilizando las conexiones por destino.
+
+    Parámetros:
+      urls        -> Iterable de URLs
+      concurrency -> Solicitudes simultáneas máximas
+      method      -> Método HTTP de todas las solicitudes
+      headers     -> Encabezados comunes a todas las solicitudes
+      session     -> AsyncSession a usar (None para crear una propia)
+
+    Retorna:
+      Lista con el resultado de cada URL en el mismo orden: (status, headers, body)
+      o la excepción que produjo esa solicitud.
+    """
+    # Miles de conexiones simultáneas superan el límite de descriptores habitual (1024)
+    raise_fd_limit()
+    semaphore = asyncio.Semaphore(concurrency)
+    own_session = session is None
+    if own_session:
+        session = AsyncSession(AsyncConnectionPool(max_per_host=concurrency))
+
+    async def limited(url):
+        async with semaphore:
+            return await session.request(method, url, headers)
+
+    try:
+        return await asyncio.gather(*(limited(url) for url in urls), return_exceptions=True)
+    finally:
+        if own_session:
+            session.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Concurrent asyncio HTTP client")
+    parser.add_argument("urls", nargs="*", help="URLs to fetch (read from stdin if omitted)")
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Max in-flight requests")
+    parser.add_argument("-m", "--method", default="GET", help="HTTP method, e.g., GET")
+    args = parser.parse_args()
+
+    urls = args.urls or [line.strip() for line in sys.stdin if line.strip()]
+    results = asyncio.run(gather_requests(urls, args.concurrency, args.method))
+    for url, result in zip(urls, results):
+        if isinstance(result, BaseException):
+            print(f"{url}\terror\t{result!r}")
+        else:
+            print(f"{url}\t{result[0]}\t{len(result[2])}")
@@ -1,11 +1,359 @@
-import socket
+import select
 import re
-import ssl
+import time
+from functools import lru_cache
+from threading import Condition
+from urllib.parse import urljoin
+
+from compression import StreamDecoder, accept_encoding_header
+from resolver import connect
+
+
+# Conexiones simultáneas máximas por (host, puerto, is_secure) en el pool
+DEFAULT_MAX_PER_HOST = 10
+
+# Segundos que una conexión sin usar permanece en el pool antes de cerrarse
+DEFAULT_IDLE_TIMEOUT = 15.0
+
+# Segundos máximos que se espera a que se libere una conexión de un destino saturado
+DEFAULT_ACQUIRE_TIMEOUT = 60.0
+
+# Tamaño inicial del buffer de recepción de cada ResponseReader
+RECV_BUFFER_SIZE = 16 * 1024
+
+# Tamaño máximo de cada fragmento entregado al leer un cuerpo en streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Redirecciones máximas que se siguen en una misma solicitud
+DEFAULT_MAX_REDIRECTS = 10
+
+# Redirecciones permanentes (301/308) que recuerda cada sesión
+MAX_PERMANENT_REDIRECTS = 1024
+
+# Métodos idempotentes: pueden reenviarse si el servidor cierra la conexión sin
+# haberlos respondido (RFC 9112, secciones 9.3.1 y 9.3.2)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE", "PUT", "DELETE")
+
+# Métodos que pueden enviarse en un Pipeline
+PIPELINE_METHODS = IDEMPOTENT_METHODS
+
+# Solicitudes escritas como máximo en una conexión antes de leer sus respuestas
+MAX_PIPELINE_DEPTH = 32
+
+# URLs distintas cuyo análisis memoriza parse_url
+URL_CACHE_SIZE = 1024
+
+# Host, puerto opcional y resto de la URL (sin el esquema)
+URL_PATTERN = re.compile(r"([^:/?#]+)(?::(\d+))?(.*)")
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones HTTP/1.1 persistentes indexado por (host, puerto, is_secure).
+    Las conexiones se devuelven al pool tras leer la respuesta completa y se
+    reutilizan en las siguientes solicitudes al mismo destino, evitando el
+    establecimiento de TCP y el handshake TLS.
+
+    Atributos:
+      max_per_host -> Conexiones en uso simultáneas por destino; si se alcanza, se
+                      espera a que otra solicitud libere una
+      idle_timeout -> Segundos tras los cuales una conexión inactiva se descarta
+      ssl_context  -> SSLContext de las conexiones HTTPS (por ejemplo,
+                      tls.client_context(verify=False)); None para el compartido por defecto
+      acquire_timeout -> Segundos máximos de espera por una conexión libre del destino
+    """
+
+    def __init__(
+        self,
+        max_per_host=DEFAULT_MAX_PER_HOST,
+        idle_timeout=DEFAULT_IDLE_TIMEOUT,
+        ssl_context=None,
+        acquire_timeout=DEFAULT_ACQUIRE_TIMEOUT,
+    ):
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.ssl_context = ssl_context
+        self.acquire_timeout = acquire_timeout
+        self._idle = {}  # clave -> lista de (socket, instante de liberación), la más reciente al final
+        self._in_use = {}  # clave -> conexiones entregadas y aún no devueltas
+        self._condition = Condition()
+
+    def acquire(self, host, port, is_secure):
+        """
+        Obtiene una conexión al destino: la inactiva más reciente que siga viva o,
+        si no hay ninguna, una nueva.
+
+        Retorna:
+          (socket, reused) -> reused es True si la conexión ya había sido usada.
+
+        Lanza:
+          TimeoutError si el destino tiene max_per_host conexiones en uso y ninguna
+          se libera en acquire_timeout segundos.
+        """
+        key = (host, port, is_secure)
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._condition:
+            while True:
+                idle = self._idle.get(key)
+                now = time.monotonic()
+                while idle:
+                    sock, released_at = idle.pop()
+                    if now - released_at < self.idle_timeout and is_connection_alive(sock):
+                        self._in_use[key] = self._in_use.get(key, 0) + 1
+                        return sock, True
+                    sock.close()  # Expirada o cerrada por el servidor
+                if self._in_use.get(key, 0) < self.max_per_host:
+                    self._in_use[key] = self._in_use.get(key, 0) + 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Timed out waiting for a pooled connection to {host}:{port}")
+                self._condition.wait(remaining)
+
+        # La conexión nueva se establece fuera del candado para no bloquear a otros hilos
+        try:
+            return socket_client(host, port, is_secure, self.ssl_context), False
+        except BaseException:
+            self.release(key, None, False)
+            raise
+
+    def release(self, key, sock, reusable):
+        """
+        Devuelve una conexión al pool; si no es reutilizable se cierra.
+        """
+        if key[2] and sock is not None:
+            from tls import default_sessions
+
+            # En TLS 1.3 el ticket de sesión llega tras el handshake: se guarda ahora que ya se leyó
+            default_sessions.store(key[0], key[1], sock)
+        with self._condition:
+            self._in_use[key] -= 1
+            if reusable:
+                idle = self._idle.setdefault(key, [])
+                idle.append((sock, time.monotonic()))
+                # Se descartan las conexiones que llevan demasiado tiempo sin usarse
+                expired = time.monotonic() - self.idle_timeout
+                while idle and idle[0][1] < expired:
+                    idle.pop(0)[0].close()
+            self._condition.notify()
+        if not reusable and sock is not None:
+            sock.close()
+
+    def close(self):
+        """
+        Cierra todas las conexiones inactivas del pool.
+        """
+        with self._condition:
+            for idle in self._idle.values():
+                for sock, _ in idle:
+                    sock.close()
+            self._idle.clear()
+
+
+def is_connection_alive(sock):
+    """
+    Indica si una conexión inactiva puede reutilizarse. Una conexión sin solicitud
+    en curso no debería tener nada que leer: si el socket es legible, el servidor
+    la cerró (EOF) o envió datos inesperados.
+    """
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return False
+    return not readable
+
+
+class Session:
+    """
+    Sesión de cliente HTTP que reutiliza conexiones mediante un ConnectionPool.
+    Con verbose=False no se imprime nada (por ejemplo, en el modo por lotes de http_terminal).
+    Con cache (una http_cache.HTTPCache) las respuestas GET se guardan y revalidan.
+    Las redirecciones permanentes (301/308) se recuerdan, de modo que las siguientes
+    solicitudes a la URL original van directamente al destino final.
+
+    Uso:
+      with Session() as session:
+          status, headers, body = session.request("GET", "http://localhost:8080/")
+          with session.stream("GET", "http://localhost:8080/big.bin") as response:
+              for chunk in response.iter_content():
+                  ...
+    """
+
+    def __init__(self, pool=None, verbose=True, cache=None, max_redirects=DEFAULT_MAX_REDIRECTS):
+        self.pool = pool if pool is not None else ConnectionPool()
+        self.verbose = verbose  # Si es True se imprimen las solicitudes y redirecciones
+        self.cache = cache  # http_cache.HTTPCache opcional para las solicitudes GET
+        self.max_redirects = max_redirects
+        self.permanent_redirects = {}  # url -> (código de estado, url destino)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.pool.close()
+
+    def request(self, method, url, headers="", body=""):
+        """
+        Construye y envía una solicitud HTTP al servidor y lee la respuesta completa.
+
+        Parámetros:
+          method  -> Método HTTP (GET, POST, etc.)
+          url     -> URL completa a la que se hace la solicitud
+          headers -> Lista de tuplas con encabezados [(clave, valor), ...]
+          body    -> Contenido del cuerpo de la solicitud
+
+        Retorna:
+          status_code, response_headers, body -> El cuerpo se decodifica a texto con el
+          charset indicado en Content-Type (UTF-8 por defecto).
+        """
+        with self.stream(method, url, headers, body) as response:
+            response_body = response.text()
+        # Se retorna el código de estado, los encabezados y el cuerpo obtenidos de la respuesta.
+        return response.status_code, response.headers, response_body
+
+    def stream(self, method, url, headers="", body=""):
+        """
+        Envía una solicitud y retorna la respuesta en cuanto se reciben sus encabezados;
+        el cuerpo se lee del socket a medida que se consume. Las redirecciones se siguen
+        igual que en request().
+
+        Retorna:
+          StreamedResponse (usar con with para devolver la conexión al pool).
+
+        Lanza:
+          ValueError si se supera max_redirects o se detecta un ciclo de redirecciones.
+        """
+        visited = set()
+        for _ in range(self.max_redirects + 1):
+            url = self.resolve_permanent(method, url)
+            visited.add((method, url))
+
+            if self.cache is not None and method == "GET":
+                # Cada salto (incluidas las redirecciones) pasa por la caché
+                response = self.cache.send(self, url, headers)
+            else:
+                response = self.send(method, url, headers, body)
+
+            # Si es necesario, se realiza una redirección en base al código de estado y la presencia
+            # de un encabezado Location. Se descarta el cuerpo pendiente para que la conexión vuelva
+            # al pool y el siguiente salto al mismo host la reutilice.
+            target = redirect_target(method, url, body, response.status_code, response.headers)
+            if target is None:
+                return response
+            response.discard()
+            if response.status_code.startswith("301") or response.status_code.startswith("308"):
+                self.remember_permanent(url, response.status_code[:3], target[1])
+
+            method, url, body = target
+            if (method, url) in visited:
+                raise ValueError(f"Redirect loop detected at {url}")
+            if self.verbose:
+                print("Redirecting to: ", url)
+        raise ValueError("Too many redirects")
+
+    def resolve_permanent(self, method, url):
+        """
+        Aplica las redirecciones permanentes recordadas a la URL. Un 301 solo se aplica
+        a GET y HEAD (igual que al seguirlo); un 308 a cualquier método.
+        """
+        for _ in range(self.max_redirects):
+            entry = self.permanent_redirects.get(url)
+            if entry is None or (entry[0] == "301" and method != "GET" and method != "HEAD"):
+                break
+            url = entry[1]
+        return url
+
+    def remember_permanent(self, url, status, location):
+        """
+        Recuerda una redirección permanente; al llenarse se olvida la más antigua.
+        """
+        if location == url:
+            return
+        if len(self.permanent_redirects) >= MAX_PERMANENT_REDIRECTS:
+            self.permanent_redirects.pop(next(iter(self.permanent_redirects)), None)
+        self.permanent_redirects[url] = (status, location)
+
+    def send(self, method, url, headers="", body=""):
+        """
+        Envía una única solicitud (sin seguir redirecciones) por una conexión del pool.
+
+        Retorna:
+          StreamedResponse con los encabezados ya leídos y el cuerpo pendiente.
+        """
+        # Se obtiene el host, puerto, URI y el estado de seguridad (si es HTTPS) de la URL.
+        host, port, uri, is_secure = parse_url(url)
+        pool_key = (host, port, is_secure)
+
+        body = body or ""
+        headers, close_requested = prepare_headers(headers, body)
+
+        # Se construye la solicitud HTTP que se enviará; en modo verbose se imprime
+        # para fines de depuración.
+        if self.verbose:
+            request_string = build_request(method, host, uri, headers, body)
+            print(request_string)
+            data = request_string.encode()
+        else:
+            data = build_request_bytes(method, host, uri, headers, body)
+
+        # Si una conexión reutilizada resulta estar cerrada por el servidor, se reintenta
+        # una vez con una conexión nueva (ver can_retry).
+        for attempt in range(2):
+            sock, reused = self.pool.acquire(host, port, is_secure)
+            reader = ResponseReader(sock)
+            head = None
+            sent = False
+            try:
+                sock.sendall(data)
+                sent = True
+                head = reader.read_head(method)
+            except (BrokenPipeError, ConnectionResetError):
+                if attempt or not can_retry(method, reused, sent, reader.end > 0):
+                    raise
+            finally:
+                # Ante cualquier error (incluida una respuesta malformada) se devuelve el lugar
+                if head is None:
+                    self.pool.release(pool_key, sock, False)
+            if head is not None:
+                break
+            if attempt or not can_retry(method, reused, sent, reader.end > 0):
+                raise ConnectionError("Connection closed before receiving a response")
+
+        def release(reusable):
+            self.pool.release(pool_key, sock, reusable and not close_requested)
+
+        return StreamedResponse(head, reader, release)
+
+
+def can_retry(method, reused, sent, received):
+    """
+    Indica si una solicitud cuya conexión se cerró puede reenviarse por una nueva.
+    Solo se reintenta cuando la conexión era reutilizada (el servidor pudo cerrarla
+    por inactividad) y no llegó ningún byte de respuesta. Si la solicitud ya se
+    envió, el servidor pudo haberla procesado, por lo que solo se reenvían los
+    métodos idempotentes. Un timeout nunca se reintenta.
+
+    Parámetros:
+      method   -> Método de la solicitud
+      reused   -> Si la conexión provenía del pool
+      sent     -> Si la solicitud se terminó de escribir en el socket
+      received -> Si se recibió algún byte de la respuesta
+    """
+    if not reused or received:
+        return False
+    return not sent or method in IDEMPOTENT_METHODS
+
+
+# Sesión compartida por las llamadas a request(); sus conexiones se reutilizan entre llamadas.
+default_session = Session()
 
 
 def request(method, url, headers="", body=""):
     """
-    Construye y envía una solicitud HTTP al servidor.
+    Construye y envía una solicitud HTTP al servidor usando la sesión por defecto.
     
     Parámetros:
       method  -> Método HTTP (GET, POST, etc.)
@@ -13,81 +361,596 @@ def request(method, url, headers="", body=""):
       headers -> Lista de tuplas con encabezados [(clave, valor), ...]
       body    -> Contenido del cuerpo de la solicitud
     """
-    # Se obtiene el host, puerto, URI y el estado de seguridad (si es HTTPS) de la URL.
-    host, port, uri, is_secure = parse_url(url)
+    return default_session.request(method, url, headers, body)
 
-     # Se establece la conexión de socket con el servidor (con soporte para TLS si es necesario).
-    sock = socket_client(host, port, is_secure)
 
-    # Se construye el string de la solicitud HTTP que se enviará.
-    request_string = build_request(method, host, uri, headers, body)
+def stream(method, url, headers="", body=""):
+    """
+    Versión en streaming de request() sobre la sesión por defecto (ver Session.stream).
+    """
+    return default_session.stream(method, url, headers, body)
 
-    # Se imprime la solicitud para fines de depuración.
-    print(request_string)
 
-   # Se envía la solicitud completa al servidor.
-    sock.sendall(request_string.encode())
+def download(url, path, headers="", chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Descarga el cuerpo de una URL directamente a un archivo, usando memoria acotada
+    sin importar el tamaño de la descarga.
 
-    
-    # Se inicializa la variable respuesta como un objeto de bytes vacío.
-    response = b""
+    Parámetros:
+      url        -> URL del recurso
+      path       -> Ruta del archivo de destino
+      headers    -> Lista de tuplas con encabezados adicionales
+      chunk_size -> Tamaño máximo de cada bloque leído del socket
+
+    Retorna:
+      status_code, response_headers, size -> size es la cantidad de bytes escritos.
+
+    Lanza:
+      ValueError si la respuesta no es exitosa (2xx); en ese caso no se crea el archivo.
+    """
+    with stream("GET", url, headers) as response:
+        if not response.status_code.startswith("2"):
+            raise ValueError(f"Download failed: {response.status_code}")
+        size = 0
+        with open(path, "wb") as file:
+            for chunk in response.iter_content(chunk_size):
+                file.write(chunk)
+                size += len(chunk)
+    return response.status_code, response.headers, size
+
+
+def pipeline(host, session=None):
+    """
+    Crea un Pipeline hacia host ("host[:puerto]" o "http(s)://host[:puerto]").
+
+    Uso:
+      results = client.pipeline("localhost:8080").get("/").get("/a").head("/b").execute()
+    """
+    return Pipeline(host, session if session is not None else default_session)
+
+
+class Pipeline:
+    """
+    Solicitudes idempotentes enviadas una tras otra por una misma conexión sin esperar
+    cada respuesta (pipelining de HTTP/1.1); las respuestas se leen en el mismo orden.
+    Con N solicitudes se paga un solo viaje de ida y vuelta en lugar de N.
+
+    Si el servidor cierra la conexión (o anuncia Connection: close) antes de responder
+    todas, las restantes se envían de a una por las conexiones de la sesión. Las
+    redirecciones no se siguen: cada resultado corresponde a su solicitud.
+    """
+
+    def __init__(self, host, session):
+        if "://" not in host:
+            host = "http://" + host
+        self.host, self.port, _, self.is_secure = parse_url(host)
+        self.session = session
+        self._requests = []  # (método, uri, encabezados, cuerpo)
 
-    # Se recibe la respuesta del servidor en bloques de 4096 bytes.
-    while True:
+    def request(self, method, uri, headers="", body=""):
+        """
+        Agrega una solicitud al pipeline.
+
+        Lanza:
+          ValueError si el método no es idempotente: reenviarlo tras un cierre podría repetir su efecto.
+        """
+        if method not in PIPELINE_METHODS:
+            raise ValueError(f"Method '{method}' cannot be pipelined")
+        if not uri.startswith("/") and uri != "*":
+            uri = "/" + uri
+        self._requests.append((method, uri, headers, body or ""))
+        return self
+
+    def get(self, uri, headers=""):
+        return self.request("GET", uri, headers)
+
+    def head(self, uri, headers=""):
+        return self.request("HEAD", uri, headers)
+
+    def execute(self):
+        """
+        Envía las solicitudes agregadas y lee todas las respuestas.
+
+        Retorna:
+          Lista de (status_code, response_headers, body) en el orden de las solicitudes,
+          con el cuerpo decodificado igual que en request().
+        """
+        requests, self._requests = self._requests, []
+        scheme = "https://" if self.is_secure else "http://"
+        results = []
+        # Se envían tandas de como máximo MAX_PIPELINE_DEPTH solicitudes para que ningún
+        # extremo llene sus buffers escribiendo mientras el otro no lee
+        for start in range(0, len(requests), MAX_PIPELINE_DEPTH):
+            batch = requests[start:start + MAX_PIPELINE_DEPTH]
+            answered = self._send_pipelined(batch)
+            results += answered
+            # Las solicitudes sin respuesta se envían de forma secuencial (send reintenta las
+            # conexiones cerradas y abre nuevas si hace falta)
+            for method, uri, headers, body in batch[len(answered):]:
+                url = f"{scheme}{self.host}:{self.port}{uri}"
+                with self.session.send(method, url, headers, body) as response:
+                    results.append((response.status_code, response.headers, response.text()))
+        return results
+
+    def _send_pipelined(self, requests):
+        """
+        Escribe todas las solicitudes juntas por una conexión del pool y lee las
+        respuestas hasta la primera que falte o que cierre la conexión.
+
+        Retorna:
+          Lista de resultados de las solicitudes respondidas (un prefijo de requests).
+        """
+        pool = self.session.pool
+        pool_key = (self.host, self.port, self.is_secure)
+        data = []
+        for method, uri, headers, body in requests:
+            headers, _ = prepare_headers(headers, body)
+            if self.session.verbose:
+                print(build_request(method, self.host, uri, headers, body))
+            data.append(build_request_bytes(method, self.host, uri, headers, body))
+
+        sock, _ = pool.acquire(self.host, self.port, self.is_secure)
+        reader = ResponseReader(sock)
+        results = []
+        reusable = False
         try:
-            data = sock.recv(4096)  # Se reciben datos en bloques de 4096 bytes.
-            if not data:
-                break   # Se sale del bucle si no se reciben más datos.
-            response += data # Se acumulan los datos recibidos.
-        except socket.timeout:
-            break  # Se sale del bucle en caso de que ocurra un timeout.
+            sock.sendall(b"".join(data))
+            for method, _, _, _ in requests:
+                head = reader.read_head(method)
+                if head is None:
+                    break  # El servidor cerró la conexión antes de esta respuesta
+                # La conexión se libera una sola vez al final, no al leer cada respuesta (los
+                # datos pendientes en el buffer son las respuestas siguientes)
+                response = StreamedResponse(head, reader, lambda complete: None)
+                results.append((response.status_code, response.headers, response.text()))
+                reusable = head.reusable and reader.body_complete
+                if not reusable:
+                    break  # Connection: close o cuerpo delimitado por el cierre
+        except OSError:
+            reusable = False
+        finally:
+            complete = len(results) == len(requests) and not reader.has_pending_data()
+            pool.release(pool_key, sock, reusable and complete)
+        return results
+
+
+def prepare_headers(headers, body):
+    """
+    Completa los encabezados de una solicitud enviada por una conexión persistente.
 
-    # Se cierra la conexión de socket.
-    sock.close()
+    Retorna:
+      (headers, close_requested) -> close_requested es True si el usuario pidió
+      "Connection: close", en cuyo caso la conexión no se devuelve al pool.
+    """
+    # Se aceptan también encabezados en diccionario (como los de http_terminal) o None.
+    if isinstance(headers, dict):
+        headers = list(headers.items())
+    elif headers is None:
+        headers = []
+    # Se anuncian las codificaciones de contenido que el cliente sabe decodificar.
+    if not any(key.lower() == "accept-encoding" for key, _ in headers):
+        headers = list(headers) + [("Accept-Encoding", accept_encoding_header())]
+    # En una conexión persistente el servidor solo puede delimitar el cuerpo con Content-Length.
+    if body and not any(key.lower() == "content-length" for key, _ in headers):
+        headers = list(headers) + [("Content-Length", str(len(body.encode())))]
+    close_requested = any(
+        key.lower() == "connection" and "close" in value.lower() for key, value in headers
+    )
+    return headers, close_requested
 
-    response = response.decode() # Se decodifica la respuesta de bytes a una cadena.
 
-    # Se analiza la respuesta para extraer el código de estado, los encabezados y el cuerpo
-    status_code, response_headers, response_body = parse_response(response)
+def redirect_target(method, url, body, status_code, response_headers):
+    """
+    Determina si una respuesta debe seguirse como redirección.
 
-     # Si es necesario, se realiza una redirección en base al código de estado y la presencia de un encabezado Location:
+    Parámetros:
+      method           -> Método de la solicitud que produjo la respuesta
+      url              -> URL de esa solicitud (para resolver un Location relativo)
+      body             -> Cuerpo de esa solicitud
+      status_code      -> Código de estado de la respuesta
+      response_headers -> Encabezados de la respuesta
 
+    Retorna:
+      (método, url, cuerpo) de la siguiente solicitud, o None si no hay que redirigir.
+      En 307 y 308 se conservan el método y el cuerpo (RFC 9110, sección 15.4).
+    """
+    location = header_value(response_headers, "Location")
+    if location is None:
+        return None
+    location = urljoin(url, location)
+    if status_code.startswith("307") or status_code.startswith("308"):
+        return method, location, body
+    if status_code.startswith("300") or status_code.startswith("305"):
+        return method, location, ""
     if (
-        status_code.startswith("300") or status_code.startswith("305")
-    ) and "Location" in dict(response_headers):
-        print("Redirecting to: ", dict(response_headers)["Location"])
-        status_code, response_headers, response_body = request(
-            method,
-            dict(response_headers)["Location"],
-            headers,
-        )
-    elif (
-        (
-            status_code.startswith("301")
-            or status_code.startswith("302")
-            or status_code.startswith("307")
-        )
-        and "Location" in dict(response_headers)
-        and (method == "GET" or method == "HEAD")
-    ):
-        print("Redirecting to: ", dict(response_headers)["Location"])
-        status_code, response_headers, response_body = request(
-            method,
-            dict(response_headers)["Location"],
-            headers,
+        status_code.startswith("301")
+        or status_code.startswith("302")
+    ) and (method == "GET" or method == "HEAD"):
+        return method, location, ""
+    if status_code.startswith("303"):
+        # En este caso se fuerza el método GET en la redirección.
+        return "GET", location, ""
+    return None
+
+
+def header_value(response_headers, name, default=None):
+    """
+    Busca un encabezado en la lista [[clave, valor], ...] sin distinguir mayúsculas.
+    """
+    name = name.lower()
+    for key, value in response_headers:
+        if key.lower() == name:
+            return value
+    return default
+
+
+class StreamedResponse:
+    """
+    Respuesta HTTP cuyo cuerpo se lee del socket bajo demanda. Al terminar de leer
+    el cuerpo (o al cerrarla) la conexión se devuelve al pool si puede reutilizarse;
+    si se cierra antes de leer todo el cuerpo, la conexión se descarta.
+
+    Atributos:
+      status_code -> Código y motivo de la línea de estado (por ejemplo "200 OK")
+      headers     -> Lista de encabezados en formato [[clave, valor], ...]
+      head        -> ResponseHead completo (incluye fields y la delimitación del cuerpo)
+    """
+
+    def __init__(self, head, reader, release):
+        self.status_code = head.status
+        self.headers = head.headers
+        self.head = head
+        self._reader = reader
+        self._release = release
+        self._consumed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        return self.iter_content()
+
+    def iter_content(self, chunk_size=STREAM_CHUNK_SIZE, decode_content=True):
+        """
+        Generador de los fragmentos del cuerpo en bytes. chunk_size limita los bytes
+        leídos del socket en cada paso; si decode_content es True se deshace el
+        Content-Encoding (gzip, deflate, br) de forma incremental.
+        """
+        self._start_body()
+        content_encoding = self.head.fields.get("content-encoding")
+        decoder = StreamDecoder(content_encoding) if decode_content and content_encoding else None
+        try:
+            for chunk in self._reader.iter_body(self.head, chunk_size):
+                if decoder is not None:
+                    chunk = decoder.decode(chunk)
+                if chunk:
+                    yield chunk
+            if decoder is not None:
+                tail = decoder.flush()
+                if tail:
+                    yield tail
+        finally:
+            self.close()
+
+    def read(self, decode_content=True):
+        """
+        Lee el cuerpo completo en bytes.
+        """
+        content_encoding = self.head.fields.get("content-encoding")
+        if decode_content and content_encoding:
+            return b"".join(self.iter_content(decode_content=True))
+        self._start_body()
+        try:
+            return bytes(self._reader.read_body(self.head))
+        finally:
+            self.close()
+
+    def text(self, encoding=None):
+        """
+        Lee el cuerpo completo y lo decodifica con el charset indicado en Content-Type
+        (o el encoding recibido como parámetro). Los bytes inválidos se reemplazan.
+        """
+        if encoding is None:
+            encoding = content_charset(self.head.fields.get("content-type", ""))
+        body = self.read()
+        try:
+            return body.decode(encoding, errors="replace")
+        except LookupError:
+            return body.decode("utf-8", errors="replace")  # Charset desconocido
+
+    def discard(self):
+        """
+        Lee y descarta el cuerpo para poder reutilizar la conexión (por ejemplo, al
+        seguir una redirección); si la conexión no es reutilizable solo se cierra.
+        """
+        if self.head.reusable and not self._consumed:
+            for _ in self.iter_content(decode_content=False):
+                pass
+        self.close()
+
+    def close(self):
+        """
+        Libera la conexión: vuelve al pool solo si el cuerpo se leyó por completo.
+        """
+        if self._release is None:
+            return
+        release, self._release = self._release, None
+        release(
+            self.head.reusable
+            and self._reader.body_complete
+            and not self._reader.has_pending_data()
         )
-    elif status_code.startswith("303") and "Location" in dict(response_headers):
-        print("Redirecting to: ", dict(response_headers)["Location"])
-          # En este caso se fuerza el método GET en la redirección.
-        status_code, response_headers, response_body = request(
-            "GET",
-            dict(response_headers)["Location"],
-            headers,
+
+    def _start_body(self):
+        if self._consumed:
+            raise RuntimeError("Response body already consumed")
+        self._consumed = True
+
+
+def content_charset(content_type, default="utf-8"):
+    """
+    Extrae el parámetro charset de un encabezado Content-Type.
+    """
+    for param in content_type.split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset" and value.strip():
+            return value.strip().strip('"')
+    return default
+
+
+class ResponseHead:
+    """
+    Línea de estado y encabezados de una respuesta ya analizados.
+
+    Atributos:
+      status   -> Código y motivo (por ejemplo "200 OK")
+      headers  -> Lista [[clave, valor], ...] con los nombres tal como se recibieron
+      fields   -> Diccionario nombre -> valor, ambos en minúsculas
+      reusable -> Si la conexión puede reutilizarse tras leer el cuerpo
+      framing  -> Delimitación del cuerpo: "empty", "length", "chunked" o "close"
+      length   -> Longitud del cuerpo cuando framing es "length"
+    """
+
+    __slots__ = ("status", "headers", "fields", "reusable", "framing", "length")
+
+    def __init__(self, status, headers, fields, reusable, framing, length=0):
+        self.status = status
+        self.headers = headers
+        self.fields = fields
+        self.reusable = reusable
+        self.framing = framing
+        self.length = length
+
+
+def parse_response_head(head, method):
+    """
+    Analiza la línea de estado y los encabezados de una respuesta y determina cómo
+    está delimitado su cuerpo. Lo usan tanto ResponseReader como el cliente asyncio.
+
+    Parámetros:
+      head   -> bytes de la línea de estado y los encabezados, terminados en una línea vacía
+      method -> Método de la solicitud (las respuestas a HEAD no tienen cuerpo)
+
+    Retorna:
+      ResponseHead
+    """
+    status_line, *lines = head[:-4].decode("latin-1").split("\r\n")
+    version, _, status = status_line.partition(" ")
+    headers = []
+    fields = {}
+    for line in lines:
+        key, _, value = line.partition(":")
+        key, value = key.strip(), value.strip()
+        headers.append([key, value])
+        fields[key.lower()] = value.lower()
+
+    connection = fields.get("connection", "")
+    if version == "HTTP/1.1":
+        reusable = "close" not in connection
+    else:
+        reusable = "keep-alive" in connection
+
+    # Respuestas que nunca llevan cuerpo
+    if method == "HEAD" or status[:1] == "1" or status[:3] in ("204", "304"):
+        return ResponseHead(status, headers, fields, reusable, "empty")
+    if "chunked" in fields.get("transfer-encoding", ""):
+        return ResponseHead(status, headers, fields, reusable, "chunked")
+    if "content-length" in fields:
+        return ResponseHead(
+            status, headers, fields, reusable, "length", int(fields["content-length"])
         )
+    # Sin delimitación (estilo HTTP/1.0): el cuerpo termina cuando el servidor cierra
+    return ResponseHead(status, headers, fields, False, "close")
 
-     # Se retorna el código de estado, los encabezados y el cuerpo obtenidos de la respuesta.
-    return status_code, response_headers, response_body
 
+class ResponseReader:
+    """
+    Lector de respuestas HTTP sobre un socket. Los datos se reciben con recv_into en
+    un bytearray preasignado (sin concatenar bytes en cada recv) y la lectura se
+    detiene exactamente al final de la respuesta según su delimitación, por lo que
+    la conexión queda lista para la siguiente solicitud.
+
+    Uso:
+      reader = ResponseReader(sock)
+      head = reader.read_head(method)
+      body = reader.read_body(head)            -> cuerpo completo
+      for chunk in reader.iter_body(head): ... -> cuerpo en fragmentos
+    """
+
+    def __init__(self, sock, buffer_size=RECV_BUFFER_SIZE):
+        self.sock = sock
+        self.buffer = bytearray(buffer_size)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # Primer byte recibido aún no consumido
+        self.end = 0  # Fin de los datos recibidos en el buffer
+        self.eof = False  # El servidor cerró la conexión
+        self.body_complete = False  # El último cuerpo se leyó por completo
+
+    def has_pending_data(self):
+        """
+        Indica si quedan bytes recibidos que no pertenecen a ninguna respuesta leída.
+        """
+        return self.end > self.start
+
+    def _fill(self):
+        """
+        Recibe más datos a continuación de los pendientes. Si el buffer está lleno se
+        compacta y, si aun así no hay espacio (encabezados muy largos), se duplica.
+
+        Retorna:
+          La cantidad de bytes recibidos (0 si el servidor cerró la conexión).
+        """
+        if self.end == len(self.buffer):
+            pending = self.end - self.start
+            if self.start:
+                self.buffer[:pending] = bytes(self.view[self.start:self.end])
+            else:
+                self.view.release()
+                self.buffer.extend(bytes(len(self.buffer)))
+                self.view = memoryview(self.buffer)
+            self.start, self.end = 0, pending
+        received = self.sock.recv_into(self.view[self.end:])
+        if not received:
+            self.eof = True
+        self.end += received
+        return received
+
+    def _read_until(self, delimiter):
+        """
+        Retorna los bytes hasta el delimitador inclusive, o None si la conexión se
+        cerró antes. Solo se revisan los bytes nuevos en cada recepción.
+        """
+        scanned = 0
+        while True:
+            index = self.buffer.find(delimiter, self.start + scanned, self.end)
+            if index != -1:
+                data = bytes(self.view[self.start:index + len(delimiter)])
+                self.start = index + len(delimiter)
+                return data
+            scanned = max(0, self.end - self.start - len(delimiter) + 1)
+            if not self._fill():
+                return None
+
+    def _read_some(self, limit):
+        """
+        Retorna hasta limit bytes: primero los que ya están en el buffer y, si no
+        hay ninguno, los de un único recv (b"" si el servidor cerró la conexión).
+        """
+        if self.end > self.start:
+            size = min(limit, self.end - self.start)
+            data = bytes(self.view[self.start:self.start + size])
+            self.start += size
+            return data
+        data = self.sock.recv(limit)
+        if not data:
+            self.eof = True
+        return data
+
+    def _read_into(self, out, size):
+        """
+        Agrega a out exactamente size bytes del cuerpo. Los bytes que ya están en el
+        buffer se copian y el resto se recibe directamente en out.
+
+        Retorna:
+          True si se leyeron todos los bytes, False si la conexión se cerró antes.
+        """
+        buffered = min(size, self.end - self.start)
+        out += self.view[self.start:self.start + buffered]
+        self.start += buffered
+        remaining = size - buffered
+        if not remaining:
+            return True
+
+        offset = len(out)
+        out.extend(bytes(remaining))
+        with memoryview(out) as target:
+            while remaining:
+                received = self.sock.recv_into(target[offset:], remaining)
+                if not received:
+                    self.eof = True
+                    break
+                offset += received
+                remaining -= received
+        if remaining:
+            del out[offset:]
+            return False
+        return True
+
+    def read_head(self, method):
+        """
+        Lee y analiza la línea de estado y los encabezados de la siguiente respuesta.
+
+        Parámetros:
+          method -> Método de la solicitud (las respuestas a HEAD no tienen cuerpo)
+
+        Retorna:
+          ResponseHead, o None si la conexión se cerró antes de completar los encabezados.
+        """
+        head = self._read_until(b"\r\n\r\n")
+        if head is None:
+            return None
+
+        return parse_response_head(head, method)
+
+    def read_body(self, head):
+        """
+        Lee el cuerpo completo. Con Content-Length se recibe directamente en un buffer
+        del tamaño exacto; los cuerpos chunked se reensamblan.
+        """
+        if head.framing == "length":
+            body = bytearray()
+            self.body_complete = self._read_into(body, head.length)
+            return body
+        return b"".join(self.iter_body(head, RECV_BUFFER_SIZE))
+
+    def iter_body(self, head, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Generador de los fragmentos del cuerpo (como máximo chunk_size bytes cada uno),
+        sin la delimitación chunked. Al terminar, body_complete indica si el cuerpo
+        llegó completo.
+        """
+        self.body_complete = False
+        if head.framing == "length":
+            remaining = head.length
+            while remaining:
+                data = self._read_some(min(remaining, chunk_size))
+                if not data:
+                    return
+                remaining -= len(data)
+                yield data
+        elif head.framing == "chunked":
+            while True:
+                size_line = self._read_until(b"\r\n")
+                if size_line is None:
+                    return
+                size = int(size_line.split(b";", 1)[0], 16)
+                if size == 0:
+                    break
+                while size:
+                    data = self._read_some(min(size, chunk_size))
+                    if not data:
+                        return
+                    size -= len(data)
+                    yield data
+                if self._read_until(b"\r\n") is None:
+                    return
+            # Encabezados finales (trailers) opcionales hasta la línea vacía
+            while True:
+                trailer = self._read_until(b"\r\n")
+                if trailer is None:
+                    return
+                if trailer == b"\r\n":
+                    break
+        elif head.framing == "close":
+            while True:
+                data = self._read_some(chunk_size)
+                if not data:
+                    break
+                yield data
+        self.body_complete = True
 
 
 def parse_response(response):
@@ -137,52 +1000,74 @@ def build_request(method, host, uri, headers, body):
     Retorna:
       La cadena completa de la solicitud HTTP.
     """
-    # Se construye la línea inicial de la solicitud y se agrega el encabezado 'Host'.
-    request = f"{method} {uri} HTTP/1.1\r\nHost: {host}\r\n"
+    # Línea inicial, encabezado 'Host', encabezados proporcionados, línea en blanco y cuerpo,
+    # unidos en una sola operación (concatenar con += copia la cadena en cada paso).
+    return "".join(
+        [
+            f"{method} {uri} HTTP/1.1\r\nHost: {host}\r\n",
+            *[f"{key}: {value}\r\n" for key, value in headers],
+            "\r\n",
+            body,
+        ]
+    )
 
-    # Se agregan los encabezados proporcionados.
-    for key, value in headers:
-        request += f"{key}: {value}\r\n"
-    # Se deja una línea en blanco para separar los encabezados del cuerpo.
-    request += "\r\n"
-    # Se añade el cuerpo de la solicitud (si lo hubiese).
-    request += body
 
-    return request
+def build_request_bytes(method, host, uri, headers, body):
+    """
+    Igual que build_request(...).encode() pero sin construir la cadena intermedia;
+    el cuerpo puede ser str o bytes.
+    """
+    head = "".join(
+        [
+            f"{method} {uri} HTTP/1.1\r\nHost: {host}\r\n",
+            *[f"{key}: {value}\r\n" for key, value in headers],
+            "\r\n",
+        ]
+    ).encode()
+    if not body:
+        return head
+    return head + (body.encode() if isinstance(body, str) else body)
 
 
-def socket_client(host, port, is_secure):
+def socket_client(host, port, is_secure, ssl_context=None):
     """
     Crea y establece una conexión de socket con el servidor.
     
     Parámetros:
-      host      -> Dirección del servidor
-      port      -> Puerto de conexión
-      is_secure -> Booleano que indica si se debe usar SSL (HTTPS)
+      host        -> Dirección del servidor
+      port        -> Puerto de conexión
+      is_secure   -> Booleano que indica si se debe usar SSL (HTTPS)
+      ssl_context -> SSLContext a usar (None para el compartido de tls.client_context())
     
     Retorna:
       Objeto socket conectado.
     """
-    # Se crea un socket IPv4 con protocolo TCP.
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    # Se conecta al host y puerto especificados: la resolución usa la caché de DNS y,
+    # si el host tiene varias direcciones (IPv4 e IPv6), los intentos se compiten entre sí.
+    sock = connect(host, port)
     # Se define un timeout de 10 segundos para las operaciones del socket.
     sock.settimeout(10)
 
     if is_secure:  # Si es una conexión HTTPS, se envuelve el socket en un contexto SSL.
-        # Se crea un contexto SSL por defecto.
-        context = ssl.create_default_context()
-        # Se envuelve el socket para comunicación segura.
-        sock = context.wrap_socket(sock, server_hostname=host)
+        # ssl se importa solo al necesitarlo: cargarlo retrasa el inicio de la CLI y la GUI.
+        from tls import wrap_client
 
-    # Se conecta el socket al host y puerto especificados.
-    sock.connect((host, port))
+        # Se envuelve el socket para comunicación segura (el handshake ocurre aquí): el
+        # contexto se comparte entre conexiones y se reanuda la sesión TLS previa con el host.
+        try:
+            sock = wrap_client(sock, host, port, ssl_context)
+        except BaseException:
+            sock.close()
+            raise
 
     return sock
 
 
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def parse_url(url):
     """
-    Analiza la URL y extrae el host, puerto y URI.
+    Analiza la URL y extrae el host, puerto y URI. Los resultados se memorizan, ya que
+    una sesión suele repetir las mismas URLs.
     
     Parámetros:
       url -> URL completa en formato cadena
@@ -202,18 +1087,14 @@ def parse_url(url):
         port = 443   # Se asigna el puerto 443 para conexiones seguras
         is_secure = True
 
-    # Se utiliza una expresión regular para extraer el host, el puerto (si existe) y la URI.
-    match = re.match(r"([^:/?#]+)(?::(\d+))?(.*)", url)
+    # Se utiliza la expresión regular precompilada para extraer el host, el puerto (si existe) y la URI.
+    match = URL_PATTERN.match(url)
     if match:
-        host = match.group(1)  # Se extrae el host.
-        if match.group(2):
-            port = int(match.group(2))  # Se extrae el puerto si está especificado.
-        uri = match.group(3) if match.group(3) else "/"  # Se extrae la URI o se asigna '/' si está vacía.
+        host, port_text, uri = match.groups()  # Se extrae el host.
+        if port_text:
+            port = int(port_text)  # Se extrae el puerto si está especificado.
+        uri = uri or "/"  # Se extrae la URI o se asigna '/' si está vacía.
     else:
         raise ValueError("Invalid URL")  # Se arroja un error si la URL no es válida.
 
     return host, port, uri, is_secure  # Se retornan los componentes parseados.
-
-
-# Llamada de prueba a la función request para una URL externa.
-request("GET", "http://google.com/")
@@ -0,0 +1,424 @@
+import atexit
+import os
+import zlib
+from collections import OrderedDict
+from threading import Lock
+
+from responses import BytesResponse, StreamResponse
+
+# brotli es opcional: si no está instalado solo se negocian gzip y deflate
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tamaño mínimo del cuerpo para que valga la pena comprimirlo
+DEFAULT_MIN_SIZE = 1024
+
+# Nivel de compresión de zlib (equilibrio entre CPU y tamaño)
+COMPRESSION_LEVEL = 6
+
+# Tamaño de los bloques leídos al comprimir archivos de forma incremental
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Variantes comprimidas de hasta este tamaño se guardan en memoria; las mayores en disco
+MAX_MEMORY_VARIANT_SIZE = 1024 * 1024
+
+# Límites totales de la caché de variantes comprimidas
+MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+DISK_CACHE_BYTES = 1024 * 1024 * 1024
+
+# Tipos de contenido que se comprimen (los demás, como imágenes o zip, ya están comprimidos)
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/xhtml+xml",
+    "image/svg+xml",
+    "message/http",
+)
+
+# Codificaciones soportadas en orden de preferencia del servidor
+SUPPORTED_ENCODINGS = ("br", "gzip", "deflate") if brotli else ("gzip", "deflate")
+
+
+def is_compressible(content_type):
+    """
+    Indica si el tipo de contenido se beneficia de la compresión.
+    """
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Elige la codificación a usar según el encabezado Accept-Encoding del cliente.
+
+    Parámetros:
+      accept_encoding -> Valor del encabezado (por ejemplo "gzip;q=1.0, br;q=0.5")
+
+    Retorna:
+      "br", "gzip", "deflate", o None si el cliente no acepta ninguna.
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+
+    wildcard = weights.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = weights.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compressor(encoding):
+    """
+    Crea un compresor incremental con la interfaz compress(data) / flush().
+    """
+    if encoding == "gzip":
+        return zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, 31)
+    if encoding == "deflate":
+        # "deflate" en HTTP es el formato zlib (RFC 1950), no deflate crudo
+        return zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, 15)
+    if encoding == "br" and brotli:
+        return BrotliCompressor()
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class BrotliCompressor:
+    """
+    Adapta brotli.Compressor a la interfaz de los compresores de zlib.
+    """
+
+    def __init__(self):
+        self._compressor = brotli.Compressor()
+
+    def compress(self, data):
+        # brotli solo acepta bytes; bytes() no copia si data ya lo es
+        return self._compressor.process(bytes(data))
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+def compress_bytes(data, encoding):
+    """
+    Comprime un cuerpo completo en memoria.
+    """
+    engine = compressor(encoding)
+    return engine.compress(data) + engine.flush()
+
+
+def compress_file(path, encoding):
+    """
+    Comprime un archivo en bloques hacia un archivo temporal, sin cargarlo completo en memoria.
+
+    Retorna:
+      Ruta del archivo temporal con el contenido comprimido.
+    """
+    import tempfile  # Solo lo usa el servidor; se evita cargarlo al importar el cliente
+
+    engine = compressor(encoding)
+    fd, temp_path = tempfile.mkstemp(prefix="http-variant-", suffix=f".{encoding}")
+    try:
+        with open(path, "rb") as source, os.fdopen(fd, "wb") as target:
+            while True:
+                chunk = source.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                target.write(engine.compress(chunk))
+            target.write(engine.flush())
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return temp_path
+
+
+class CompressedVariant:
+    """
+    Variante comprimida de un archivo: en memoria (data) o en un archivo temporal (path).
+    """
+
+    __slots__ = ("data", "path", "size")
+
+    def __init__(self, data=None, path=None):
+        self.data = data
+        self.path = path
+        self.size = len(data) if data is not None else os.path.getsize(path)
+
+    def discard(self):
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+class VariantCache:
+    """
+    Caché LRU de variantes comprimidas indexada por (ETag, codificación).
+    Las variantes pequeñas se guardan en memoria y las grandes en archivos
+    temporales, que se eliminan al ser desalojadas.
+    """
+
+    def __init__(self, memory_bytes=MEMORY_CACHE_BYTES, disk_bytes=DISK_CACHE_BYTES):
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._entries = OrderedDict()  # (etag, encoding) -> CompressedVariant
+        self._memory_used = 0
+        self._disk_used = 0
+        self._lock = Lock()
+
+    def get(self, etag, encoding):
+        with self._lock:
+            variant = self._entries.get((etag, encoding))
+            if variant is not None:
+                self._entries.move_to_end((etag, encoding))
+            return variant
+
+    def put(self, etag, encoding, variant):
+        """
+        Guarda una variante y retorna la que debe usarse (la ya existente si otro
+        hilo la guardó primero).
+        """
+        with self._lock:
+            existing = self._entries.get((etag, encoding))
+            if existing is not None:
+                variant.discard()
+                return existing
+
+            self._entries[(etag, encoding)] = variant
+            self._account(variant, 1)
+            # Se desalojan las variantes menos usadas (nunca la recién agregada)
+            while len(self._entries) > 1 and (
+                self._memory_used > self.memory_bytes or self._disk_used > self.disk_bytes
+            ):
+                _, old = self._entries.popitem(last=False)
+                self._account(old, -1)
+                old.discard()
+            return variant
+
+    def clear(self):
+        """
+        Vacía la caché eliminando los archivos temporales de las variantes en disco.
+        """
+        with self._lock:
+            for variant in self._entries.values():
+                variant.discard()
+            self._entries.clear()
+            self._memory_used = 0
+            self._disk_used = 0
+
+    def _account(self, variant, sign):
+        if variant.data is not None:
+            self._memory_used += sign * variant.size
+        else:
+            self._disk_used += sign * variant.size
+
+
+# Caché compartida de variantes comprimidas de archivos estáticos; al terminar el
+# proceso se eliminan sus archivos temporales
+variant_cache = VariantCache()
+atexit.register(variant_cache.clear)
+
+
+def variant_etag(etag, encoding):
+    """
+    ETag de la variante comprimida: el del archivo con la codificación como sufijo.
+    """
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def file_variant(path, etag, size, encoding):
+    """
+    Obtiene de la caché (o crea) la variante comprimida de un archivo.
+    Los archivos pequeños se comprimen en memoria; los grandes, en bloques a disco.
+    """
+    variant = variant_cache.get(etag, encoding)
+    if variant is not None:
+        return variant
+
+    if size <= MAX_MEMORY_VARIANT_SIZE:
+        with open(path, "rb") as file:
+            variant = CompressedVariant(data=compress_bytes(file.read(), encoding))
+    else:
+        variant = CompressedVariant(path=compress_file(path, encoding))
+    return variant_cache.put(etag, encoding, variant)
+
+
+def compress_text_response(status, headers, body, encoding, min_size=DEFAULT_MIN_SIZE):
+    """
+    Comprime el cuerpo de una respuesta dinámica si su tipo y tamaño lo justifican.
+
+    Parámetros:
+      status   -> Línea de estado
+      headers  -> Lista de encabezados "Clave: valor" (incluye Content-Type y Content-Length)
+      body     -> Cuerpo en cadena
+      encoding -> Codificación negociada con negotiate_encoding
+
+    Retorna:
+      BytesResponse con el cuerpo comprimido, o None si no conviene comprimir.
+    """
+    content_type = ""
+    for header in headers:
+        if header.lower().startswith("content-type:"):
+            content_type = header.split(":", 1)[1]
+    data = body.encode()
+    if len(data) < min_size or not is_compressible(content_type):
+        return None
+
+    data = compress_bytes(data, encoding)
+    headers = [h for h in headers if not h.lower().startswith("content-length:")] + [
+        f"Content-Encoding: {encoding}",
+        "Vary: Accept-Encoding",
+        f"Content-Length: {len(data)}",
+    ]
+    return BytesResponse(status + "\r\n" + "\r\n".join(headers) + "\r\n\r\n", data)
+
+
+def compress_stream(chunks, encoding):
+    """
+    Generador que comprime de forma incremental los fragmentos de un cuerpo en streaming.
+    Los fragmentos grandes se procesan en bloques de STREAM_CHUNK_SIZE.
+    """
+    engine = compressor(encoding)
+    for chunk in chunks:
+        chunk = memoryview(chunk).cast("B")
+        for start in range(0, len(chunk), STREAM_CHUNK_SIZE):
+            data = engine.compress(chunk[start:start + STREAM_CHUNK_SIZE])
+            if data:
+                yield data
+    yield engine.flush()
+
+
+def compress_stream_response(response, encoding):
+    """
+    Aplica la codificación negociada a una StreamResponse si su tipo de contenido
+    lo justifica. Como el tamaño final no se conoce, no se aplica min_size.
+
+    Retorna:
+      Una nueva StreamResponse con el cuerpo comprimido, o la misma respuesta sin cambios.
+    """
+    content_type = ""
+    for header in response.headers:
+        if header.lower().startswith("content-type:"):
+            content_type = header.split(":", 1)[1]
+    if not is_compressible(content_type):
+        return response
+
+    headers = list(response.headers) + [f"Content-Encoding: {encoding}", "Vary: Accept-Encoding"]
+    return StreamResponse(
+        response.status, headers, compress_stream(response.chunks, encoding), response.chunked
+    )
+
+
+def decompress(data, content_encoding):
+    """
+    Decodifica un cuerpo completo según el encabezado Content-Encoding de la respuesta.
+    Si hay varias codificaciones se deshacen en orden inverso al de aplicación.
+    """
+    decoder = StreamDecoder(content_encoding)
+    return decoder.decode(data) + decoder.flush()
+
+
+class StreamDecoder:
+    """
+    Decodifica de forma incremental un cuerpo según el encabezado Content-Encoding,
+    fragmento a fragmento, sin necesidad de tener el cuerpo completo en memoria.
+
+    Uso:
+      decoder = StreamDecoder("gzip")
+      for chunk in chunks: yield decoder.decode(chunk)
+      yield decoder.flush()
+    """
+
+    def __init__(self, content_encoding):
+        self._steps = []
+        for encoding in reversed([e.strip().lower() for e in content_encoding.split(",")]):
+            if encoding in ("gzip", "x-gzip"):
+                self._steps.append(zlib.decompressobj(47))
+            elif encoding == "deflate":
+                self._steps.append(DeflateDecoder())
+            elif encoding == "br" and brotli:
+                self._steps.append(BrotliDecoder())
+            elif encoding not in ("identity", ""):
+                raise ValueError(f"Unsupported content encoding: {encoding}")
+
+    def decode(self, data):
+        for step in self._steps:
+            data = step.decompress(data)
+        return data
+
+    def flush(self):
+        # Lo que vacía cada paso debe atravesar también los pasos siguientes
+        data = b""
+        for step in self._steps:
+            if data:
+                data = step.decompress(data)
+            data += step.flush()
+        return data
+
+
+class DeflateDecoder:
+    """
+    Decodificador de "deflate" que acepta tanto el formato zlib como deflate crudo.
+    """
+
+    def __init__(self):
+        self._decoder = None
+        self._pending = b""
+
+    def decompress(self, data):
+        if self._decoder is None:
+            # La cabecera zlib ocupa 2 bytes: se espera a tenerlos para elegir el formato
+            self._pending += data
+            if len(self._pending) < 2:
+                return b""
+            data, self._pending = self._pending, b""
+            self._decoder = zlib.decompressobj()
+            try:
+                return self._decoder.decompress(data)
+            except zlib.error:
+                self._decoder = zlib.decompressobj(-15)
+        return self._decoder.decompress(data)
+
+    def flush(self):
+        if self._decoder is None:
+            return zlib.decompress(self._pending, -15) if self._pending else b""
+        return self._decoder.flush()
+
+
+class BrotliDecoder:
+    """
+    Adapta brotli.Decompressor a la interfaz de los decodificadores de zlib.
+    """
+
+    def __init__(self):
+        self._decoder = brotli.Decompressor()
+
+    def decompress(self, data):
+        return self._decoder.process(bytes(data))
+
+    def flush(self):
+        return b""
+
+
+def accept_encoding_header():
+    """
+    Valor de Accept-Encoding que anuncia el cliente según las codificaciones disponibles.
+    """
+    return ", ".join(SUPPORTED_ENCODINGS)
@@ -0,0 +1,485 @@
+import errno
+import os
+import selectors
+import time
+
+import metrics
+from fd_limit import raise_fd_limit
+from request_parser import ParseError
+from responses import (
+    ERROR_TABLE,
+    RESPONSE_TABLE,
+    StreamResponse,
+    add_connection_header,
+    encode_response,
+)
+from server import (
+    CLOSING_STATUS_LINES,
+    DEFAULT_BACKLOG,
+    DEFAULT_CONFIG,
+    RECV_SIZE,
+    closes_after_body,
+    create_server_socket,
+    finish_request,
+    parse_error_response,
+    process_request,
+    response_status,
+)
+from static_files import FileResponse
+
+# Resolución en segundos de la rueda de temporizadores (y espera máxima de select)
+TIMER_RESOLUTION = 0.25
+
+# Ranuras de la rueda: los plazos más lejanos que resolución * ranuras se revisan y reagendan
+TIMER_SLOTS = 1024
+
+# Segundos que se esperan a que terminen las conexiones en curso al detener el servidor
+DRAIN_TIMEOUT = 10
+
+# Errores de accept() por falta de descriptores o de memoria: se deja de aceptar
+# conexiones durante ACCEPT_PAUSE segundos en lugar de reintentar en cada vuelta
+ACCEPT_EXHAUSTED_ERRORS = (errno.EMFILE, errno.ENFILE, errno.ENOBUFS, errno.ENOMEM)
+ACCEPT_PAUSE = 1.0
+
+
+class Connection:
+    """
+    Estado de una conexión atendida por el bucle de eventos.
+    Acumula en su analizador los bytes recibidos hasta completar una solicitud y
+    guarda los bytes pendientes de enviar de la respuesta y, si la respuesta es un
+    archivo, el fragmento del archivo que aún falta enviar con os.sendfile. Si la
+    respuesta es en streaming, stream produce el siguiente fragmento solo cuando
+    outbuf se vació, de modo que el buffer de salida queda acotado.
+    pending guarda los datos de la respuesta en curso para las métricas y el
+    registro de accesos hasta terminar de enviarla.
+    deadline es el instante en que vence la fase actual (inactividad, encabezados,
+    cuerpo o envío); timer_tick es la ranura de la rueda en la que está agendada.
+    """
+
+    __slots__ = (
+        "sock",
+        "address",
+        "parser",
+        "outbuf",
+        "file",
+        "file_offset",
+        "file_remaining",
+        "stream",
+        "served",
+        "keep_alive",
+        "phase",
+        "deadline",
+        "timer_tick",
+        "tracked",
+        "parse_seconds",
+        "pending",
+        "sent",
+    )
+
+    def __init__(self, sock, address, config=DEFAULT_CONFIG):
+        self.sock = sock
+        self.address = address
+        self.parser = config.new_parser()
+        self.outbuf = None
+        self.file = None
+        self.file_offset = 0
+        self.file_remaining = 0
+        self.stream = None
+        self.served = 0  # Solicitudes atendidas en esta conexión
+        self.keep_alive = True  # Si la conexión sigue abierta tras la respuesta en curso
+        self.phase = "idle"  # "idle", "header", "body" o "write"
+        self.deadline = time.monotonic() + config.keep_alive_timeout
+        self.timer_tick = None  # Tick de la rueda en el que se revisará (None si no está agendada)
+        self.tracked = config.metrics  # Si se registran métricas de esta conexión
+        self.parse_seconds = 0.0  # Tiempo de análisis acumulado de la solicitud en curso
+        self.pending = None  # (solicitud, estado, análisis, manejo, instante de inicio del envío)
+        self.sent = 0  # Bytes enviados de la respuesta en curso
+
+
+class TimerWheel:
+    """
+    Rueda de temporizadores para los plazos de todas las conexiones del bucle.
+    El tiempo se divide en ticks de resolution segundos y cada ranura guarda las
+    conexiones a revisar en su tick, de modo que vencer plazos cuesta solo las
+    ranuras recorridas y no un recorrido de todas las conexiones.
+
+    Los plazos se posponen sin tocar la rueda: basta con actualizar conn.deadline y,
+    al llegar su tick, la conexión se vuelve a agendar si su plazo aún no venció.
+    Solo un plazo adelantado agrega una entrada nueva; la anterior queda obsoleta
+    (su tick ya no coincide con conn.timer_tick) y se descarta al recorrerla.
+    """
+
+    def __init__(self, now, resolution=TIMER_RESOLUTION, slots=TIMER_SLOTS):
+        self.resolution = resolution
+        self.slots = [[] for _ in range(slots)]
+        self.tick = int(now / resolution)  # Último tick ya procesado
+
+    def schedule(self, conn):
+        """
+        Agenda la revisión de conn en el tick de conn.deadline, salvo que ya tenga una
+        revisión agendada antes (en ese caso se reagenda al llegar esa revisión).
+        """
+        tick = min(
+            max(int(conn.deadline / self.resolution), self.tick + 1),
+            self.tick + len(self.slots) - 1,
+        )
+        if conn.timer_tick is not None and conn.timer_tick <= tick:
+            return
+        conn.timer_tick = tick
+        self.slots[tick % len(self.slots)].append(conn)
+
+    def expire(self, now):
+        """
+        Avanza la rueda hasta now.
+
+        Retorna:
+          Lista de conexiones cuyo plazo venció (ya no quedan agendadas).
+        """
+        expired = []
+        target = int(now / self.resolution)
+        while self.tick < target:
+            self.tick += 1
+            index = self.tick % len(self.slots)
+            slot = self.slots[index]
+            if not slot:
+                continue
+            self.slots[index] = []
+            for conn in slot:
+                if conn.timer_tick != self.tick:
+                    continue  # Entrada obsoleta: se reagendó antes o la conexión se cerró
+                conn.timer_tick = None
+                if conn.deadline <= now:
+                    expired.append(conn)
+                else:
+                    self.schedule(conn)
+        return expired
+
+
+def run_event_loop_server(
+    host="localhost", port=8080, backlog=DEFAULT_BACKLOG, reuse_port=False, config=DEFAULT_CONFIG
+):
+    """
+    Inicia el servidor HTTP sobre un único bucle de eventos basado en selectors.
+    Todas las conexiones se multiplexan en un solo hilo, por lo que el costo de
+    cada conexión inactiva es solo su socket y su buffer. Los plazos de inactividad,
+    encabezados, cuerpo y envío de todas las conexiones se vencen con una TimerWheel.
+
+    Parámetros:
+      host       -> Dirección en la que escucha el servidor
+      port       -> Puerto en el que escucha el servidor
+      backlog    -> Tamaño de la cola de conexiones pendientes del socket
+      reuse_port -> Si es True se habilita SO_REUSEPORT (ver multiprocess_server)
+      config     -> ServerConfig con las opciones de keep-alive
+    """
+    raise_fd_limit()
+
+    server = create_server_socket(host, port, backlog, reuse_port)
+    server.setblocking(False)
+
+    selector = selectors.DefaultSelector()
+    # El socket de escucha se registra sin datos asociados para distinguirlo de los clientes
+    selector.register(server, selectors.EVENT_READ, data=None)
+    print(f"Servidor (event loop) escuchando en {host}:{port}")
+
+    wheel = TimerWheel(time.monotonic())
+    accepts_resume = None  # Instante en que se reanudan las aceptaciones pausadas
+    try:
+        while True:
+            for key, mask in selector.select(timeout=TIMER_RESOLUTION):
+                if key.data is None:
+                    if accept_connections(selector, key.fileobj, config, wheel):
+                        # Sin descriptores libres el socket seguiría listo en cada select
+                        selector.unregister(server)
+                        accepts_resume = time.monotonic() + ACCEPT_PAUSE
+                else:
+                    dispatch(selector, key.data, mask, config, wheel)
+
+            now = time.monotonic()
+            for conn in wheel.expire(now):
+                expire_connection(selector, conn, config)
+            if accepts_resume is not None and now >= accepts_resume:
+                selector.register(server, selectors.EVENT_READ, data=None)
+                accepts_resume = None
+    finally:
+        # Se deja de aceptar conexiones y se terminan de atender las que están en curso
+        if accepts_resume is None:
+            selector.unregister(server)
+        server.close()
+        drain_connections(selector, DRAIN_TIMEOUT, config)
+        selector.close()
+
+
+def expire_connection(selector, conn, config=DEFAULT_CONFIG):
+    """
+    Cierra una conexión cuyo plazo venció. Si se estaban recibiendo los encabezados
+    o el cuerpo de una solicitud se intenta antes enviar un 408 sin bloquear; una
+    conexión inactiva entre solicitudes o un envío estancado se cierran sin más.
+    """
+    if conn.phase in ("header", "body"):
+        response = ERROR_TABLE["408"]
+        try:
+            sent = conn.sock.send(response.close_bytes)
+        except OSError:
+            sent = 0
+        finish_request(config, conn.address, None, "408", 0.0, 0.0, 0.0, sent)
+    close_connection(selector, conn)
+
+
+def set_deadline(conn, phase, deadline, wheel):
+    """
+    Cambia la fase de la conexión y su plazo. Posponer el plazo solo actualiza
+    conn.deadline; adelantarlo agrega una entrada a la rueda.
+    """
+    conn.phase = phase
+    conn.deadline = deadline
+    if wheel is not None:
+        wheel.schedule(conn)
+
+
+def update_read_deadline(conn, config, wheel, now):
+    """
+    Actualiza el plazo de una conexión que espera datos del cliente según lo que
+    ya tiene su analizador: inactividad entre solicitudes (se renueva con cada
+    lectura), encabezados o cuerpo (cuentan desde el inicio de su fase).
+    """
+    parser = conn.parser
+    if not parser.has_pending_data():
+        set_deadline(conn, "idle", now + config.keep_alive_timeout, wheel)
+    elif parser.waiting_for_body():
+        if conn.phase != "body":
+            set_deadline(conn, "body", now + config.body_timeout, wheel)
+    elif conn.phase != "header":
+        set_deadline(conn, "header", now + config.header_timeout, wheel)
+
+
+def drain_connections(selector, timeout, config):
+    """
+    Continúa atendiendo las conexiones registradas hasta que todas terminen
+    o se agote el tiempo indicado; las que queden abiertas se cierran.
+    Las conexiones persistentes se cierran tras su respuesta en curso.
+    """
+    for key in list(selector.get_map().values()):
+        conn = key.data
+        conn.keep_alive = False
+        if conn.outbuf is None and not conn.parser.has_pending_data():
+            close_connection(selector, conn)  # Conexión inactiva entre solicitudes
+
+    deadline = time.monotonic() + timeout
+    while selector.get_map() and time.monotonic() < deadline:
+        for key, mask in selector.select(timeout=max(0, deadline - time.monotonic())):
+            dispatch(selector, key.data, mask, config)
+
+    for key in list(selector.get_map().values()):
+        close_connection(selector, key.data)
+
+
+def accept_connections(selector, server, config=DEFAULT_CONFIG, wheel=None):
+    """
+    Acepta todas las conexiones pendientes en el socket de escucha y las
+    registra en el selector para lectura y en la rueda de temporizadores.
+
+    Retorna:
+      True si accept() falló por falta de descriptores (EMFILE, ENFILE) o de memoria
+      y deben pausarse las aceptaciones; False en otro caso.
+    """
+    while True:
+        try:
+            client_socket, client_address = server.accept()
+        except (BlockingIOError, InterruptedError):
+            return False
+        except ConnectionAbortedError:
+            continue  # El cliente abortó la conexión antes de aceptarla (ECONNABORTED)
+        except OSError as e:
+            if e.errno not in ACCEPT_EXHAUSTED_ERRORS:
+                raise
+            print(f"Event loop: accept falló ({e.strerror}), pausando {ACCEPT_PAUSE}s")
+            return True
+        client_socket.setblocking(False)
+        conn = Connection(client_socket, client_address, config)
+        selector.register(client_socket, selectors.EVENT_READ, data=conn)
+        if wheel is not None:
+            wheel.schedule(conn)
+        if conn.tracked:
+            metrics.connection_opened()
+
+
+def dispatch(selector, conn, mask, config=DEFAULT_CONFIG, wheel=None):
+    """
+    Atiende un evento de una conexión aislando al bucle de sus errores: una excepción
+    inesperada (un error del programa, no de red) cierra solo esa conexión, con un
+    500 si su respuesta aún no había empezado a enviarse.
+    """
+    try:
+        service_connection(selector, conn, mask, config, wheel)
+    except Exception as e:
+        print(f"Event loop: error atendiendo {conn.address}: {e!r}")
+        if conn.phase != "write" or not conn.sent:
+            try:
+                conn.sock.send(RESPONSE_TABLE[("*", "*", "internal_error")].close_bytes)
+            except OSError:
+                pass
+        close_connection(selector, conn)
+
+
+def service_connection(selector, conn, mask, config=DEFAULT_CONFIG, wheel=None):
+    """
+    Atiende un evento de lectura o escritura sobre una conexión de cliente.
+    wheel es la TimerWheel donde se agendan los plazos (None al drenar el servidor).
+    """
+    if mask & selectors.EVENT_READ and conn.outbuf is None:
+        try:
+            data = conn.sock.recv(RECV_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            close_connection(selector, conn)
+            return
+
+        if not data:
+            # El cliente cerró la conexión
+            close_connection(selector, conn)
+            return
+
+        if conn.tracked:
+            metrics.record_received(len(data))
+        conn.parser.feed(data)
+        start_response(selector, conn, config, wheel)
+
+    if mask & selectors.EVENT_WRITE and conn.outbuf is not None:
+        try:
+            if not conn.outbuf and conn.stream is not None:
+                # Se pide el siguiente fragmento de la respuesta en streaming
+                conn.outbuf = memoryview(next(conn.stream, b""))
+                if not conn.outbuf:
+                    conn.stream = None
+            if conn.outbuf:
+                sent = conn.sock.send(conn.outbuf)
+                conn.outbuf = conn.outbuf[sent:]
+                conn.sent += sent
+            elif conn.file is not None:
+                # El cuerpo del archivo se copia del disco al socket dentro del kernel
+                sent = os.sendfile(
+                    conn.sock.fileno(), conn.file.fileno(), conn.file_offset, conn.file_remaining
+                )
+                if sent == 0:
+                    raise OSError("File truncated while being sent")
+                conn.file_offset += sent
+                conn.file_remaining -= sent
+                conn.sent += sent
+                if not conn.file_remaining:
+                    conn.file.close()
+                    conn.file = None
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            close_connection(selector, conn)
+            return
+
+        # Cada avance del envío renueva el plazo de escritura
+        conn.deadline = time.monotonic() + config.write_timeout
+        if not conn.outbuf and conn.file is None and conn.stream is None:
+            if conn.pending is not None:
+                request, status, parse_seconds, handle_seconds, write_started = conn.pending
+                finish_request(
+                    config,
+                    conn.address,
+                    request,
+                    status,
+                    parse_seconds,
+                    handle_seconds,
+                    time.perf_counter() - write_started,
+                    conn.sent,
+                )
+                conn.pending = None
+            if not conn.keep_alive:
+                # Respuesta enviada por completo y la conexión no es persistente
+                close_connection(selector, conn)
+                return
+            # Se vuelve a esperar la siguiente solicitud en la misma conexión
+            conn.outbuf = None
+            selector.modify(conn.sock, selectors.EVENT_READ, data=conn)
+            conn.phase = "idle"
+            start_response(selector, conn, config, wheel)
+
+
+def start_response(selector, conn, config, wheel=None):
+    """
+    Si el buffer de entrada contiene una solicitud completa, la procesa y deja la
+    respuesta lista para enviarse cuando el socket admita escritura. Si todavía
+    faltan bytes, actualiza el plazo de lectura de la conexión.
+    """
+    started = time.perf_counter()
+    try:
+        request = conn.parser.next_request()
+    except ParseError as e:
+        conn.keep_alive = False
+        conn.outbuf = memoryview(encode_response(parse_error_response(e), False))
+        conn.pending = (None, e.status[:3], 0.0, 0.0, time.perf_counter())
+        conn.sent = 0
+        set_deadline(conn, "write", time.monotonic() + config.write_timeout, wheel)
+        selector.modify(conn.sock, selectors.EVENT_WRITE, data=conn)
+        return
+    handle_started = time.perf_counter()
+    conn.parse_seconds += handle_started - started
+    if request is None:
+        update_read_deadline(conn, config, wheel, time.monotonic())
+        return
+
+    # Se procesa la solicitud con la misma lógica de enrutamiento del servidor con hilos
+    response = process_request(request, config)
+    write_started = time.perf_counter()
+    conn.pending = (
+        request,
+        response_status(response),
+        conn.parse_seconds,
+        write_started - handle_started,
+        write_started,
+    )
+    conn.sent = 0
+    conn.parse_seconds = 0.0
+    conn.served += 1
+    conn.keep_alive = (
+        conn.keep_alive
+        and conn.served < config.max_keep_alive_requests
+        and request.keep_alive
+        and not response.startswith(CLOSING_STATUS_LINES)
+        and not closes_after_body(response)
+    )
+    if isinstance(response, FileResponse):
+        if response.path is not None:
+            try:
+                conn.file = open(response.path, "rb")
+            except OSError:
+                close_connection(selector, conn)
+                return
+            conn.file_offset = response.offset
+            conn.file_remaining = response.length
+        conn.outbuf = memoryview(add_connection_header(response.head, conn.keep_alive).encode())
+    elif isinstance(response, StreamResponse):
+        conn.stream = response.body()
+        conn.outbuf = memoryview(response.head(conn.keep_alive))
+    else:
+        conn.outbuf = memoryview(encode_response(response, conn.keep_alive))
+    set_deadline(conn, "write", time.monotonic() + config.write_timeout, wheel)
+    selector.modify(conn.sock, selectors.EVENT_WRITE, data=conn)
+
+
+def close_connection(selector, conn):
+    """
+    Elimina la conexión del selector y cierra su socket.
+    """
+    try:
+        selector.unregister(conn.sock)
+    except (KeyError, ValueError):
+        pass
+    if conn.file is not None:
+        conn.file.close()
+        conn.file = None
+    if conn.stream is not None:
+        conn.stream.close()
+        conn.stream = None
+    conn.sock.close()
+    conn.timer_tick = None  # Su entrada en la rueda queda obsoleta
+    if conn.tracked:
+        conn.tracked = False  # Una conexión cerrada dos veces se descuenta una sola vez
+        metrics.connection_closed()
@@ -0,0 +1,16 @@
+def raise_fd_limit():
+    """
+    Eleva el límite blando de descriptores de archivo al límite duro del proceso,
+    necesario para mantener miles de conexiones abiertas simultáneamente.
+    """
+    try:
+        import resource
+    except ImportError:  # Plataformas sin el módulo resource (Windows)
+        return
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        except (ValueError, OSError):
+            pass
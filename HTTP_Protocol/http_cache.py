@@ -0,0 +1,452 @@
+import atexit
+import hashlib
+import mmap
+import os
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from threading import Lock
+
+from client import ResponseHead, StreamedResponse, header_value
+
+# Límites por defecto de la caché en memoria
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MEMORY_BYTES = 32 * 1024 * 1024
+
+# Respuestas con cuerpo mayor no se guardan (se entregan en streaming sin pasar por la caché)
+DEFAULT_MAX_ENTRY_SIZE = 64 * 1024 * 1024
+
+# Con almacenamiento en disco, los cuerpos de al menos este tamaño se guardan en
+# archivos y se leen con mmap en lugar de ocupar memoria del proceso
+DEFAULT_MMAP_THRESHOLD = 256 * 1024
+DEFAULT_DISK_BYTES = 1024 * 1024 * 1024
+
+# Códigos de estado cuyas respuestas pueden guardarse (RFC 9111, sección 4.2.2)
+CACHEABLE_STATUSES = ("200", "203", "204", "300", "301", "308", "404", "410")
+
+# Encabezados condicionales que, si los envía el usuario, hacen que la caché no intervenga
+CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since", "if-match", "if-unmodified-since", "if-range")
+
+
+def parse_cache_control(value):
+    """
+    Convierte un encabezado Cache-Control en un diccionario directiva -> valor
+    (None para las directivas sin valor).
+    """
+    directives = {}
+    for item in value.split(","):
+        name, separator, argument = item.strip().partition("=")
+        if name:
+            directives[name.strip().lower()] = argument.strip().strip('"') if separator else None
+    return directives
+
+
+def parse_http_date(value):
+    """
+    Convierte una fecha HTTP en segundos desde la época, o None si no es válida.
+    """
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def freshness_lifetime(headers, now):
+    """
+    Calcula durante cuántos segundos una respuesta puede usarse sin revalidar,
+    según Cache-Control (max-age, no-cache, no-store), Expires, Date y Age.
+
+    Retorna:
+      Segundos de frescura restantes, o None si la respuesta no debe guardarse.
+    """
+    cache_control = parse_cache_control(header_value(headers, "Cache-Control", ""))
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0
+
+    lifetime = 0
+    if cache_control.get("max-age") is not None:
+        try:
+            lifetime = int(cache_control["max-age"])
+        except ValueError:
+            lifetime = 0
+    else:
+        expires = header_value(headers, "Expires")
+        if expires is not None:
+            # Un Expires inválido (por ejemplo "0") significa que ya expiró
+            expires_at = parse_http_date(expires) or 0
+            date = parse_http_date(header_value(headers, "Date", "")) or now
+            lifetime = expires_at - date
+
+    try:
+        age = int(header_value(headers, "Age", "0"))
+    except ValueError:
+        age = 0
+    return max(0, lifetime - age)
+
+
+class BufferReader:
+    """
+    Lector de un cuerpo ya guardado (bytes o un mmap) con la misma interfaz que
+    client.ResponseReader, para entregar las respuestas cacheadas como StreamedResponse.
+    """
+
+    def __init__(self, body):
+        self.body = body
+        self.body_complete = False
+
+    def has_pending_data(self):
+        return False
+
+    def read_body(self, head):
+        self.body_complete = True
+        return self.body[:]
+
+    def iter_body(self, head, chunk_size):
+        view = memoryview(self.body)
+        try:
+            for start in range(0, len(view), chunk_size):
+                yield bytes(view[start:start + chunk_size])
+        finally:
+            view.release()
+        self.body_complete = True
+
+
+class DiskBody:
+    """
+    Cuerpo guardado en un archivo y mapeado en memoria. Cuenta las respuestas que lo
+    están leyendo para que desalojarlo no cierre el mmap bajo un lector: al
+    descartarlo el archivo se elimina de inmediato y el mmap se cierra cuando
+    termina el último lector.
+    """
+
+    __slots__ = ("path", "mapped", "readers", "discarded", "lock")
+
+    def __init__(self, path, mapped):
+        self.path = path
+        self.mapped = mapped
+        self.readers = 0
+        self.discarded = False
+        self.lock = Lock()
+
+    def __len__(self):
+        return len(self.mapped)
+
+    def acquire(self):
+        """
+        Registra un lector.
+
+        Retorna:
+          El mmap del cuerpo, o None si ya se descartó.
+        """
+        with self.lock:
+            if self.discarded:
+                return None
+            self.readers += 1
+            return self.mapped
+
+    def release(self):
+        with self.lock:
+            self.readers -= 1
+            close = self.discarded and not self.readers
+        if close:
+            self._close()
+
+    def discard(self):
+        with self.lock:
+            if self.discarded:
+                return
+            self.discarded = True
+            close = not self.readers
+        if close:
+            self._close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def _close(self):
+        try:
+            self.mapped.close()
+        except BufferError:
+            pass  # Queda una vista abierta; el mmap se libera al recolectarla
+
+
+class CacheEntry:
+    """
+    Respuesta guardada en la caché. El cuerpo se guarda tal como se recibió (con su
+    Content-Encoding) en memoria o, si es grande y hay almacenamiento en disco, en un
+    archivo mapeado en memoria.
+
+    Atributos:
+      status      -> Código y motivo (por ejemplo "200 OK")
+      headers     -> Lista [[clave, valor], ...] de la respuesta
+      body        -> bytes, o DiskBody si el cuerpo está en disco
+      path        -> Archivo del cuerpo en disco (None si está en memoria)
+      expires_at  -> Instante (segundos desde la época) en que deja de estar fresca
+      vary        -> Valores de los encabezados de la solicitud listados en Vary
+    """
+
+    __slots__ = ("status", "headers", "body", "path", "size", "expires_at", "vary")
+
+    def __init__(self, status, headers, body, path, expires_at, vary):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.path = path
+        self.size = len(body)
+        self.expires_at = expires_at
+        self.vary = vary
+
+    def is_fresh(self, now):
+        return now < self.expires_at
+
+    def validators(self):
+        """
+        Encabezados condicionales para revalidar la entrada con el servidor.
+        """
+        headers = []
+        etag = header_value(self.headers, "ETag")
+        if etag is not None:
+            headers.append(("If-None-Match", etag))
+        last_modified = header_value(self.headers, "Last-Modified")
+        if last_modified is not None:
+            headers.append(("If-Modified-Since", last_modified))
+        return headers
+
+    def response(self):
+        """
+        Construye una StreamedResponse que lee el cuerpo guardado.
+
+        Retorna:
+          La respuesta, o None si el cuerpo en disco ya fue desalojado.
+        """
+        fields = {key.lower(): value.lower() for key, value in self.headers}
+        head = ResponseHead(self.status, self.headers, fields, True, "length", self.size)
+        if self.path is None:
+            return StreamedResponse(head, BufferReader(self.body), lambda reusable: None)
+        mapped = self.body.acquire()
+        if mapped is None:
+            return None
+        # El mmap sigue abierto hasta que la respuesta se lee por completo o se cierra
+        return StreamedResponse(head, BufferReader(mapped), lambda reusable: self.body.release())
+
+    def discard(self):
+        if self.path is not None:
+            self.body.discard()
+
+
+class HTTPCache:
+    """
+    Caché privada de respuestas GET para client.Session. Respeta Cache-Control
+    (max-age, no-cache, no-store), Expires y Vary, y revalida las entradas vencidas
+    con If-None-Match / If-Modified-Since: ante un 304 se reutiliza el cuerpo guardado.
+    Las entradas se desalojan en orden LRU al superar los límites de cantidad o tamaño.
+
+    Uso:
+      session = client.Session(cache=HTTPCache(disk_dir="/var/tmp/http-cache"))
+    """
+
+    def __init__(
+        self,
+        max_entries=DEFAULT_MAX_ENTRIES,
+        memory_bytes=DEFAULT_MEMORY_BYTES,
+        max_entry_size=DEFAULT_MAX_ENTRY_SIZE,
+        disk_dir=None,
+        disk_bytes=DEFAULT_DISK_BYTES,
+        mmap_threshold=DEFAULT_MMAP_THRESHOLD,
+    ):
+        self.max_entries = max_entries
+        self.memory_bytes = memory_bytes
+        self.max_entry_size = max_entry_size
+        self.disk_dir = disk_dir
+        self.disk_bytes = disk_bytes
+        self.mmap_threshold = mmap_threshold
+        self._entries = OrderedDict()  # url -> CacheEntry
+        self._memory_used = 0
+        self._disk_used = 0
+        self._lock = Lock()
+        self.hits = 0  # Respuestas servidas sin contactar al servidor
+        self.revalidations = 0  # Respuestas 304 que reutilizaron el cuerpo guardado
+        self.misses = 0
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+            # Los archivos de la caché no sobreviven al proceso
+            atexit.register(self.clear)
+
+    def send(self, session, url, headers=""):
+        """
+        Realiza un GET a través de la caché (lo invoca Session.stream en cada salto).
+
+        Retorna:
+          StreamedResponse, leída de la caché o del servidor.
+        """
+        if isinstance(headers, dict):
+            headers = list(headers.items())
+        headers = list(headers or [])
+        names = {key.lower() for key, _ in headers}
+        request_control = parse_cache_control(
+            ", ".join(value for key, value in headers if key.lower() == "cache-control")
+        )
+        # El usuario gestiona sus propias solicitudes condicionales o pide no usar la caché
+        if "no-store" in request_control or names.intersection(CONDITIONAL_HEADERS):
+            return session.send("GET", url, headers)
+
+        now = time.time()
+        entry = self.get(url, headers)
+        revalidate = "no-cache" in request_control or request_control.get("max-age") == "0"
+        if entry is not None and entry.is_fresh(now) and not revalidate:
+            response = entry.response()
+            if response is not None:
+                self.hits += 1
+                return response
+            entry = None  # Desalojada por otro hilo tras encontrarla
+
+        request_headers = headers + (entry.validators() if entry is not None else [])
+        response = session.send("GET", url, request_headers)
+        if entry is not None and response.status_code.startswith("304"):
+            response.close()
+            cached = self.refresh(url, entry, response.headers, now).response()
+            if cached is not None:
+                self.revalidations += 1
+                return cached
+            # El cuerpo se desalojó durante la revalidación: se pide de nuevo completo
+            response = session.send("GET", url, headers)
+
+        self.misses += 1
+        return self.store(url, headers, response, now)
+
+    def get(self, url, request_headers):
+        """
+        Busca la entrada de la URL; solo coincide si los encabezados de Vary son iguales.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            self._entries.move_to_end(url)
+        for name, value in entry.vary:
+            if header_value(request_headers, name) != value:
+                return None
+        return entry
+
+    def store(self, url, request_headers, response, now):
+        """
+        Guarda la respuesta si es almacenable y retorna la respuesta a entregar.
+        Las respuestas no almacenables (o sin longitud conocida) se entregan sin leer.
+        """
+        head = response.head
+        lifetime = freshness_lifetime(response.headers, now)
+        storable = (
+            lifetime is not None
+            and response.status_code[:3] in CACHEABLE_STATUSES
+            and head.framing in ("length", "empty")
+            and head.length <= self.max_entry_size
+            and (lifetime > 0 or header_value(response.headers, "ETag") is not None
+                 or header_value(response.headers, "Last-Modified") is not None)
+        )
+        vary = [name.strip() for name in header_value(response.headers, "Vary", "").split(",") if name.strip()]
+        if not storable or "*" in vary:
+            return response
+
+        vary_values = [(name, header_value(request_headers, name)) for name in vary]
+        if self.disk_dir is not None and head.length >= self.mmap_threshold:
+            path, body = self.write_to_disk(url, response)
+        else:
+            path, body = None, response.read(decode_content=False)
+        entry = CacheEntry(response.status_code, response.headers, body, path, now + lifetime, vary_values)
+        # La respuesta se obtiene antes de publicar la entrada, que otro hilo podría desalojar
+        result = entry.response()
+        if entry.size != head.length:
+            # Cuerpo truncado: se entrega lo recibido sin guardarlo
+            entry.discard()
+            return result
+        self.put(url, entry)
+        return result
+
+    def refresh(self, url, entry, headers, now):
+        """
+        Actualiza los encabezados y la frescura de una entrada revalidada con un 304.
+
+        Retorna:
+          La entrada actualizada.
+        """
+        updated = {key.lower(): [key, value] for key, value in headers}
+        merged = []
+        for key, value in entry.headers:
+            merged.append(updated.pop(key.lower(), [key, value]))
+        merged.extend(
+            item for name, item in updated.items() if name not in ("connection", "content-length")
+        )
+        # Se reemplaza la entrada en lugar de modificarla: otros hilos pueden estar leyéndola
+        fresh = CacheEntry(
+            entry.status, merged, entry.body, entry.path,
+            now + (freshness_lifetime(merged, now) or 0), entry.vary,
+        )
+        with self._lock:
+            if self._entries.get(url) is entry:
+                self._entries[url] = fresh
+        return fresh
+
+    def write_to_disk(self, url, response):
+        """
+        Escribe el cuerpo de la respuesta en un archivo del directorio de la caché a
+        medida que se recibe, sin reunirlo en memoria, y lo mapea en memoria.
+
+        Retorna:
+          (ruta, DiskBody), o (None, b"") si no se recibió ningún byte.
+        """
+        name = hashlib.sha256(url.encode()).hexdigest()
+        path = os.path.join(self.disk_dir, f"{name}-{time.monotonic_ns():x}")
+        try:
+            with open(path, "wb+") as file:
+                for chunk in response.iter_content(decode_content=False):
+                    file.write(chunk)
+                if not file.tell():
+                    os.unlink(path)  # No se puede mapear un archivo vacío
+                    return None, b""
+                file.flush()
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            raise
+        return path, DiskBody(path, mapped)
+
+    def put(self, url, entry):
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self._account(old, -1)
+                old.discard()
+            self._entries[url] = entry
+            self._account(entry, 1)
+            # Se desalojan las entradas menos usadas (nunca la recién agregada)
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries
+                or self._memory_used > self.memory_bytes
+                or self._disk_used > self.disk_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._account(evicted, -1)
+                evicted.discard()
+
+    def clear(self):
+        """
+        Vacía la caché eliminando los archivos de las entradas en disco.
+        """
+        with self._lock:
+            for entry in self._entries.values():
+                entry.discard()
+            self._entries.clear()
+            self._memory_used = 0
+            self._disk_used = 0
+
+    def _account(self, entry, sign):
+        if entry.path is None:
+            self._memory_used += sign * entry.size
+        else:
+            self._disk_used += sign * entry.size
@@ -2,18 +2,142 @@
 import client
 # Se importa el módulo argparse para manejar los argumentos de la línea de comandos
 import argparse
+import json
+import os
+import sys
+
+# Los módulos usados solo por los modos por lotes y persistente (queue, socketserver,
+# concurrent.futures) se importan dentro de sus funciones para no retrasar el inicio.
+
+# Solicitudes del modo por lotes ejecutadas en paralelo por defecto
+DEFAULT_JOBS = 8
+
+# Resultados pendientes de escribir como máximo (acota la memoria con entradas muy largas)
+RESULT_WINDOW = 256
+
+
+def run_job(session, line):
+    """
+    Ejecuta una solicitud descrita por una línea JSON {method, url, headers, data}.
+
+    Retorna:
+      Línea JSON con {"status", "headers", "body"} o {"error"}; si el trabajo trae
+      un campo "id" se copia al resultado para poder asociarlos.
+    """
+    job = None
+    try:
+        job = json.loads(line)
+        headers = job.get("headers") or []
+        if isinstance(headers, dict):
+            headers = list(headers.items())
+        status, response_headers, body = session.request(
+            job.get("method", "GET"), job["url"], headers, job.get("data") or ""
+        )
+        result = {
+            "status": int(status.split(" ", 1)[0]),
+            "headers": dict(response_headers),
+            "body": body,
+        }
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+    if isinstance(job, dict) and "id" in job:
+        result["id"] = job["id"]
+    return json.dumps(result, ensure_ascii=False)
+
+
+def run_batch(lines, write, session, executor):
+    """
+    Ejecuta en paralelo los trabajos leídos de lines y escribe un resultado por
+    línea en el mismo orden de entrada, en cuanto cada uno está disponible.
+
+    Parámetros:
+      lines    -> Iterable de líneas JSON (stdin, un archivo o un socket)
+      write    -> Función que recibe cada línea de resultado
+      session  -> client.Session compartida, cuyas conexiones se reutilizan
+      executor -> ThreadPoolExecutor en el que se ejecutan las solicitudes
+    """
+    import queue
+    from threading import Thread
+
+    # Cola acotada de resultados en orden: si se llena, se deja de leer la entrada
+    results = queue.Queue(maxsize=RESULT_WINDOW)
+
+    def writer():
+        broken = False
+        while True:
+            future = results.get()
+            if future is None:
+                return
+            line = future.result()
+            if not broken:
+                try:
+                    write(line)
+                except OSError:
+                    broken = True  # El lector se fue: se descartan los resultados restantes
+
+    thread = Thread(target=writer)
+    thread.start()
+    try:
+        for line in lines:
+            if line.strip():
+                results.put(executor.submit(run_job, session, line))
+    finally:
+        results.put(None)
+        thread.join()
+
+
+def write_line(stream):
+    """
+    Crea la función de escritura de resultados sobre un flujo de texto.
+    """
+
+    def write(line):
+        stream.write(line + "\n")
+        stream.flush()
+
+    return write
+
+
+def serve(path, session, executor):
+    """
+    Modo persistente: atiende trabajos JSON por líneas en un socket Unix local.
+    Cada conexión puede enviar cualquier cantidad de trabajos y recibe los resultados
+    en orden; todas comparten el pool de conexiones HTTP del proceso.
+    """
+    import socketserver
+
+    class JobHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            def write(line):
+                self.wfile.write(line.encode() + b"\n")
+
+            lines = (raw.decode(errors="replace") for raw in self.rfile)
+            run_batch(lines, write, session, executor)
+
+    if os.path.exists(path):
+        os.unlink(path)  # Socket de una ejecución anterior
+    server = socketserver.ThreadingUnixStreamServer(path, JobHandler)
+    server.daemon_threads = True
+    os.chmod(path, 0o600)  # Solo el usuario actual puede enviar trabajos
+    print(f"Listening for jobs on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.unlink(path)
+
 
 # Punto de entrada principal cuando se ejecuta este script
 if __name__ == "__main__":
     # Se crea un objeto ArgumentParser con una descripción de la aplicación
     parser = argparse.ArgumentParser(description="HTTP client")
     
-    # Se define el argumento obligatorio -m / --method para especificar el método HTTP (ej. GET, POST)
-    parser.add_argument("-m", "--method", required=True, help="HTTP method, e.g., GET")
+    # Se define el argumento -m / --method para especificar el método HTTP (ej. GET, POST)
+    parser.add_argument("-m", "--method", help="HTTP method, e.g., GET")
     
-    # Se define el argumento obligatorio -u / --url para la URL de destino de la solicitud
+    # Se define el argumento -u / --url para la URL de destino de la solicitud
     parser.add_argument(
-        "-u", "--url", required=True, help="URL, e.g., http://localhost:4333/example"
+        "-u", "--url", help="URL, e.g., http://localhost:4333/example"
     )
     
     # Se define el argumento opcional -H / --header para pasar encabezados en formato JSON (por defecto se usa un diccionario vacío)
@@ -30,9 +154,59 @@ if __name__ == "__main__":
         "-d", "--data", type=str, default="", help="Body content for POST/PUT requests"
     )
     
+    # Modos por lotes y persistente: -m y -u solo son obligatorios en el modo de una solicitud
+    parser.add_argument(
+        "--batch",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help='Run JSON-lines jobs {"method", "url", "headers", "data"} from FILE (or stdin) and print one JSON result per line',
+    )
+    parser.add_argument(
+        "--serve", metavar="SOCKET", help="Serve JSON-lines jobs on a local Unix socket"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=DEFAULT_JOBS, help="Parallel requests in batch/serve mode"
+    )
+    parser.add_argument(
+        "--pre-resolve",
+        action="append",
+        default=[],
+        metavar="HOST",
+        help="Resolve HOST[:PORT] at startup so the first requests skip DNS (repeatable)",
+    )
+
     # Se analiza la línea de comandos y se obtienen los argumentos
     args = parser.parse_args()
 
+    # Las resoluciones quedan en la caché de DNS compartida por todas las conexiones
+    if args.pre_resolve:
+        from resolver import pre_resolve
+
+        for host, error in pre_resolve(args.pre_resolve).items():
+            print(f"Could not resolve {host}: {error}", file=sys.stderr)
+
+    if args.batch or args.serve:
+        # Una sola sesión para todos los trabajos, sin imprimir las solicitudes en la salida JSON
+        from concurrent.futures import ThreadPoolExecutor
+
+        session = client.Session(client.ConnectionPool(max_per_host=args.jobs), verbose=False)
+        with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+            if args.serve:
+                try:
+                    serve(args.serve, session, executor)
+                except KeyboardInterrupt:
+                    pass
+            elif args.batch == "-":
+                run_batch(sys.stdin, write_line(sys.stdout), session, executor)
+            else:
+                with open(args.batch, encoding="utf-8") as jobs:
+                    run_batch(jobs, write_line(sys.stdout), session, executor)
+        session.close()
+        sys.exit(0)
+    if not args.method or not args.url:
+        parser.error("the following arguments are required: -m/--method, -u/--url")
+
     # Se asignan los valores obtenidos a variables locales
     method = args.method
     url = args.url
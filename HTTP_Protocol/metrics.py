@@ -0,0 +1,215 @@
+from bisect import bisect_left
+from threading import Lock, current_thread, local
+
+# Límites superiores (segundos) de los buckets de los histogramas de latencia
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Métodos con etiqueta propia; el resto se cuenta como "OTHER" para acotar las series
+KNOWN_METHODS = frozenset(
+    ("GET", "POST", "HEAD", "PUT", "DELETE", "OPTIONS", "TRACE", "CONNECT")
+)
+
+# Cantidad de fragmentos a partir de la cual se fusionan los de hilos ya terminados
+MAX_SHARDS = 64
+
+# Content-Type del formato de texto de Prometheus
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Nombre, tipo y descripción de cada métrica
+METRICS_HELP = {
+    "http_requests_total": ("counter", "HTTP requests served."),
+    "http_connections_total": ("counter", "TCP connections accepted."),
+    "http_connections_in_flight": ("gauge", "TCP connections currently open."),
+    "http_received_bytes_total": ("counter", "Bytes received from clients."),
+    "http_sent_bytes_total": ("counter", "Bytes sent to clients."),
+    "http_request_parse_seconds": ("histogram", "Time spent parsing the request."),
+    "http_request_handle_seconds": ("histogram", "Time spent building the response."),
+    "http_response_write_seconds": ("histogram", "Time from response ready to fully sent."),
+}
+
+
+class MetricsShard:
+    """
+    Contadores e histogramas de un solo hilo. Cada hilo actualiza solo su fragmento,
+    de modo que registrar una métrica no toma ningún candado; al exportar se suman
+    todos los fragmentos.
+
+    Atributos:
+      counters   -> (nombre, etiquetas) -> valor
+      histograms -> (nombre, etiquetas) -> [conteo por bucket..., conteo +Inf, suma]
+    """
+
+    __slots__ = ("thread", "counters", "histograms")
+
+    def __init__(self, thread=None):
+        self.thread = thread
+        self.counters = {}
+        self.histograms = {}
+
+    def add(self, name, labels, value=1):
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, seconds):
+        key = (name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = [0] * (len(LATENCY_BUCKETS) + 2)
+        histogram[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        histogram[-1] += seconds
+
+    def merge(self, other):
+        """
+        Suma a este fragmento los valores de otro.
+        """
+        for key, value in other.counters.copy().items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        for key, values in other.histograms.copy().items():
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [0] * (len(LATENCY_BUCKETS) + 2)
+            for index, value in enumerate(values):
+                histogram[index] += value
+
+
+# Fragmentos de los hilos vivos y acumulado de los hilos terminados
+_local = local()
+_shards = []
+_retired = MetricsShard()
+_shards_lock = Lock()
+
+
+def shard():
+    """
+    Retorna el fragmento del hilo actual, creándolo la primera vez.
+    """
+    current = getattr(_local, "shard", None)
+    if current is None:
+        current = _local.shard = MetricsShard(current_thread())
+        with _shards_lock:
+            _shards.append(current)
+            if len(_shards) > MAX_SHARDS:
+                _retire_dead_shards()
+    return current
+
+
+def _retire_dead_shards():
+    """
+    Fusiona en _retired los fragmentos de hilos terminados (por ejemplo, los de un
+    hilo por conexión). Se llama con _shards_lock tomado.
+    """
+    alive = []
+    for item in _shards:
+        if item.thread.is_alive():
+            alive.append(item)
+        else:
+            _retired.merge(item)
+    _shards[:] = alive
+
+
+def route_label(uri):
+    """
+    Etiqueta de ruta con cardinalidad acotada: las rutas fijas de process_request.
+    """
+    if uri.startswith("/secure"):
+        return "/secure"
+    if uri == "/metrics":
+        return "/metrics"
+    if uri == "*":
+        return "*"
+    return "/"
+
+
+def method_label(method):
+    return method if method in KNOWN_METHODS else "OTHER"
+
+
+def record_request(method, route, status, parse_seconds, handle_seconds, write_seconds, sent):
+    """
+    Registra una solicitud atendida: conteo por método, ruta y estado, bytes enviados
+    e histogramas de las tres fases.
+    """
+    current = shard()
+    current.add(
+        "http_requests_total",
+        (("method", method_label(method)), ("route", route), ("status", status)),
+    )
+    current.add("http_sent_bytes_total", (), sent)
+    labels = (("route", route),)
+    current.observe("http_request_parse_seconds", labels, parse_seconds)
+    current.observe("http_request_handle_seconds", labels, handle_seconds)
+    current.observe("http_response_write_seconds", labels, write_seconds)
+
+
+def record_received(size):
+    shard().add("http_received_bytes_total", (), size)
+
+
+def connection_opened():
+    current = shard()
+    current.add("http_connections_total", ())
+    current.add("http_connections_in_flight", ())
+
+
+def connection_closed():
+    shard().add("http_connections_in_flight", (), -1)
+
+
+def snapshot():
+    """
+    Retorna un MetricsShard con la suma de todos los fragmentos.
+    """
+    total = MetricsShard()
+    with _shards_lock:
+        _retire_dead_shards()
+        total.merge(_retired)
+        for item in _shards:
+            total.merge(item)
+    return total
+
+
+def format_labels(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+
+def render(extra=()):
+    """
+    Exporta todas las métricas en el formato de texto de Prometheus.
+
+    Parámetros:
+      extra -> Métricas adicionales como (nombre, tipo, descripción, valor)
+               (por ejemplo, los contadores del modo pool)
+
+    Retorna:
+      Texto listo para el cuerpo de la respuesta de /metrics.
+    """
+    total = snapshot()
+    series = {}
+    for (name, labels), value in total.counters.items():
+        series.setdefault(name, []).append(f"{name}{format_labels(labels)} {value}")
+    for (name, labels), values in total.histograms.items():
+        lines = series.setdefault(name, [])
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), values):
+            cumulative += count
+            le = bound if isinstance(bound, str) else f"{bound:g}"
+            lines.append(f"{name}_bucket{format_labels(labels, (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{format_labels(labels)} {values[-1]:.6f}")
+        lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+
+    output = []
+    for name, (kind, description) in METRICS_HELP.items():
+        if name in series:
+            output.append(f"# HELP {name} {description}")
+            output.append(f"# TYPE {name} {kind}")
+            output.extend(sorted(series[name]) if kind != "histogram" else series[name])
+    for name, kind, description, value in extra:
+        output.append(f"# HELP {name} {description}")
+        output.append(f"# TYPE {name} {kind}")
+        output.append(f"{name} {value}")
+    return "\n".join(output) + "\n"
@@ -0,0 +1,181 @@
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+from compression import variant_cache
+from server import DEFAULT_BACKLOG, DEFAULT_CONFIG, run_server
+
+# Segundos que el supervisor espera a que los procesos terminen sus conexiones tras SIGTERM
+DRAIN_TIMEOUT = 15
+
+# Si un proceso muere antes de este tiempo se espera antes de relanzarlo (evita bucles de fork)
+MIN_WORKER_LIFETIME = 1.0
+
+# Segundos entre revisiones del estado de los procesos hijos por parte del supervisor
+SUPERVISOR_POLL_INTERVAL = 0.05
+
+# Segundos entre revisiones del tamaño del registro de accesos compartido
+ACCESS_LOG_ROTATE_INTERVAL = 1.0
+
+
+def run_multiprocess_server(
+    host="localhost",
+    port=8080,
+    backlog=DEFAULT_BACKLOG,
+    workers=os.cpu_count() or 1,
+    mode="threaded",
+    engine_options=None,
+    config=DEFAULT_CONFIG,
+):
+    """
+    Inicia varios procesos servidores que enlazan el mismo puerto con SO_REUSEPORT,
+    de modo que el kernel reparte las conexiones entrantes entre ellos y cada proceso
+    usa su propio núcleo sin competir por el GIL.
+    El proceso padre actúa como supervisor: relanza los procesos que mueren y, al
+    recibir SIGTERM o SIGINT, ordena a todos drenar sus conexiones y terminar.
+    Si hay registro de accesos, todos los procesos escriben el mismo archivo y solo
+    el supervisor lo rota.
+
+    Parámetros:
+      host           -> Dirección en la que escucha el servidor
+      port           -> Puerto compartido por todos los procesos
+      backlog        -> Tamaño de la cola de conexiones pendientes de cada proceso
+      workers        -> Cantidad de procesos servidores
+      mode           -> Motor de cada proceso: "threaded", "pool" o "eventloop"
+      engine_options -> Diccionario con parámetros adicionales del motor
+                        (por ejemplo workers y queue_size del modo pool)
+      config         -> ServerConfig compartido por todos los procesos
+    """
+    if not hasattr(socket, "SO_REUSEPORT") or not hasattr(os, "fork"):
+        raise RuntimeError("Multi-process mode requires fork() and SO_REUSEPORT support")
+    engine_options = engine_options or {}
+    access_log = config.access_log
+    if access_log is not None:
+        # Los procesos solo reabren el archivo cuando el supervisor lo rota
+        access_log.external_rotation = True
+
+    children = {}  # pid -> instante de lanzamiento
+    stopping = False
+    drain_deadline = None  # Instante en que se fuerzan los procesos que no terminaron
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            # Proceso hijo: atiende conexiones hasta recibir SIGTERM y nunca vuelve al supervisor
+            code = 0
+            try:
+                worker_main(host, port, backlog, mode, engine_options, config)
+            except SystemExit as e:
+                code = e.code or 0
+            except BaseException:
+                code = 1
+            finally:
+                # os._exit no espera a los hilos ni ejecuta atexit, así que primero se
+                # terminan las conexiones en curso y luego se hace la limpieza a mano
+                wait_for_threads()
+                worker_cleanup(config)
+                sys.stdout.flush()
+                os._exit(code)
+        children[pid] = time.monotonic()
+
+    def stop(signum, frame):
+        nonlocal stopping, drain_deadline
+        if stopping:
+            return
+        stopping = True
+        # El plazo de drenado cuenta desde la señal, aunque ningún proceso haya terminado aún
+        drain_deadline = time.monotonic() + DRAIN_TIMEOUT
+        print(f"Supervisor: señal {signum} recibida, drenando {len(children)} procesos")
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        spawn()
+    print(f"Supervisor: {workers} procesos ({mode}) escuchando en {host}:{port}")
+
+    # Supervisión: se relanza cada proceso que muere mientras no se esté deteniendo el
+    # servidor. Se consulta sin bloquear (os.wait se reanudaría tras el manejador de la
+    # señal) para que el plazo de drenado se respete desde que llega SIGTERM.
+    next_rotation = time.monotonic() + ACCESS_LOG_ROTATE_INTERVAL
+    while children:
+        now = time.monotonic()
+        if drain_deadline is not None and now >= drain_deadline:
+            break
+        if access_log is not None and now >= next_rotation:
+            access_log.rotate_if_needed()
+            next_rotation = now + ACCESS_LOG_ROTATE_INTERVAL
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if not pid:
+            time.sleep(SUPERVISOR_POLL_INTERVAL)
+            continue
+        started = children.pop(pid, None)
+        if stopping or started is None:
+            continue
+        print(f"Supervisor: proceso {pid} terminó (estado {status}), relanzando")
+        if time.monotonic() - started < MIN_WORKER_LIFETIME:
+            time.sleep(MIN_WORKER_LIFETIME)
+        if not stopping:
+            spawn()
+
+    # Los procesos que no terminaron dentro del plazo de drenado se fuerzan
+    for pid in children:
+        try:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        except (ProcessLookupError, ChildProcessError):
+            pass
+
+
+def worker_main(host, port, backlog, mode, engine_options, config):
+    """
+    Punto de entrada de cada proceso servidor.
+    SIGTERM se convierte en SystemExit para que el motor cierre su socket de escucha
+    y termine las conexiones en curso; SIGINT se ignora porque lo gestiona el supervisor.
+    """
+
+    def drain(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, drain)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    if mode == "eventloop":
+        from event_loop import run_event_loop_server
+
+        run_event_loop_server(host, port, backlog, reuse_port=True, config=config)
+    elif mode == "pool":
+        run_server(host, port, backlog, reuse_port=True, config=config, **engine_options)
+    else:
+        run_server(host, port, backlog, reuse_port=True, config=config)
+
+
+def worker_cleanup(config):
+    """
+    Limpieza que atexit haría en una salida normal y que os._exit omite: escribe los
+    registros de acceso pendientes y borra los archivos temporales de las variantes
+    comprimidas creados por este proceso.
+    """
+    if config.access_log is not None:
+        config.access_log.close()
+    variant_cache.clear()
+
+
+def wait_for_threads():
+    """
+    Espera a que terminen los hilos no demonio del proceso (conexiones en curso).
+    """
+    for thread in threading.enumerate():
+        if thread is not threading.main_thread() and not thread.daemon:
+            thread.join()
@@ -0,0 +1,227 @@
+# Tamaño máximo por defecto de la línea de solicitud más los encabezados
+DEFAULT_MAX_HEADER_SIZE = 64 * 1024
+
+# Tamaño máximo por defecto del cuerpo de una solicitud (Content-Length)
+DEFAULT_MAX_BODY_SIZE = 16 * 1024 * 1024
+
+
+class ParseError(Exception):
+    """
+    Solicitud malformada o que excede los límites del analizador.
+    El atributo status contiene la línea de estado HTTP con la que debe responderse.
+    """
+
+    def __init__(self, message, status="400 Bad Request"):
+        super().__init__(message)
+        self.status = status
+
+
+class Headers(dict):
+    """
+    Diccionario de encabezados que conserva los nombres tal como se recibieron, pero
+    cuyas búsquedas (headers["Range"], get, in) no distinguen mayúsculas
+    (RFC 9110, sección 5.1).
+    """
+
+    __slots__ = ("_names",)
+
+    def __init__(self):
+        super().__init__()
+        self._names = {}  # Nombre en minúsculas -> nombre tal como se recibió
+
+    def __setitem__(self, key, value):
+        name = key.lower()
+        previous = self._names.get(name)
+        if previous is not None and previous != key:
+            super().__delitem__(previous)
+        self._names[name] = key
+        super().__setitem__(key, value)
+
+    def __getitem__(self, key):
+        return super().__getitem__(self._names.get(key.lower(), key))
+
+    def __contains__(self, key):
+        return key.lower() in self._names
+
+    def get(self, key, default=None):
+        name = self._names.get(key.lower())
+        return default if name is None else super().get(name, default)
+
+
+class Request:
+    """
+    Solicitud HTTP ya separada en sus componentes.
+
+    Atributos:
+      method  -> Método HTTP (GET, POST, etc.)
+      uri     -> URI solicitada
+      version -> Versión del protocolo (por ejemplo "HTTP/1.1")
+      headers -> Headers con los nombres tal como se recibieron
+      body    -> Cuerpo de la solicitud en bytes (exactamente Content-Length bytes)
+      raw     -> Bytes completos de la solicitud (encabezados y cuerpo)
+    """
+
+    __slots__ = ("method", "uri", "version", "headers", "body", "raw", "connection")
+
+    def __init__(self, method, uri, version, headers, body, raw, connection=""):
+        self.method = method
+        self.uri = uri
+        self.version = version
+        self.headers = headers
+        self.body = body
+        self.raw = raw
+        self.connection = connection  # Valor del encabezado Connection en minúsculas
+
+    @property
+    def keep_alive(self):
+        """
+        Indica si el cliente desea mantener la conexión abierta tras la respuesta.
+        En HTTP/1.1 la conexión es persistente salvo "Connection: close"; en HTTP/1.0
+        solo lo es si el cliente envía "Connection: keep-alive".
+        """
+        if self.version == "HTTP/1.1":
+            return "close" not in self.connection
+        return "keep-alive" in self.connection
+
+    def text(self):
+        """
+        Retorna la solicitud completa decodificada como cadena.
+        """
+        return self.raw.decode(errors="replace")
+
+
+class RequestParser:
+    """
+    Analizador incremental de solicitudes HTTP.
+    Los datos recibidos del socket se agregan a un único bytearray del que se extraen
+    solicitudes completas sin decodificar los cuerpos ni volver a recorrer bytes ya
+    revisados. Varias solicitudes encadenadas (pipelining) se obtienen en orden.
+
+    Uso:
+      parser.feed(data)             -> agrega bytes recibidos del socket
+      request = parser.next_request() -> próxima solicitud completa o None
+      for request in parser: ...    -> todas las solicitudes completas disponibles
+    """
+
+    def __init__(self, max_header_size=DEFAULT_MAX_HEADER_SIZE, max_body_size=DEFAULT_MAX_BODY_SIZE):
+        self.max_header_size = max_header_size
+        self.max_body_size = max_body_size
+        self.buffer = bytearray()
+        self._scan_from = 0  # Posición desde la que continuar buscando el fin de encabezados
+        self._head = None  # Encabezados ya analizados de una solicitud que espera su cuerpo
+
+    def feed(self, data):
+        """
+        Agrega al buffer los bytes recibidos (bytes, bytearray o memoryview).
+        """
+        self.buffer += data
+
+    def __iter__(self):
+        while True:
+            request = self.next_request()
+            if request is None:
+                return
+            yield request
+
+    def has_pending_data(self):
+        """
+        Indica si hay bytes recibidos que todavía no forman una solicitud completa.
+        """
+        return bool(self.buffer)
+
+    def waiting_for_body(self):
+        """
+        Indica si los encabezados de la solicitud en curso ya se analizaron y solo falta el cuerpo.
+        """
+        return self._head is not None
+
+    def next_request(self):
+        """
+        Extrae del buffer la próxima solicitud completa.
+
+        Retorna:
+          Un objeto Request, o None si todavía faltan bytes.
+
+        Lanza:
+          ParseError si la solicitud es malformada o sus encabezados o su cuerpo
+          exceden los límites.
+        """
+        if self._head is None:
+            # Se ignoran líneas vacías antes de la línea de solicitud (RFC 2616, sección 4.1)
+            while self.buffer.startswith(b"\r\n"):
+                del self.buffer[:2]
+                self._scan_from = 0
+
+            header_end = self.buffer.find(b"\r\n\r\n", self._scan_from)
+            if header_end == -1:
+                if len(self.buffer) > self.max_header_size:
+                    raise ParseError("Request headers too large", "431 Request Header Fields Too Large")
+                # Solo se vuelven a revisar los últimos 3 bytes, que podrían iniciar el separador
+                self._scan_from = max(0, len(self.buffer) - 3)
+                return None
+            if header_end > self.max_header_size:
+                raise ParseError("Request headers too large", "431 Request Header Fields Too Large")
+
+            head = parse_head(bytes(self.buffer[:header_end]))
+            if head[5] > self.max_body_size:
+                # Se rechaza antes de recibir el cuerpo, sin acumularlo en el buffer
+                raise ParseError("Request body too large", "413 Content Too Large")
+            head.append(header_end + 4)
+            self._head = head
+
+        method, uri, version, headers, connection, content_length, head_length = self._head
+        total = head_length + content_length
+        if len(self.buffer) < total:
+            return None
+
+        raw = bytes(self.buffer[:total])
+        del self.buffer[:total]
+        self._head = None
+        self._scan_from = 0
+        return Request(method, uri, version, headers, raw[head_length:], raw, connection)
+
+
+def parse_head(head):
+    """
+    Analiza la línea de solicitud y los encabezados.
+
+    Parámetros:
+      head -> bytes desde el inicio de la solicitud hasta antes de la línea vacía
+
+    Retorna:
+      Lista [method, uri, version, headers, connection, content_length].
+    """
+    lines = head.decode(errors="replace").split("\r\n")
+
+    parts = lines[0].split(" ")
+    if len(parts) != 3 or not parts[0] or not parts[2].startswith("HTTP/"):
+        raise ParseError("Malformed request line")
+    method, uri, version = parts
+
+    headers = Headers()
+    connection = ""
+    content_length = None
+    for line in lines[1:]:
+        key, separator, value = line.partition(":")
+        if not separator or not key or key != key.strip():
+            raise ParseError("Malformed header line")
+        value = value.strip()
+        headers[key] = value
+
+        # Los encabezados que afectan el delimitado se interpretan aquí mismo
+        name = key.lower()
+        if name == "content-length":
+            # isdigit acepta dígitos no ASCII ("²") que int() rechaza
+            if not (value.isascii() and value.isdigit()):
+                raise ParseError("Invalid Content-Length")
+            # Valores distintos permitirían desincronizar el delimitado entre
+            # intermediarios (request smuggling, RFC 9112, sección 6.3)
+            if content_length is not None and int(value) != content_length:
+                raise ParseError("Conflicting Content-Length headers")
+            content_length = int(value)
+        elif name == "connection":
+            connection = value.lower()
+        elif name == "transfer-encoding":
+            raise ParseError("Chunked request bodies are not supported", "501 Not Implemented")
+
+    return [method, uri, version, headers, connection, content_length or 0]
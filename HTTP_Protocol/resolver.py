@@ -0,0 +1,216 @@
+import errno
+import os
+import selectors
+import socket
+import time
+from threading import Lock
+
+# Segundos durante los que se reutiliza una resolución (getaddrinfo no informa el TTL real)
+DEFAULT_DNS_TTL = 60.0
+
+# Cantidad máxima de (host, puerto) resueltos que se mantienen en caché
+DNS_CACHE_SIZE = 1024
+
+# Segundos que se espera a un intento de conexión antes de lanzar el siguiente en paralelo
+# (RFC 8305, sección 5: "Connection Attempt Delay", 250 ms recomendados)
+CONNECTION_ATTEMPT_DELAY = 0.25
+
+# Segundos máximos para establecer la conexión TCP con alguna de las direcciones
+CONNECT_TIMEOUT = 10
+
+
+class DNSCache:
+    """
+    Caché de resoluciones de nombres compartida por todos los hilos. Las entradas
+    expiran pasados ttl segundos; al llenarse se descarta la más antigua.
+
+    Atributos:
+      ttl         -> Segundos de validez de cada resolución
+      max_entries -> Cantidad máxima de entradas
+      hits        -> Resoluciones respondidas desde la caché
+      misses      -> Resoluciones que llamaron a getaddrinfo
+    """
+
+    def __init__(self, ttl=DEFAULT_DNS_TTL, max_entries=DNS_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}  # (host, puerto) -> (instante de expiración, direcciones)
+        self._lock = Lock()
+
+    def resolve(self, host, port):
+        """
+        Resuelve host y puerto a direcciones TCP, usando la caché si la entrada sigue vigente.
+
+        Retorna:
+          Lista de (family, type, proto, canonname, sockaddr) en el orden de getaddrinfo.
+
+        Lanza:
+          socket.gaierror si el nombre no puede resolverse.
+        """
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # getaddrinfo bloquea, por lo que se llama fuera del candado
+        addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (now + self.ttl, addresses)
+        return addresses
+
+    def invalidate(self, host):
+        """
+        Olvida todas las resoluciones de un host (por ejemplo, si ninguna dirección respondió).
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == host]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Caché compartida por socket_client y los pools de conexiones
+default_resolver = DNSCache()
+
+
+def pre_resolve(hosts, resolver=None):
+    """
+    Resuelve de antemano una lista de hosts para que las primeras solicitudes no
+    esperen a getaddrinfo (por ejemplo, al iniciar la terminal o el modo por lotes).
+
+    Parámetros:
+      hosts    -> Iterable de "host", "host:puerto" o URLs http(s)://host[:puerto]
+      resolver -> DNSCache a completar (None para la compartida)
+
+    Retorna:
+      Diccionario host -> excepción con los hosts que no pudieron resolverse.
+    """
+    resolver = resolver if resolver is not None else default_resolver
+    failures = {}
+    for host in hosts:
+        port = 80
+        if host.startswith("https://"):
+            port = 443
+        host = host.split("://", 1)[-1].split("/", 1)[0]
+        if host.startswith("["):  # Literal IPv6 entre corchetes
+            literal, _, rest = host[1:].partition("]")
+            host, port = literal, int(rest[1:]) if rest.startswith(":") else port
+        elif host.count(":") == 1:
+            host, _, port = host.partition(":")
+            port = int(port)
+        try:
+            resolver.resolve(host, port)
+        except OSError as e:
+            failures[host] = e
+    return failures
+
+
+def interleave_addresses(addresses):
+    """
+    Ordena las direcciones alternando familias (IPv6, IPv4, IPv6, ...) a partir de la
+    preferida por getaddrinfo, como indica la RFC 8305, sección 4.
+    """
+    by_family = {}
+    for address in addresses:
+        by_family.setdefault(address[0], []).append(address)
+    groups = list(by_family.values())
+    ordered = []
+    for index in range(max((len(group) for group in groups), default=0)):
+        for group in groups:
+            if index < len(group):
+                ordered.append(group[index])
+    return ordered
+
+
+def connect(host, port, timeout=CONNECT_TIMEOUT, resolver=None, delay=CONNECTION_ATTEMPT_DELAY):
+    """
+    Establece una conexión TCP con el host usando "Happy Eyeballs" (RFC 8305): se
+    intenta la primera dirección y, si no conecta en delay segundos (o falla), se
+    lanza el intento con la siguiente sin cancelar el anterior. Gana la primera
+    conexión establecida, de modo que una dirección caída (por ejemplo, un IPv6 sin
+    ruta) no cuesta un timeout completo.
+
+    Parámetros:
+      host     -> Nombre o dirección del servidor
+      port     -> Puerto de conexión
+      timeout  -> Segundos máximos para conectar con alguna dirección
+      resolver -> DNSCache a usar (None para la compartida)
+      delay    -> Segundos entre el inicio de intentos sucesivos
+
+    Retorna:
+      Socket conectado en modo bloqueante.
+
+    Lanza:
+      socket.timeout si ninguna dirección conecta a tiempo, o el OSError del último intento fallido.
+    """
+    resolver = resolver if resolver is not None else default_resolver
+    candidates = interleave_addresses(resolver.resolve(host, port))
+    deadline = time.monotonic() + timeout
+    selector = selectors.DefaultSelector()
+    pending = []
+    error = None
+    next_attempt = 0.0
+    try:
+        while candidates or pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+
+            # Se lanza el siguiente intento si no hay ninguno en curso o venció la espera
+            if candidates and (not pending or now >= next_attempt):
+                family, socktype, proto, _, sockaddr = candidates.pop(0)
+                try:
+                    sock = socket.socket(family, socktype, proto)
+                except OSError as e:
+                    error = e
+                    continue
+                sock.setblocking(False)
+                code = sock.connect_ex(sockaddr)
+                if code == 0:
+                    sock.setblocking(True)
+                    return sock
+                if code not in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                    sock.close()
+                    error = OSError(code, os.strerror(code))
+                    continue
+                selector.register(sock, selectors.EVENT_WRITE)
+                pending.append(sock)
+                next_attempt = now + delay
+                continue
+
+            wait = deadline - now
+            if candidates:
+                wait = min(wait, next_attempt - now)
+            for key, _ in selector.select(max(wait, 0)):
+                sock = key.fileobj
+                selector.unregister(sock)
+                pending.remove(sock)
+                code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if code == 0:
+                    sock.setblocking(True)
+                    return sock
+                sock.close()
+                error = OSError(code, os.strerror(code))
+                next_attempt = 0.0  # Un intento fallido adelanta el siguiente (sección 5)
+    finally:
+        # Se cierran los intentos que siguen en curso (el ganador ya no está en pending)
+        for sock in pending:
+            sock.close()
+        selector.close()
+
+    # Ninguna dirección conectó: la próxima vez se vuelve a resolver por si el registro cambió
+    resolver.invalidate(host)
+    if error is not None and not candidates and time.monotonic() < deadline:
+        raise error
+    raise socket.timeout(f"Connection to {host}:{port} timed out")
@@ -0,0 +1,228 @@
+from threading import Lock
+
+# Tamaño máximo de cada fragmento chunked: acota la memoria usada al enviar una respuesta en streaming
+STREAM_BUFFER_SIZE = 64 * 1024
+
+
+class PreEncodedResponse:
+    """
+    Respuesta constante serializada a bytes una sola vez al iniciar el servidor.
+    Se guardan las dos variantes del encabezado Connection, de modo que enviarla
+    se reduce a elegir una de ellas y hacer un único sendall.
+
+    Atributos:
+      status           -> Línea de estado (por ejemplo "HTTP/1.1 200 OK")
+      keep_alive_bytes -> Respuesta completa con "Connection: keep-alive"
+      close_bytes      -> Respuesta completa con "Connection: close"
+    """
+
+    __slots__ = ("status", "keep_alive_bytes", "close_bytes")
+
+    def __init__(self, status, headers=(), body=""):
+        self.status = status
+        body = body.encode()
+        # Mismo orden que add_connection_header: Connection justo después de la línea de estado
+        tail = "".join(f"{header}\r\n" for header in headers)
+        tail += f"Content-Length: {len(body)}\r\n\r\n"
+        self.keep_alive_bytes = f"{status}\r\nConnection: keep-alive\r\n{tail}".encode() + body
+        self.close_bytes = f"{status}\r\nConnection: close\r\n{tail}".encode() + body
+
+    def startswith(self, prefix):
+        # Permite revisar la línea de estado igual que en las respuestas en cadena
+        return self.status.startswith(prefix)
+
+    def encode(self, keep_alive):
+        """
+        Retorna los bytes de la respuesta con el encabezado Connection indicado.
+        """
+        return self.keep_alive_bytes if keep_alive else self.close_bytes
+
+
+class BytesResponse:
+    """
+    Respuesta dinámica cuyo cuerpo ya está en bytes (por ejemplo, un cuerpo comprimido).
+
+    Atributos:
+      head -> Línea de estado y encabezados terminados en una línea vacía
+      body -> Cuerpo de la respuesta en bytes
+    """
+
+    __slots__ = ("head", "body")
+
+    def __init__(self, head, body):
+        self.head = head
+        self.body = body
+
+    def startswith(self, prefix):
+        return self.head.startswith(prefix)
+
+
+class StreamResponse:
+    """
+    Respuesta cuyo cuerpo lo produce un iterador de fragmentos en bytes, de modo que
+    el primer byte sale antes de que el cuerpo completo exista en memoria.
+    En HTTP/1.1 se envía con Transfer-Encoding: chunked; para clientes HTTP/1.0 el
+    cuerpo se envía sin delimitar y la conexión se cierra al terminar.
+
+    Atributos:
+      status  -> Línea de estado (por ejemplo "HTTP/1.1 200 OK")
+      headers -> Lista de encabezados "Clave: valor" (sin Content-Length)
+      chunks  -> Iterable de fragmentos del cuerpo (bytes, bytearray o memoryview)
+      chunked -> Si es True se usa Transfer-Encoding: chunked
+    """
+
+    __slots__ = ("status", "headers", "chunks", "chunked")
+
+    def __init__(self, status, headers, chunks, chunked=True):
+        self.status = status
+        self.headers = headers
+        self.chunks = chunks
+        self.chunked = chunked
+
+    def startswith(self, prefix):
+        return self.status.startswith(prefix)
+
+    def head(self, keep_alive):
+        """
+        Retorna en bytes la línea de estado y los encabezados, incluido Connection.
+        """
+        headers = list(self.headers)
+        if self.chunked:
+            headers.append("Transfer-Encoding: chunked")
+        head = self.status + "\r\n" + "\r\n".join(headers) + "\r\n\r\n"
+        return add_connection_header(head, keep_alive).encode()
+
+    def body(self, buffer_size=STREAM_BUFFER_SIZE):
+        """
+        Generador de los bytes del cuerpo listos para escribir en el socket. Cada
+        fragmento se pide al iterador solo cuando el anterior ya fue entregado y los
+        fragmentos grandes se dividen, por lo que nunca se retienen más de
+        buffer_size bytes de cuerpo.
+
+        Lanza:
+          OSError si el iterador falla a mitad del envío: la conexión debe cerrarse
+          sin el fragmento final para que el cliente detecte la respuesta incompleta.
+        """
+        try:
+            for chunk in self.chunks:
+                chunk = memoryview(chunk).cast("B")
+                for start in range(0, len(chunk), buffer_size):
+                    piece = chunk[start:start + buffer_size]
+                    if self.chunked:
+                        yield b"%x\r\n%s\r\n" % (len(piece), piece)
+                    else:
+                        yield piece
+        except Exception as e:
+            raise OSError("Response stream failed") from e
+        if self.chunked:
+            yield b"0\r\n\r\n"
+
+
+def build_response_table():
+    """
+    Construye la tabla de respuestas constantes de process_request.
+    La clave es (método, ruta, resultado); "/" representa cualquier ruta no segura.
+    """
+    html = ["Content-Type: text/html"]
+    return {
+        ("GET", "/", "ok"): PreEncodedResponse("HTTP/1.1 200 OK", html, "<h1>Welcome</h1>"),
+        ("GET", "/secure", "ok"): PreEncodedResponse(
+            "HTTP/1.1 200 OK",
+            html,
+            "<h1>GET request successful! You accessed a protected resource.</h1>",
+        ),
+        ("POST", "/", "ok"): PreEncodedResponse(
+            "HTTP/1.1 200 OK", html, "<h1>POST request successful</h1>"
+        ),
+        ("HEAD", "/", "ok"): PreEncodedResponse("HTTP/1.1 200 OK"),
+        ("OPTIONS", "*", "ok"): PreEncodedResponse(
+            "HTTP/1.1 204 No Content",
+            ["Allow: GET, POST, HEAD, PUT, DELETE, OPTIONS, TRACE, CONNECT"],
+        ),
+        ("*", "/secure", "missing_token"): PreEncodedResponse(
+            "HTTP/1.1 401 Unauthorized", html, "<h1>Authorization header missing.</h1>"
+        ),
+        ("*", "/secure", "invalid_token"): PreEncodedResponse(
+            "HTTP/1.1 401 Unauthorized", html, "<h1>Invalid or missing authorization token.</h1>"
+        ),
+        ("*", "*", "internal_error"): PreEncodedResponse(
+            "HTTP/1.1 500 Internal Server Error",
+            ["Content-Type: text/plain"],
+            "Internal Server Error",
+        ),
+    }
+
+
+# Tabla de respuestas constantes, construida una vez al importar el módulo
+RESPONSE_TABLE = build_response_table()
+
+
+def build_error_table():
+    """
+    Construye las respuestas de error de los límites del servidor, indexadas por el
+    código de estado. Se envían siempre con "Connection: close".
+    """
+    html = ["Content-Type: text/html"]
+    return {
+        "408": PreEncodedResponse(
+            "HTTP/1.1 408 Request Timeout", html, "<h1>Request timeout</h1>"
+        ),
+        "413": PreEncodedResponse(
+            "HTTP/1.1 413 Content Too Large", html, "<h1>Request body too large</h1>"
+        ),
+        "431": PreEncodedResponse(
+            "HTTP/1.1 431 Request Header Fields Too Large",
+            html,
+            "<h1>Request headers too large</h1>",
+        ),
+    }
+
+
+# Respuestas de error pre-codificadas para tiempos de espera y límites de tamaño
+ERROR_TABLE = build_error_table()
+
+# Respuestas 405 ya serializadas por método. El cuerpo incluye el nombre del método,
+# por lo que se memorizan solo los métodos cortos y hasta un máximo de entradas.
+MAX_CACHED_METHODS = 64
+_method_not_allowed_cache = {}
+_method_not_allowed_lock = Lock()
+
+
+def method_not_allowed(method):
+    """
+    Retorna la respuesta 405 para el método indicado, reutilizando la ya serializada.
+    """
+    response = _method_not_allowed_cache.get(method)
+    if response is not None:
+        return response
+
+    response = PreEncodedResponse(
+        "HTTP/1.1 405 Method Not Allowed",
+        ["Content-Type: text/html"],
+        f"<h1>Method '{method}' not allowed.</h1>",
+    )
+    if len(method) <= 16:
+        with _method_not_allowed_lock:
+            if len(_method_not_allowed_cache) < MAX_CACHED_METHODS:
+                _method_not_allowed_cache[method] = response
+    return response
+
+
+def add_connection_header(response, keep_alive):
+    """
+    Agrega el encabezado Connection a la respuesta justo después de la línea de estado.
+    """
+    value = "keep-alive" if keep_alive else "close"
+    return response.replace("\r\n", f"\r\nConnection: {value}\r\n", 1)
+
+
+def encode_response(response, keep_alive):
+    """
+    Serializa una respuesta (cadena, PreEncodedResponse o BytesResponse) agregando el
+    encabezado Connection. Las StreamResponse se envían con head() y body().
+    """
+    if type(response) is PreEncodedResponse:
+        return response.encode(keep_alive)
+    if type(response) is BytesResponse:
+        return add_connection_header(response.head, keep_alive).encode() + response.body
+    return add_connection_header(response, keep_alive).encode()
@@ -1,34 +1,449 @@
 import socket
-from threading import Thread
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Thread
+from time import perf_counter
+
+import metrics
+from request_parser import (
+    DEFAULT_MAX_BODY_SIZE,
+    DEFAULT_MAX_HEADER_SIZE,
+    ParseError,
+    RequestParser,
+)
+from responses import (
+    ERROR_TABLE,
+    RESPONSE_TABLE,
+    BytesResponse,
+    PreEncodedResponse,
+    StreamResponse,
+    add_connection_header,
+    encode_response,
+    method_not_allowed,
+)
+from compression import (
+    DEFAULT_MIN_SIZE,
+    compress_stream_response,
+    compress_text_response,
+    negotiate_encoding,
+)
+from static_files import FileResponse, serve_file
 
 # Token de autorización requerido para acceder a recursos seguros
 AUTHORIZED_TOKEN = "12345"
 
-def handle_client(client_socket):
+# Tamaño por defecto de la cola de conexiones pendientes (antes fijo en 5)
+DEFAULT_BACKLOG = socket.SOMAXCONN
+
+# Cantidad máxima de bytes leídos de un socket en cada llamada a recv
+RECV_SIZE = 65536
+
+# Respuestas tras las cuales la conexión se cierra aunque el cliente pida keep-alive
+CLOSING_STATUS_LINES = ("HTTP/1.1 400", "HTTP/1.1 500")
+
+# Los ecos de TRACE y POST de al menos este tamaño se envían en streaming (chunked)
+STREAM_MIN_SIZE = 64 * 1024
+
+# Valores por defecto del modo con pool de hilos: hilos trabajadores y conexiones en espera
+DEFAULT_POOL_WORKERS = 32
+DEFAULT_POOL_QUEUE_SIZE = 256
+
+# Respuesta 503 pre-codificada que se envía cuando el pool está saturado
+_BUSY_BODY = b"<h1>Server busy, please retry later.</h1>"
+SERVICE_UNAVAILABLE_RESPONSE = (
+    b"HTTP/1.1 503 Service Unavailable\r\n"
+    b"Retry-After: 1\r\n"
+    b"Content-Type: text/html\r\n"
+    b"Content-Length: " + str(len(_BUSY_BODY)).encode() + b"\r\n"
+    b"Connection: close\r\n"
+    b"\r\n" + _BUSY_BODY
+)
+
+
+class PoolCounters:
+    """
+    Contadores del modo con pool de hilos. Todas las actualizaciones se realizan
+    bajo un mismo candado para que una lectura con snapshot() sea consistente.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.queued = 0  # Conexiones aceptadas esperando un hilo libre
+        self.active = 0  # Conexiones siendo atendidas en este momento
+        self.completed = 0  # Conexiones atendidas por completo
+        self.rejected = 0  # Conexiones rechazadas con 503 por saturación
+
+    def snapshot(self):
+        """
+        Retorna un diccionario con el valor actual de cada contador.
+        """
+        with self.lock:
+            return {
+                "queue_depth": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+# Contadores globales del servidor en modo pool
+pool_counters = PoolCounters()
+
+
+class ServerConfig:
+    """
+    Opciones de configuración compartidas por todos los motores del servidor.
+
+    Atributos:
+      keep_alive_timeout      -> Segundos que una conexión persistente puede estar inactiva
+      header_timeout          -> Segundos para recibir los encabezados de una solicitud desde
+                                 su primer byte (si se agota se responde 408)
+      body_timeout            -> Segundos para recibir el cuerpo tras los encabezados (408)
+      write_timeout           -> Segundos que el envío de una respuesta puede estar sin que el
+                                 cliente acepte datos (si se agotan se cierra la conexión)
+      max_header_size         -> Bytes máximos de la línea de solicitud y encabezados (431)
+      max_body_size           -> Bytes máximos del cuerpo de una solicitud (413)
+      max_keep_alive_requests -> Solicitudes máximas atendidas por una misma conexión
+      document_root           -> Directorio de archivos estáticos servidos con GET/HEAD
+                                 (None para responder solo con las rutas fijas)
+      compression             -> Si es True se negocia gzip/deflate/br con Accept-Encoding
+      compression_min_size    -> Tamaño mínimo del cuerpo para comprimirlo
+      metrics                 -> Si es True se registran métricas y se exponen en GET /metrics
+      access_log              -> access_log.AccessLog donde se registra cada solicitud (None
+                                 para no registrar accesos)
+    """
+
+    def __init__(
+        self,
+        keep_alive_timeout=5.0,
+        max_keep_alive_requests=100,
+        document_root=None,
+        compression=True,
+        compression_min_size=DEFAULT_MIN_SIZE,
+        metrics=True,
+        access_log=None,
+        header_timeout=10.0,
+        body_timeout=30.0,
+        write_timeout=30.0,
+        max_header_size=DEFAULT_MAX_HEADER_SIZE,
+        max_body_size=DEFAULT_MAX_BODY_SIZE,
+    ):
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_keep_alive_requests = max_keep_alive_requests
+        self.document_root = document_root
+        self.compression = compression
+        self.compression_min_size = compression_min_size
+        self.metrics = metrics
+        self.access_log = access_log
+        self.header_timeout = header_timeout
+        self.body_timeout = body_timeout
+        self.write_timeout = write_timeout
+        self.max_header_size = max_header_size
+        self.max_body_size = max_body_size
+
+    def new_parser(self):
+        """
+        Retorna un RequestParser con los límites de tamaño configurados.
+        """
+        return RequestParser(self.max_header_size, self.max_body_size)
+
+
+# Configuración utilizada cuando no se indica otra explícitamente
+DEFAULT_CONFIG = ServerConfig()
+
+
+def handle_client(client_socket, config=DEFAULT_CONFIG, address=None):
     """
     Función que maneja la comunicación con cada cliente conectado.
-    Procesa la solicitud HTTP y envía la respuesta correspondiente.
+    Recibe las solicitudes HTTP, las procesa y envía la respuesta correspondiente.
+    La conexión se mantiene abierta entre solicitudes (keep-alive de HTTP/1.1) hasta
+    que el cliente pida cerrarla, se agote el tiempo de inactividad o se alcance el
+    máximo de solicitudes por conexión. Las solicitudes encadenadas (pipelining) se
+    responden en el mismo orden en que llegaron. address es la dirección del cliente
+    que se anota en el registro de accesos.
+    Un cliente lento no retiene el hilo indefinidamente: los encabezados y el cuerpo
+    de cada solicitud tienen su propio plazo (408 si se agota) y el envío de la
+    respuesta se abandona si el cliente deja de aceptar datos.
     """
+    parser = config.new_parser()
+    served = 0
+    track = config.metrics
+    parse_seconds = 0.0  # Tiempo de análisis acumulado de la solicitud en curso
+    phase = None  # Fase de la solicitud parcial en curso: "header", "body" o None
+    deadline = 0.0  # Instante límite de la fase en curso
+    if track:
+        metrics.connection_opened()
     try:
-        # Se recibe la solicitud del cliente y se decodifica
-        request = client_socket.recv(4096).decode()
-        if not request.strip():  # Si la solicitud está vacía
-            response = "HTTP/1.1 400 Bad Request\r\n\r\n"
-            client_socket.sendall(response.encode())
-            client_socket.close()
-            return
-
-        # Se extraen el método HTTP y la URI de la primera línea de la solicitud
-        method, uri, _ = request.split("\r\n")[0].split(" ")
-        print(f"Request received: {method} {uri}")
-
-        # Se procesan los encabezados de la solicitud y se almacenan en un diccionario
-        headers = {}
-        for line in request.split("\r\n")[1:]:
-            if not line:  # Se detiene al llegar a una línea vacía (separador de encabezados y cuerpo)
+        while True:
+            started = perf_counter()
+            try:
+                request = parser.next_request()
+            except ParseError as e:
+                send_error(client_socket, parse_error_response(e), e.status[:3], config, address)
                 break
-            key, value = line.split(": ")
-            headers[key] = value
+            parse_seconds += perf_counter() - started
+
+            if request is None:
+                if not parser.has_pending_data():
+                    # Entre solicitudes se espera como máximo el tiempo de inactividad
+                    phase = None
+                    timeout = config.keep_alive_timeout
+                else:
+                    current = "body" if parser.waiting_for_body() else "header"
+                    if current != phase:
+                        phase = current
+                        limit = config.body_timeout if current == "body" else config.header_timeout
+                        deadline = time.monotonic() + limit
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        send_error(client_socket, ERROR_TABLE["408"], "408", config, address)
+                        break
+                client_socket.settimeout(timeout)
+
+                # Se reciben más datos del cliente hasta completar la siguiente solicitud
+                try:
+                    data = client_socket.recv(RECV_SIZE)
+                except socket.timeout:
+                    if phase is not None:
+                        send_error(client_socket, ERROR_TABLE["408"], "408", config, address)
+                    break  # Sin solicitud en curso la conexión inactiva se cierra sin responder
+                if not data:
+                    break  # El cliente cerró la conexión
+                if track:
+                    metrics.record_received(len(data))
+                parser.feed(data)
+                continue
+
+            phase = None
+            handle_started = perf_counter()
+            response = process_request(request, config)
+            served += 1
+            keep_alive = (
+                served < config.max_keep_alive_requests
+                and request.keep_alive
+                and not response.startswith(CLOSING_STATUS_LINES)
+                and not closes_after_body(response)
+            )
+
+            # Se envía la respuesta al cliente indicando si la conexión continúa abierta
+            client_socket.settimeout(config.write_timeout)
+            write_started = perf_counter()
+            sent = send_response(client_socket, response, keep_alive)
+            finish_request(
+                config,
+                address,
+                request,
+                response_status(response),
+                parse_seconds,
+                write_started - handle_started,
+                perf_counter() - write_started,
+                sent,
+            )
+            parse_seconds = 0.0
+            if not keep_alive:
+                break
+    except OSError:
+        pass  # Conexión reiniciada por el cliente o tiempo de espera agotado
+    finally:
+        client_socket.close()
+        if track:
+            metrics.connection_closed()
+
+
+def parse_error_response(error):
+    """
+    Construye la respuesta para una solicitud que no pudo analizarse. Los errores de
+    límites (413, 431) usan la respuesta pre-codificada de ERROR_TABLE.
+    """
+    response = ERROR_TABLE.get(error.status[:3])
+    if response is not None:
+        return response
+    body = f"<h1>{error}</h1>"
+    return (
+        f"HTTP/1.1 {error.status}\r\n"
+        "Content-Type: text/html\r\n"
+        f"Content-Length: {len(body.encode())}\r\n"
+        "\r\n" + body
+    )
+
+
+def send_error(client_socket, response, status, config=DEFAULT_CONFIG, address=None):
+    """
+    Envía una respuesta de error con "Connection: close" por un socket bloqueante y
+    la registra; el llamador cierra la conexión a continuación.
+
+    Parámetros:
+      response -> Respuesta de parse_error_response o de ERROR_TABLE
+      status   -> Código de estado de tres dígitos para métricas y registro de accesos
+    """
+    data = encode_response(response, False)
+    client_socket.settimeout(config.write_timeout)
+    client_socket.sendall(data)
+    finish_request(config, address, None, status, 0.0, 0.0, 0.0, len(data))
+
+
+def send_response(client_socket, response, keep_alive):
+    """
+    Envía una respuesta (cadena, PreEncodedResponse, BytesResponse, FileResponse o
+    StreamResponse) por un socket bloqueante.
+    Las respuestas constantes ya están serializadas y se envían con un único sendall.
+    El contenido de los archivos se envía con socket.sendfile (os.sendfile), sin
+    copiarlo a memoria de usuario. Las respuestas en streaming se escriben fragmento
+    a fragmento a medida que el iterador los produce.
+
+    Retorna:
+      Cantidad de bytes enviados.
+    """
+    if isinstance(response, FileResponse):
+        head = add_connection_header(response.head, keep_alive).encode()
+        client_socket.sendall(head)
+        if response.path is None:
+            return len(head)
+        with open(response.path, "rb") as file:
+            sent = client_socket.sendfile(file, response.offset, response.length)
+        if sent < response.length:
+            # El archivo se truncó mientras se enviaba: el cliente no puede delimitar el cuerpo
+            raise OSError("File truncated while being sent")
+        return len(head) + sent
+    if isinstance(response, StreamResponse):
+        head = response.head(keep_alive)
+        client_socket.sendall(head)
+        sent = len(head)
+        for piece in response.body():
+            client_socket.sendall(piece)
+            sent += len(piece)
+        return sent
+    data = encode_response(response, keep_alive)
+    client_socket.sendall(data)
+    return len(data)
+
+
+def finish_request(
+    config, address, request, status, parse_seconds, handle_seconds, write_seconds, sent
+):
+    """
+    Registra una solicitud ya respondida en las métricas y en el registro de accesos
+    (ambos sin bloquear). request es None si la solicitud no pudo analizarse.
+    """
+    if config.metrics:
+        if request is None:
+            method, route = "OTHER", "-"
+        else:
+            method, route = request.method, metrics.route_label(request.uri)
+        metrics.record_request(
+            method, route, status, parse_seconds, handle_seconds, write_seconds, sent
+        )
+    if config.access_log is not None:
+        duration = parse_seconds + handle_seconds + write_seconds
+        if request is None:
+            config.access_log.log(address, "-", "-", "-", status, sent, duration)
+        else:
+            headers = request.headers
+            config.access_log.log(
+                address,
+                request.method,
+                request.uri,
+                request.version,
+                status,
+                sent,
+                duration,
+                headers.get("Referer", "-"),
+                headers.get("User-Agent", "-"),
+            )
+
+
+def response_status(response):
+    """
+    Retorna el código de estado de tres dígitos de cualquier tipo de respuesta.
+    """
+    if isinstance(response, str):
+        return response[9:12]
+    if isinstance(response, (PreEncodedResponse, StreamResponse)):
+        return response.status[9:12]
+    return response.head[9:12]
+
+
+def metrics_response(config=DEFAULT_CONFIG):
+    """
+    Construye la respuesta de GET /metrics en el formato de texto de Prometheus,
+    incluidos los contadores del modo pool y del registro de accesos.
+    """
+    pool = pool_counters.snapshot()
+    pool_metrics = [
+        ("http_pool_queue_depth", "gauge", "Connections waiting for a pool worker."),
+        ("http_pool_active", "gauge", "Connections being served by pool workers."),
+        ("http_pool_rejected_total", "counter", "Connections rejected with 503."),
+    ]
+    values = (pool["queue_depth"], pool["active"], pool["rejected"])
+    extra = [(*metric, value) for metric, value in zip(pool_metrics, values)]
+    if config.access_log is not None:
+        extra.append(
+            (
+                "http_access_log_dropped_total",
+                "counter",
+                "Access log records dropped because the queue was full.",
+                config.access_log.dropped,
+            )
+        )
+    body = metrics.render(extra).encode()
+    head = (
+        "HTTP/1.1 200 OK\r\n"
+        f"Content-Type: {metrics.CONTENT_TYPE}\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    )
+    return BytesResponse(head, body)
+
+
+def closes_after_body(response):
+    """
+    Indica si el fin del cuerpo solo puede señalarse cerrando la conexión
+    (respuesta en streaming a un cliente HTTP/1.0, que no admite chunked).
+    """
+    return isinstance(response, StreamResponse) and not response.chunked
+
+
+def stream_response(request, status, headers, chunks, encoding=None):
+    """
+    Construye una StreamResponse para la solicitud: chunked si el cliente habla
+    HTTP/1.1 y comprimida sobre la marcha si se negoció una codificación.
+
+    Parámetros:
+      request  -> Solicitud a la que se responde
+      status   -> Línea de estado
+      headers  -> Lista de encabezados "Clave: valor" (sin Content-Length)
+      chunks   -> Iterable de fragmentos del cuerpo en bytes
+      encoding -> Codificación negociada con el cliente (None para no comprimir)
+    """
+    response = StreamResponse(status, headers, chunks, chunked=request.version == "HTTP/1.1")
+    if encoding:
+        response = compress_stream_response(response, encoding)
+    return response
+
+
+def process_request(request, config=DEFAULT_CONFIG):
+    """
+    Procesa una solicitud HTTP ya recibida y construye la respuesta correspondiente.
+    No realiza ninguna operación sobre sockets, por lo que puede ser utilizada
+    tanto por el servidor con hilos como por el servidor basado en un bucle de eventos.
+
+    Parámetros:
+      request -> Objeto Request producido por RequestParser
+      config  -> ServerConfig (se usa document_root para servir archivos estáticos)
+
+    Retorna:
+      La cadena completa de la respuesta HTTP, una PreEncodedResponse de RESPONSE_TABLE
+      para las respuestas constantes, una BytesResponse si el cuerpo va comprimido,
+      una FileResponse si se sirve un archivo, o una StreamResponse si el cuerpo es
+      grande y se envía por partes.
+    """
+    try:
+        # El método HTTP, la URI y los encabezados ya fueron extraídos por el analizador
+        method, uri, headers = request.method, request.uri, request.headers
+
+        # Codificación de contenido aceptada por el cliente (None si no se comprime)
+        encoding = None
+        if config.compression:
+            encoding = negotiate_encoding(headers.get("Accept-Encoding"))
 
         # Variables para construir la respuesta
         response_status = ""
@@ -37,57 +452,85 @@ def handle_client(client_socket):
 
         # Procesamiento de la solicitud según el método HTTP
         if method == "GET":
+            if uri == "/metrics" and config.metrics:
+                return metrics_response(config)
             # Si se accede a una ruta segura, se procesa la autorización
             if uri.startswith("/secure"):
-                authorized = authoritation_process(client_socket, method, uri, headers)
-                if not authorized:
-                    return  # Si falla la autorización, la respuesta ya fue enviada
+                unauthorized_response = authoritation_process(headers)
+                if unauthorized_response:
+                    return unauthorized_response  # Si falla la autorización, se retorna el 401
                 else:
-                    response_body = "<h1>GET request successful! You accessed a protected resource.</h1>"
+                    return RESPONSE_TABLE[("GET", "/secure", "ok")]
             else:
-                response_body = "<h1>Welcome</h1>"
+                # Si hay directorio raíz configurado y la URI es un archivo, se sirve desde disco
+                if config.document_root:
+                    file_response = serve_file(
+                        method,
+                        uri,
+                        headers,
+                        config.document_root,
+                        encoding,
+                        config.compression_min_size,
+                    )
+                    if file_response:
+                        return file_response
+                return RESPONSE_TABLE[("GET", "/", "ok")]
 
         elif method == "POST":
             # Para solicitudes POST en rutas seguras se verifica la autorización
             if uri.startswith("/secure"):
-                authorized = authoritation_process(client_socket, method, uri, headers)
-                if not authorized:
-                    return
+                unauthorized_response = authoritation_process(headers)
+                if unauthorized_response:
+                    return unauthorized_response
                 else:
                     try:
-                        # Validar la longitud del cuerpo de la solicitud
-                        content_length = int(headers.get("Content-Length", 0))
-                        body = request.split("\r\n\r\n")[1][:content_length]
+                        # El analizador ya leyó exactamente Content-Length bytes de cuerpo
+                        body = request.body.decode()
                         # Se verifica el tipo de contenido procesando JSON, XML o texto plano
                         content_type = headers.get("Content-Type", "text/plain")
                         if content_type == "application/json":
                             try:
                                 import json
                                 json.loads(body)  # Intentar parsear como JSON
-                                response_body = f"<h1>POST request successful! JSON body received: {body}.</h1>"
+                                prefix, suffix = "<h1>POST request successful! JSON body received: ", ".</h1>"
                             except json.JSONDecodeError:
                                 raise ValueError("Malformed JSON body")
                         elif content_type == "application/xml":
                             try:
                                 import xml.etree.ElementTree as ET
                                 ET.fromstring(body)  # Intentar parsear como XML
-                                response_body = f"<h1>POST request successful! XML body received: {body}.</h1>"
+                                prefix, suffix = "<h1>POST request successful! XML body received: ", ".</h1>"
                             except ET.ParseError:
                                 raise ValueError("Malformed XML body")
                         else:
                             # Manejo de cuerpos de texto o tipos desconocidos
-                            response_body = f"POST request successful! Plain text body received: {body}."
+                            prefix, suffix = "POST request successful! Plain text body received: ", "."
+
+                        # Los cuerpos grandes se devuelven en streaming sin copiarlos a una nueva cadena
+                        if len(request.body) >= STREAM_MIN_SIZE:
+                            return stream_response(
+                                request,
+                                "HTTP/1.1 200 OK",
+                                ["Content-Type: text/html"],
+                                (prefix.encode(), request.body, suffix.encode()),
+                                encoding,
+                            )
+                        response_body = prefix + body + suffix
                     except (IndexError, ValueError) as e:
                         response_status = "HTTP/1.1 400 Bad Request"
                         response_body = f"<h1>{str(e)}</h1>"
             else:
-                response_body = "<h1>POST request successful</h1>"
+                return RESPONSE_TABLE[("POST", "/", "ok")]
 
         elif method == "HEAD":
+            if config.document_root and not uri.startswith("/secure"):
+                file_response = serve_file(
+                    method, uri, headers, config.document_root, encoding, config.compression_min_size
+                )
+                if file_response:
+                    return file_response
             # Para HEAD se retorna solo encabezados sin cuerpo
-            response_headers = [
-                f"Content-Length: 0",
-            ]
+            return RESPONSE_TABLE[("HEAD", "/", "ok")]
         elif method == "PUT":
             # Ejemplo de respuesta para solicitud PUT (actualización de recurso)
             response_body = f"<h1>PUT request successful! Resource '{uri}' would be updated if this were implemented.</h1>"
@@ -96,17 +539,18 @@ def handle_client(client_socket):
             response_body = f"<h1>DELETE request successful! Resource '{uri}' would be deleted if this were implemented.</h1>"
         elif method == "OPTIONS":
             # Respuesta para OPTIONS con métodos permitidos y sin contenido
-            response_status = "HTTP/1.1 204 No Content"
-            response_headers = [
-                "Allow: GET, POST, HEAD, PUT, DELETE, OPTIONS, TRACE, CONNECT",
-                "Content-Length: 0",
-            ]
+            return RESPONSE_TABLE[("OPTIONS", "*", "ok")]
         elif method == "TRACE":
             # Para TRACE la respuesta es la misma solicitud recibida
-            response_body = request
+            if len(request.raw) >= STREAM_MIN_SIZE:
+                # El eco grande se envía por partes directamente desde los bytes recibidos
+                return stream_response(
+                    request, "HTTP/1.1 200 OK", ["Content-Type: message/http"], (request.raw,), encoding
+                )
+            response_body = request.text()
             response_headers = [
                 "Content-Type: message/http",
-                f"Content-Length: {len(response_body)}",
+                f"Content-Length: {len(response_body.encode())}",
             ]
         elif method == "CONNECT":
             # En CONNECT se establece un túnel hacia el recurso solicitado
@@ -114,8 +558,7 @@ def handle_client(client_socket):
             response_body = f"CONNECT method successful! Tunneling to {target} established."
         else:
             # Para métodos no permitidos se retorna error 405
-            response_status = "HTTP/1.1 405 Method Not Allowed"
-            response_body = f"<h1>Method '{method}' not allowed.</h1>"
+            return method_not_allowed(method)
 
         # Si no se ha definido explícitamente un estado, se asume 200 OK
         if not response_status:
@@ -124,8 +567,16 @@ def handle_client(client_socket):
         if not response_headers:
             response_headers = [
                 "Content-Type: text/html",
-                f"Content-Length: {len(response_body)}",
+                f"Content-Length: {len(response_body.encode())}",
             ]
+        # Si el cliente acepta compresión y el cuerpo es grande, se envía comprimido
+        if encoding:
+            compressed = compress_text_response(
+                response_status, response_headers, response_body, encoding, config.compression_min_size
+            )
+            if compressed:
+                return compressed
+
         # Se construye la respuesta concatenando el estado, encabezados y cuerpo
         response = (
             response_status
@@ -137,53 +588,319 @@ def handle_client(client_socket):
 
     except Exception as e:
         # En caso de error se envía una respuesta genérica de error interno del servidor
-        response = "HTTP/1.1 500 Internal Server Error\r\nContent-Type: text/plain\r\n\r\nInternal Server Error"
+        response = RESPONSE_TABLE[("*", "*", "internal_error")]
 
-    # Se envía la respuesta al cliente y se cierra la conexión
-    client_socket.sendall(response.encode())
-    client_socket.close()
+    return response
 
-def authoritation_process(client_socket, method, uri, headers):
+def authoritation_process(headers):
     """
     Función para gestionar la autorización en solicitudes a recursos seguros.
     Se verifica la presencia y validez del encabezado Authorization.
+
+    Retorna:
+      None si la solicitud está autorizada, o la respuesta 401 pre-codificada en caso contrario.
     """
     if "Authorization" in headers:
         # Se extrae y limpia el token de autenticación
         auth_token = headers["Authorization"].replace("Bearer ", "").strip()
         if auth_token != AUTHORIZED_TOKEN:
-            # Token inválido: se envía respuesta 401 Unauthorized
-            response = "HTTP/1.1 401 Unauthorized\r\nContent-Type: text/html\r\n\r\n<h1>Invalid or missing authorization token.</h1>"
-            client_socket.sendall(response.encode())
-            client_socket.close()
-            return False
+            # Token inválido: se retorna la respuesta 401 Unauthorized
+            return RESPONSE_TABLE[("*", "/secure", "invalid_token")]
         else:
-            return True
+            return None
     else:
         # Si falta el encabezado de autorización, se retorna 401 Unauthorized
-        response = "HTTP/1.1 401 Unauthorized\r\nContent-Type: text/html\r\n\r\n<h1>Authorization header missing.</h1>"
-        client_socket.sendall(response.encode())
-        client_socket.close()
-        return False
+        return RESPONSE_TABLE[("*", "/secure", "missing_token")]
 
 
-def run_server(host="localhost", port=8080):
+def run_server(
+    host="localhost",
+    port=8080,
+    backlog=DEFAULT_BACKLOG,
+    workers=None,
+    queue_size=DEFAULT_POOL_QUEUE_SIZE,
+    reuse_port=False,
+    config=DEFAULT_CONFIG,
+):
     """
     Función principal para iniciar el servidor HTTP.
     Crea el socket, lo enlaza a la dirección y puerto indicados y escucha conexiones entrantes.
-    Cada conexión es manejada en un hilo separado.
+    Si no se indica workers, cada conexión es manejada en un hilo separado; en caso
+    contrario las conexiones se atienden con un pool fijo de hilos (ver run_pool_server).
+
+    Parámetros:
+      host       -> Dirección en la que escucha el servidor
+      port       -> Puerto en el que escucha el servidor
+      backlog    -> Tamaño de la cola de conexiones pendientes del socket
+      workers    -> Cantidad de hilos del pool (None para un hilo por conexión)
+      queue_size -> Conexiones que pueden esperar un hilo libre en modo pool
+      reuse_port -> Si es True se habilita SO_REUSEPORT (ver multiprocess_server)
+      config     -> ServerConfig con las opciones de keep-alive
     """
-    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    server.bind((host, port))
-    server.listen(5)
+    if workers:
+        run_pool_server(
+            host, port, backlog, workers, queue_size, reuse_port=reuse_port, config=config
+        )
+        return
+
+    server = create_server_socket(host, port, backlog, reuse_port)
     print(f"Servidor escuchando en {host}:{port}")
 
-    while True:
-        client_socket, client_address = server.accept()
-        print(f"Conexión entrante de {client_address}")
-        # Se inicia un nuevo hilo para atender la conexión del cliente
-        Thread(target=handle_client, args=(client_socket,)).start()
+    try:
+        while True:
+            client_socket, client_address = server.accept()
+            # Se inicia un nuevo hilo para atender la conexión del cliente
+            Thread(target=handle_client, args=(client_socket, config, client_address)).start()
+    finally:
+        # Se deja de aceptar conexiones; los hilos en curso terminan antes de salir el proceso
+        server.close()
+
+
+def run_pool_server(
+    host="localhost",
+    port=8080,
+    backlog=DEFAULT_BACKLOG,
+    workers=DEFAULT_POOL_WORKERS,
+    queue_size=DEFAULT_POOL_QUEUE_SIZE,
+    counters=pool_counters,
+    reuse_port=False,
+    config=DEFAULT_CONFIG,
+):
+    """
+    Inicia el servidor HTTP atendiendo las conexiones con un pool fijo de hilos.
+    Las conexiones aceptadas esperan en una cola acotada; cuando la cola está llena
+    se responde de inmediato con un 503 pre-codificado en lugar de crear más hilos.
+
+    Parámetros:
+      host       -> Dirección en la que escucha el servidor
+      port       -> Puerto en el que escucha el servidor
+      backlog    -> Tamaño de la cola de conexiones pendientes del socket
+      workers    -> Cantidad fija de hilos trabajadores
+      queue_size -> Conexiones que pueden esperar un hilo libre antes de rechazar
+      counters   -> Objeto PoolCounters donde se registran profundidad de cola y rechazos
+      reuse_port -> Si es True se habilita SO_REUSEPORT (ver multiprocess_server)
+      config     -> ServerConfig con las opciones de keep-alive
+    """
+    server = create_server_socket(host, port, backlog, reuse_port)
+    print(f"Servidor (pool de {workers} hilos) escuchando en {host}:{port}")
+
+    capacity = workers + queue_size
+    # Al salir del bloque with se esperan las conexiones ya admitidas (drenado)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http-worker") as executor, server:
+        while True:
+            client_socket, client_address = server.accept()
+
+            # Control de admisión: se rechaza si ya no hay hilo libre ni lugar en la cola
+            with counters.lock:
+                admitted = counters.queued + counters.active < capacity
+                if admitted:
+                    counters.queued += 1
+                else:
+                    counters.rejected += 1
+
+            if admitted:
+                executor.submit(
+                    pooled_handle_client, client_socket, counters, config, client_address
+                )
+            else:
+                reject_client(client_socket)
+
+
+def pooled_handle_client(client_socket, counters, config=DEFAULT_CONFIG, address=None):
+    """
+    Envoltura de handle_client para el modo pool que mantiene actualizados los contadores.
+    """
+    with counters.lock:
+        counters.queued -= 1
+        counters.active += 1
+    try:
+        handle_client(client_socket, config, address)
+    finally:
+        with counters.lock:
+            counters.active -= 1
+            counters.completed += 1
+
+
+def reject_client(client_socket):
+    """
+    Responde con 503 Service Unavailable y cierra la conexión sin bloquear el hilo que acepta.
+    """
+    try:
+        client_socket.setblocking(False)
+        client_socket.send(SERVICE_UNAVAILABLE_RESPONSE)
+    except OSError:
+        pass
+    client_socket.close()
+
+
+def create_server_socket(host, port, backlog=DEFAULT_BACKLOG, reuse_port=False):
+    """
+    Crea el socket de escucha del servidor.
+
+    Parámetros:
+      host       -> Dirección en la que escucha el servidor
+      port       -> Puerto en el que escucha el servidor
+      backlog    -> Tamaño de la cola de conexiones pendientes del socket
+      reuse_port -> Si es True varios procesos pueden enlazar el mismo puerto y el
+                    kernel reparte entre ellos las conexiones entrantes
+
+    Retorna:
+      Socket enlazado y escuchando conexiones.
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    # Se permite reutilizar el puerto inmediatamente tras reiniciar el servidor
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    server.bind((host, port))
+    server.listen(backlog)
+    return server
 
 
 if __name__ == "__main__":
-    run_server()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="HTTP server")
+    parser.add_argument("--host", default="localhost", help="Address to bind, e.g., localhost")
+    parser.add_argument("-p", "--port", type=int, default=8080, help="Port to bind, e.g., 8080")
+    parser.add_argument(
+        "--mode",
+        choices=["threaded", "pool", "eventloop"],
+        default="threaded",
+        help="Server engine: one thread per connection, a fixed thread pool or a single selectors event loop",
+    )
+    parser.add_argument(
+        "--backlog", type=int, default=DEFAULT_BACKLOG, help="Listen backlog for pending connections"
+    )
+    parser.add_argument(
+        "--pool-workers", type=int, default=DEFAULT_POOL_WORKERS, help="Worker threads in pool mode"
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_POOL_QUEUE_SIZE,
+        help="Connections allowed to wait for a worker before answering 503",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of server processes sharing the port with SO_REUSEPORT",
+    )
+    parser.add_argument(
+        "--keep-alive-timeout",
+        type=float,
+        default=DEFAULT_CONFIG.keep_alive_timeout,
+        help="Seconds an idle persistent connection is kept open",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=DEFAULT_CONFIG.max_keep_alive_requests,
+        help="Maximum requests served on a single connection",
+    )
+    parser.add_argument(
+        "--document-root", default=None, help="Directory of static files served by GET/HEAD"
+    )
+    parser.add_argument(
+        "--no-compression",
+        action="store_true",
+        help="Disable gzip/deflate/br negotiation with Accept-Encoding",
+    )
+    parser.add_argument(
+        "--no-metrics", action="store_true", help="Disable request metrics and GET /metrics"
+    )
+    parser.add_argument(
+        "--access-log", metavar="PATH", help='Write an access log to PATH ("-" for stdout)'
+    )
+    parser.add_argument(
+        "--access-log-format",
+        choices=["common", "combined", "json"],
+        default="combined",
+        help="Access log line format",
+    )
+    parser.add_argument(
+        "--access-log-max-bytes",
+        type=int,
+        default=0,
+        help="Rotate the access log when it reaches this size (0 to never rotate)",
+    )
+    parser.add_argument(
+        "--access-log-backups", type=int, default=5, help="Rotated access log files to keep"
+    )
+    parser.add_argument(
+        "--header-timeout",
+        type=float,
+        default=DEFAULT_CONFIG.header_timeout,
+        help="Seconds to receive a request's headers before answering 408",
+    )
+    parser.add_argument(
+        "--body-timeout",
+        type=float,
+        default=DEFAULT_CONFIG.body_timeout,
+        help="Seconds to receive a request body after its headers before answering 408",
+    )
+    parser.add_argument(
+        "--write-timeout",
+        type=float,
+        default=DEFAULT_CONFIG.write_timeout,
+        help="Seconds a response write may stall before the connection is dropped",
+    )
+    parser.add_argument(
+        "--max-header-size",
+        type=int,
+        default=DEFAULT_CONFIG.max_header_size,
+        help="Maximum bytes of request line plus headers (431 beyond it)",
+    )
+    parser.add_argument(
+        "--max-body-size",
+        type=int,
+        default=DEFAULT_CONFIG.max_body_size,
+        help="Maximum request body bytes (413 beyond it)",
+    )
+    args = parser.parse_args()
+    access_log = None
+    if args.access_log:
+        from access_log import AccessLog
+
+        access_log = AccessLog(
+            args.access_log,
+            args.access_log_format,
+            max_bytes=args.access_log_max_bytes,
+            backups=args.access_log_backups,
+        )
+    config = ServerConfig(
+        args.keep_alive_timeout,
+        args.max_requests,
+        args.document_root,
+        compression=not args.no_compression,
+        metrics=not args.no_metrics,
+        access_log=access_log,
+        header_timeout=args.header_timeout,
+        body_timeout=args.body_timeout,
+        write_timeout=args.write_timeout,
+        max_header_size=args.max_header_size,
+        max_body_size=args.max_body_size,
+    )
+
+    if args.workers > 1:
+        from multiprocess_server import run_multiprocess_server
+
+        engine_options = {}
+        if args.mode == "pool":
+            engine_options = {"workers": args.pool_workers, "queue_size": args.queue_size}
+        run_multiprocess_server(
+            args.host, args.port, args.backlog, args.workers, args.mode, engine_options, config
+        )
+    elif args.mode == "eventloop":
+        # Se importa aquí para evitar una importación circular (event_loop usa process_request)
+        from event_loop import run_event_loop_server
+
+        run_event_loop_server(args.host, args.port, args.backlog, config=config)
+    elif args.mode == "pool":
+        run_pool_server(
+            args.host, args.port, args.backlog, args.pool_workers, args.queue_size, config=config
+        )
+    else:
+        run_server(args.host, args.port, args.backlog, config=config)
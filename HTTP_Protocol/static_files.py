@@ -0,0 +1,327 @@
+import mimetypes
+import os
+import stat
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from threading import Lock
+from urllib.parse import unquote
+
+from compression import (
+    DEFAULT_MIN_SIZE,
+    DISK_CACHE_BYTES,
+    file_variant,
+    is_compressible,
+    variant_etag,
+)
+from responses import BytesResponse
+
+# Segundos durante los que se confía en los metadatos cacheados sin volver a hacer stat
+METADATA_TTL = 1.0
+
+# Cantidad máxima de archivos cuyos metadatos se mantienen en caché
+METADATA_CACHE_SIZE = 4096
+
+# Archivo que se sirve cuando la URI corresponde a un directorio
+INDEX_FILE = "index.html"
+
+
+class FileMetadata:
+    """
+    Metadatos de un archivo servido: se calculan una vez y se reutilizan mientras
+    el archivo no cambie (mismo mtime y tamaño).
+    """
+
+    __slots__ = ("path", "size", "mtime_ns", "etag", "last_modified", "content_type", "checked_at")
+
+    def __init__(self, path, stat_result):
+        self.path = path
+        self.size = stat_result.st_size
+        self.mtime_ns = stat_result.st_mtime_ns
+        # ETag fuerte derivado de la fecha de modificación y el tamaño (no requiere leer el archivo)
+        self.etag = f'"{self.mtime_ns:x}-{self.size:x}"'
+        self.last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+        self.content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.checked_at = time.monotonic()
+
+
+class FileResponse:
+    """
+    Respuesta cuyo cuerpo es un fragmento de un archivo en disco. Los motores del
+    servidor envían head como bytes y luego el fragmento con os.sendfile, sin
+    copiar el contenido del archivo a memoria de usuario.
+
+    Atributos:
+      head   -> Línea de estado y encabezados terminados en una línea vacía
+      path   -> Ruta del archivo (None si la respuesta no lleva cuerpo)
+      offset -> Primer byte del archivo a enviar
+      length -> Cantidad de bytes a enviar
+    """
+
+    __slots__ = ("head", "path", "offset", "length")
+
+    def __init__(self, head, path=None, offset=0, length=0):
+        self.head = head
+        self.path = path
+        self.offset = offset
+        self.length = length
+
+    def startswith(self, prefix):
+        # Permite tratar la respuesta como las respuestas en cadena al revisar la línea de estado
+        return self.head.startswith(prefix)
+
+
+# Caché de metadatos compartida por todos los hilos: ruta -> FileMetadata
+_metadata_cache = OrderedDict()
+_metadata_lock = Lock()
+
+# Caché de rutas resueltas, protegida por el mismo candado: (raíz, URI) -> (ruta, instante)
+_path_cache = OrderedDict()
+
+
+def get_metadata(path):
+    """
+    Obtiene los metadatos de un archivo usando la caché. Dentro de METADATA_TTL se
+    confía en la entrada cacheada; pasado ese tiempo se hace stat y solo se
+    recalculan los metadatos si el archivo cambió.
+
+    Retorna:
+      FileMetadata, o None si la ruta no existe o no es un archivo regular.
+    """
+    now = time.monotonic()
+    with _metadata_lock:
+        cached = _metadata_cache.get(path)
+        if cached is not None and now - cached.checked_at < METADATA_TTL:
+            _metadata_cache.move_to_end(path)
+            return cached
+
+    try:
+        stat_result = os.stat(path)
+    except (OSError, ValueError):
+        stat_result = None
+
+    with _metadata_lock:
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            _metadata_cache.pop(path, None)
+            return None
+
+        if (
+            cached is not None
+            and cached.mtime_ns == stat_result.st_mtime_ns
+            and cached.size == stat_result.st_size
+        ):
+            cached.checked_at = now  # Archivo sin cambios: solo se renueva la validación
+            metadata = cached
+        else:
+            metadata = FileMetadata(path, stat_result)
+
+        _metadata_cache[path] = metadata
+        _metadata_cache.move_to_end(path)
+        if len(_metadata_cache) > METADATA_CACHE_SIZE:
+            _metadata_cache.popitem(last=False)
+        return metadata
+
+
+def resolve_path(document_root, uri):
+    """
+    Traduce la URI a una ruta dentro del directorio raíz de documentos. El resultado
+    se cachea por URI durante METADATA_TTL, igual que los metadatos, para no repetir
+    realpath e isdir en cada solicitud.
+
+    Retorna:
+      La ruta absoluta del archivo, o None si la URI intenta salir del directorio raíz
+      o contiene un byte nulo (%00), que ninguna ruta del sistema de archivos admite.
+    """
+    key = (document_root, uri.split("?", 1)[0].split("#", 1)[0])
+    now = time.monotonic()
+    with _metadata_lock:
+        cached = _path_cache.get(key)
+        if cached is not None and now - cached[1] < METADATA_TTL:
+            _path_cache.move_to_end(key)
+            return cached[0]
+
+    full_path = _resolve_path(document_root, key[1])
+
+    with _metadata_lock:
+        _path_cache[key] = (full_path, now)
+        _path_cache.move_to_end(key)
+        if len(_path_cache) > METADATA_CACHE_SIZE:
+            _path_cache.popitem(last=False)
+    return full_path
+
+
+def _resolve_path(document_root, uri_path):
+    """
+    Resuelve la ruta de uri_path (sin consulta ni fragmento) sin usar la caché.
+    """
+    path = unquote(uri_path)
+    if "\x00" in path:
+        return None
+    root = os.path.realpath(document_root)
+    full_path = os.path.realpath(os.path.join(root, path.lstrip("/")))
+    if os.path.commonpath([root, full_path]) != root:
+        return None
+    if os.path.isdir(full_path):
+        full_path = os.path.join(full_path, INDEX_FILE)
+    return full_path
+
+
+def serve_file(method, uri, headers, document_root, encoding=None, min_size=DEFAULT_MIN_SIZE):
+    """
+    Construye la respuesta para un GET o HEAD sobre un archivo del directorio raíz.
+    Soporta solicitudes condicionales (If-None-Match / If-Modified-Since -> 304),
+    rangos de bytes (Range -> 206 Partial Content / 416) y compresión de los tipos
+    de texto con la variante comprimida cacheada por ETag.
+
+    Parámetros:
+      method        -> "GET" o "HEAD"
+      uri           -> URI solicitada
+      headers       -> Diccionario de encabezados de la solicitud
+      document_root -> Directorio desde el que se sirven los archivos
+      encoding      -> Codificación negociada con el cliente (None para no comprimir)
+      min_size      -> Tamaño mínimo del archivo para comprimirlo
+
+    Retorna:
+      FileResponse o BytesResponse, o None si la URI no corresponde a un archivo existente.
+    """
+    path = resolve_path(document_root, uri)
+    metadata = get_metadata(path) if path else None
+    if metadata is None:
+        return None
+
+    validators = [
+        f"ETag: {metadata.etag}",
+        f"Last-Modified: {metadata.last_modified}",
+    ]
+
+    if not_modified(metadata, headers):
+        return FileResponse("HTTP/1.1 304 Not Modified\r\n" + "\r\n".join(validators) + "\r\n\r\n")
+
+    compressible = (
+        encoding is not None
+        and is_compressible(metadata.content_type)
+        and min_size <= metadata.size <= DISK_CACHE_BYTES
+    )
+    byte_range = requested_range(metadata, headers)
+    if compressible and byte_range is None:
+        return serve_compressed(method, metadata, encoding)
+
+    status = "HTTP/1.1 200 OK"
+    offset, length = 0, metadata.size
+    response_headers = [
+        f"Content-Type: {metadata.content_type}",
+        "Accept-Ranges: bytes",
+    ] + validators
+    if compressible:
+        response_headers.append("Vary: Accept-Encoding")
+
+    if byte_range == "unsatisfiable":
+        return FileResponse(
+            "HTTP/1.1 416 Range Not Satisfiable\r\n"
+            f"Content-Range: bytes */{metadata.size}\r\n"
+            "Content-Length: 0\r\n\r\n"
+        )
+    if byte_range is not None:
+        offset, last = byte_range
+        length = last - offset + 1
+        status = "HTTP/1.1 206 Partial Content"
+        response_headers.append(f"Content-Range: bytes {offset}-{last}/{metadata.size}")
+
+    response_headers.append(f"Content-Length: {length}")
+    head = status + "\r\n" + "\r\n".join(response_headers) + "\r\n\r\n"
+
+    if method == "HEAD" or length == 0:
+        return FileResponse(head)
+    return FileResponse(head, metadata.path, offset, length)
+
+
+def serve_compressed(method, metadata, encoding):
+    """
+    Responde con la variante comprimida del archivo: desde memoria si es pequeña
+    o con sendfile desde el archivo temporal si es grande.
+    """
+    variant = file_variant(metadata.path, metadata.etag, metadata.size, encoding)
+    head = (
+        "HTTP/1.1 200 OK\r\n"
+        f"Content-Type: {metadata.content_type}\r\n"
+        f"Content-Encoding: {encoding}\r\n"
+        "Vary: Accept-Encoding\r\n"
+        f"ETag: {variant_etag(metadata.etag, encoding)}\r\n"
+        f"Last-Modified: {metadata.last_modified}\r\n"
+        f"Content-Length: {variant.size}\r\n\r\n"
+    )
+    if method == "HEAD":
+        return FileResponse(head)
+    if variant.data is not None:
+        return BytesResponse(head, variant.data)
+    return FileResponse(head, variant.path, 0, variant.size)
+
+
+def not_modified(metadata, headers):
+    """
+    Evalúa If-None-Match y, si no está presente, If-Modified-Since.
+    """
+    if_none_match = headers.get("If-None-Match")
+    if if_none_match is not None:
+        # La comparación débil ignora el prefijo W/ (RFC 7232, sección 3.2); también se
+        # aceptan los ETag de las variantes comprimidas ("<etag>-gzip", etc.)
+        prefix = metadata.etag[:-1]
+        for tag in if_none_match.split(","):
+            tag = tag.strip().removeprefix("W/")
+            if tag == "*" or tag == metadata.etag or tag.startswith(prefix + "-"):
+                return True
+        return False
+
+    if_modified_since = headers.get("If-Modified-Since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return metadata.mtime_ns // 1_000_000_000 <= since
+
+    return False
+
+
+def requested_range(metadata, headers):
+    """
+    Interpreta el encabezado Range (un único rango de bytes).
+
+    Retorna:
+      (primer_byte, último_byte), None si se debe enviar el archivo completo,
+      o "unsatisfiable" si el rango no puede satisfacerse.
+    """
+    range_header = headers.get("Range")
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+
+    # Con If-Range el rango solo se aplica si el recurso no cambió
+    if_range = headers.get("If-Range")
+    if if_range is not None and if_range not in (metadata.etag, metadata.last_modified):
+        return None
+
+    spec = range_header[len("bytes="):].strip()
+    if "," in spec:
+        return None  # Varios rangos: se envía el archivo completo (permitido por la RFC)
+
+    start, separator, end = spec.partition("-")
+    if not separator:
+        return None
+    try:
+        if start:
+            first = int(start)
+            last = int(end) if end else metadata.size - 1
+        else:
+            suffix = int(end)  # bytes=-N: los últimos N bytes
+            if suffix == 0:
+                return "unsatisfiable"
+            first = max(0, metadata.size - suffix)
+            last = metadata.size - 1
+    except ValueError:
+        return None
+
+    if first >= metadata.size:
+        return "unsatisfiable"
+    if first > last:
+        return None  # Rango sintácticamente inválido: se ignora
+    return first, min(last, metadata.size - 1)
@@ -0,0 +1,123 @@
+import ssl
+from threading import Lock
+
+# Protocolos anunciados por ALPN por defecto: el cliente solo habla HTTP/1.1
+DEFAULT_ALPN = ("http/1.1",)
+
+# Cantidad máxima de sesiones TLS guardadas para reanudar (una por contexto, host y puerto)
+TLS_SESSION_CACHE_SIZE = 1024
+
+# Contextos ya construidos por configuración: (verify, cafile, alpn) -> SSLContext
+_contexts = {}
+_contexts_lock = Lock()
+
+
+def client_context(verify=True, cafile=None, alpn=DEFAULT_ALPN):
+    """
+    Retorna el SSLContext de cliente para la configuración indicada, construyéndolo
+    solo la primera vez: crear un contexto carga los certificados de confianza del
+    disco, lo que es más costoso que la propia solicitud en conexiones cortas.
+
+    Parámetros:
+      verify -> Si es False no se verifican el certificado ni el nombre del servidor
+      cafile -> Archivo PEM con certificados de confianza (None para los del sistema)
+      alpn   -> Protocolos a anunciar por ALPN (vacío para no usar ALPN)
+
+    Retorna:
+      SSLContext compartido; no debe modificarse después de obtenerlo.
+    """
+    key = (verify, cafile, tuple(alpn or ()))
+    context = _contexts.get(key)
+    if context is not None:
+        return context
+
+    context = ssl.create_default_context(cafile=cafile)
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if alpn:
+        context.set_alpn_protocols(list(alpn))
+    with _contexts_lock:
+        # Si otro hilo lo construyó al mismo tiempo se usa el suyo
+        return _contexts.setdefault(key, context)
+
+
+class TLSSessionCache:
+    """
+    Sesiones TLS por contexto y (host, puerto), para que una conexión nueva al mismo
+    servidor reanude la sesión anterior en lugar de hacer un handshake completo.
+    Cada sesión se guarda junto al contexto que la creó, ya que solo puede
+    reanudarse con ese mismo contexto.
+
+    Atributos:
+      max_entries -> Cantidad máxima de sesiones guardadas
+      resumed     -> Conexiones que reanudaron una sesión
+      full        -> Conexiones que hicieron un handshake completo
+    """
+
+    def __init__(self, max_entries=TLS_SESSION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.resumed = 0
+        self.full = 0
+        self._sessions = {}  # (id del contexto, host, puerto) -> (SSLContext, SSLSession)
+        self._lock = Lock()
+
+    def get(self, context, host, port):
+        """
+        Retorna la sesión guardada para el destino si pertenece a context, o None.
+        """
+        entry = self._sessions.get((id(context), host, port))
+        if entry is not None and entry[0] is context:
+            return entry[1]
+        return None
+
+    def store(self, host, port, sock):
+        """
+        Guarda la sesión actual de un socket TLS. En TLS 1.3 el ticket llega después
+        del handshake, por lo que conviene llamarla también al terminar de usar la conexión.
+        """
+        session = sock.session
+        if session is None:
+            return
+        key = (id(sock.context), host, port)
+        with self._lock:
+            self._sessions.pop(key, None)
+            if len(self._sessions) >= self.max_entries:
+                self._sessions.pop(next(iter(self._sessions)))
+            self._sessions[key] = (sock.context, session)
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+
+# Sesiones compartidas por todas las conexiones del cliente
+default_sessions = TLSSessionCache()
+
+
+def wrap_client(sock, host, port, context=None, sessions=None):
+    """
+    Establece TLS sobre un socket ya conectado, reanudando la sesión anterior con el
+    mismo destino si existe.
+
+    Parámetros:
+      sock     -> Socket TCP conectado
+      host     -> Nombre del servidor (para SNI y la verificación del certificado)
+      port     -> Puerto del servidor
+      context  -> SSLContext a usar (None para client_context())
+      sessions -> TLSSessionCache a usar (None para la compartida)
+
+    Retorna:
+      SSLSocket con el handshake completado.
+    """
+    context = context if context is not None else client_context()
+    sessions = sessions if sessions is not None else default_sessions
+    tls_sock = context.wrap_socket(
+        sock, server_hostname=host, session=sessions.get(context, host, port)
+    )
+    if tls_sock.session_reused:
+        sessions.resumed += 1
+    else:
+        sessions.full += 1
+    sessions.store(host, port, tls_sock)
+    return tls_sock
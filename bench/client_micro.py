@@ -0,0 +1,229 @@
+"""
+Microbenchmarks del análisis y la construcción de mensajes en client.py (parse_url,
+build_request_bytes, parse_response_head y ResponseReader) con entradas realistas:
+muchas URLs de un mismo host, solicitudes con muchos encabezados y respuestas con
+cuerpos grandes.
+
+Cada caso se compara con la implementación original (copiada abajo como legacy_*):
+primero se verifica que ambas den resultados idénticos y luego se mide con timeit.
+Solo los casos de GATED_CASES, cuya mejora es amplia y estable entre ejecuciones,
+hacen fallar el benchmark (código 1) si no superan --min-speedup. El resto solo se
+reporta: build_request difiere de la versión original en el orden del ruido y
+parse_response_head hace más trabajo que ella (determina la delimitación del cuerpo
+y normaliza los campos), por lo que no son comparables con un umbral fijo.
+
+Uso:
+  python bench/client_micro.py [--repeat 5] [--min-speedup 1.5]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+
+# Directorio con los módulos del protocolo HTTP
+HTTP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "HTTP_Protocol")
+sys.path.insert(0, HTTP_DIR)
+
+import client  # noqa: E402
+
+# Casos que deben superar --min-speedup (los demás solo se reportan)
+GATED_CASES = ("parse_url", "read_response")
+
+# Mejora mínima por defecto de los casos de GATED_CASES: deja margen sobre el ruido
+DEFAULT_MIN_SPEEDUP = 1.5
+
+
+class ReplaySocket:
+    """
+    Socket simulado que entrega una respuesta ya grabada en bloques de chunk_size
+    bytes, de modo que se mide solo el trabajo del cliente y no el de la red.
+    """
+
+    def __init__(self, data, chunk_size=64 * 1024):
+        self.data = memoryview(data)
+        self.chunk_size = chunk_size
+        self.position = 0
+
+    def recv(self, size):
+        size = min(size, self.chunk_size)
+        data = bytes(self.data[self.position:self.position + size])
+        self.position += len(data)
+        return data
+
+    def recv_into(self, buffer, size=0):
+        size = min(size or len(buffer), len(buffer), self.chunk_size)
+        received = len(self.data[self.position:self.position + size])
+        buffer[:received] = self.data[self.position:self.position + received]
+        self.position += received
+        return received
+
+
+def legacy_parse_url(url):
+    port = 80
+    is_secure = False
+    if url.startswith("http://"):
+        url = url[7:]
+    elif url.startswith("https://"):
+        url = url[8:]
+        port = 443
+        is_secure = True
+    match = re.match(r"([^:/?#]+)(?::(\d+))?(.*)", url)
+    if match:
+        host = match.group(1)
+        if match.group(2):
+            port = int(match.group(2))
+        uri = match.group(3) if match.group(3) else "/"
+    else:
+        raise ValueError("Invalid URL")
+    return host, port, uri, is_secure
+
+
+def legacy_build_request(method, host, uri, headers, body):
+    request = f"{method} {uri} HTTP/1.1\r\nHost: {host}\r\n"
+    for key, value in headers:
+        request += f"{key}: {value}\r\n"
+    request += "\r\n"
+    request += body
+    return request
+
+
+def legacy_parse_response(response):
+    header_section, body = response.split("\r\n\r\n", 1)
+    header_lines = header_section.split("\r\n")
+    status_line = header_lines[0]
+    status_code = status_line.split(" ", 1)[1]
+    response_headers = []
+    for line in header_lines[1:]:
+        key, value = line.split(": ", 1)
+        response_headers.append([key, value])
+    return status_code, response_headers, body
+
+
+def legacy_read_response(sock):
+    # Lectura del cliente original: bloques de 4096 bytes concatenados hasta el cierre
+    response = b""
+    while True:
+        data = sock.recv(4096)
+        if not data:
+            break
+        response += data
+    return legacy_parse_response(response.decode())
+
+
+def read_response(sock):
+    reader = client.ResponseReader(sock)
+    head = reader.read_head("GET")
+    return head.status, head.headers, reader.read_body(head)
+
+
+def make_inputs():
+    """
+    Construye las entradas de los benchmarks.
+    """
+    # Un crawler típico: pocas URLs distintas repetidas muchas veces
+    urls = [f"https://api.example.com:8443/v1/items/{i}?page={i % 7}" for i in range(200)]
+    urls += ["http://localhost:8080/", "http://localhost/secure", "https://example.org"]
+
+    headers = [(f"X-Custom-Header-{i}", "value-" + "x" * 40) for i in range(50)]
+    headers += [("Accept-Encoding", "gzip, deflate"), ("Authorization", "Bearer 12345")]
+    small_body = '{"probe": true}'
+
+    response_head = "HTTP/1.1 200 OK\r\n" + "".join(
+        f"X-Response-Header-{i}: value-{i}\r\n" for i in range(30)
+    ) + "Content-Type: text/plain\r\nContent-Length: 1048576\r\n\r\n"
+    large_body = "x" * (1024 * 1024)
+    return {
+        "urls": urls,
+        "headers": headers,
+        "small_body": small_body,
+        "response_head": response_head.encode(),
+        "response": (response_head + large_body).encode(),
+    }
+
+
+def check_identical(inputs):
+    """
+    Verifica que las implementaciones nuevas devuelvan lo mismo que las originales.
+    """
+    for url in inputs["urls"]:
+        assert client.parse_url(url) == legacy_parse_url(url), url
+    for body in ("", inputs["small_body"], "ñandú" * 100):
+        expected = legacy_build_request("POST", "example.com", "/a?b=1", inputs["headers"], body)
+        assert client.build_request("POST", "example.com", "/a?b=1", inputs["headers"], body) == expected
+        assert (
+            client.build_request_bytes("POST", "example.com", "/a?b=1", inputs["headers"], body)
+            == expected.encode()
+        )
+    expected_status, expected_headers, expected_body = legacy_parse_response(inputs["response"].decode())
+    head = client.parse_response_head(inputs["response_head"], "GET")
+    assert (head.status, head.headers) == (expected_status, expected_headers)
+    status, headers, body = read_response(ReplaySocket(inputs["response"]))
+    assert (status, headers) == (expected_status, expected_headers)
+    assert body == expected_body.encode()
+
+
+def measure(function, repeat):
+    """
+    Mejor tiempo por llamada (segundos) entre repeat mediciones de timeit.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run(repeat):
+    inputs = make_inputs()
+    check_identical(inputs)
+    urls, headers = inputs["urls"], inputs["headers"]
+    response_head, response = inputs["response_head"], inputs["response"]
+    cases = {
+        "parse_url": (
+            lambda: [legacy_parse_url(url) for url in urls],
+            lambda: [client.parse_url(url) for url in urls],
+        ),
+        "build_request": (
+            lambda: legacy_build_request("GET", "example.com", "/", headers, "").encode(),
+            lambda: client.build_request_bytes("GET", "example.com", "/", headers, ""),
+        ),
+        "parse_response_head": (
+            lambda: legacy_parse_response(response_head.decode()),
+            lambda: client.parse_response_head(response_head, "GET"),
+        ),
+        "read_response": (
+            lambda: legacy_read_response(ReplaySocket(response)),
+            lambda: read_response(ReplaySocket(response)),
+        ),
+    }
+    report = {}
+    for name, (legacy, current) in cases.items():
+        legacy_time = measure(legacy, repeat)
+        current_time = measure(current, repeat)
+        report[name] = {
+            "legacy_us": round(legacy_time * 1e6, 2),
+            "current_us": round(current_time * 1e6, 2),
+            "speedup": round(legacy_time / current_time, 2),
+            "gated": name in GATED_CASES,
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="client.py parsing/building microbenchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="timeit repetitions per case")
+    parser.add_argument(
+        "--min-speedup",
+        type=float,
+        default=DEFAULT_MIN_SPEEDUP,
+        help=f"Fail if a gated case ({', '.join(GATED_CASES)}) is below this speedup",
+    )
+    args = parser.parse_args()
+
+    report = run(args.repeat)
+    print(json.dumps(report, indent=2))
+    slow = [name for name in GATED_CASES if report[name]["speedup"] < args.min_speedup]
+    for name in slow:
+        print(f"no speedup: {name} ({report[name]['speedup']}x)", file=sys.stderr)
+    sys.exit(1 if slow else 0)
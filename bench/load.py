@@ -0,0 +1,464 @@
+"""
+Generador de carga para server.py: levanta el servidor en un puerto libre con cada
+modo pedido, lo carga con una mezcla de rutas de process_request y reporta en JSON
+las solicitudes por segundo y los percentiles de latencia.
+
+Modos de carga:
+  lazo cerrado -> -c conexiones que envían la siguiente solicitud al recibir la respuesta
+  lazo abierto -> --rate solicitudes por segundo a intervalos fijos; la latencia se mide
+                  desde el instante programado, por lo que incluye la espera en cola
+                  (evita la "omisión coordinada" del lazo cerrado)
+
+Uso:
+  python bench/load.py --modes threaded,pool,eventloop --keep-alive on,off -d 5 -c 16
+  python bench/load.py --rate 2000 --modes eventloop
+  python bench/load.py --client session             (mide también el costo de client.py)
+  python bench/load.py --repeat 5                   (mediana de 5 ejecuciones por configuración)
+  python bench/load.py --save-baseline bench/baseline.json
+  python bench/load.py                              (sale con código 1 si hay regresión)
+  python bench/load.py --baseline ""                (sin comparar con la línea base)
+
+bench/baseline.json es el reporte de referencia con las opciones por defecto; las
+cifras dependen de la máquina, así que antes de comparar conviene regenerarlo con
+--save-baseline en la máquina donde se mide. Una sola ejecución varía bastante más
+que la tolerancia, por lo que cada configuración se mide --repeat veces y se
+compara la mediana. Las ejecuciones con claves que no
+están en la línea base (otros modos, --rate o --client) solo se reportan.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+# Directorio con los módulos del protocolo HTTP
+HTTP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "HTTP_Protocol")
+sys.path.insert(0, HTTP_DIR)
+
+from client import ResponseReader, Session, build_request  # noqa: E402
+
+# Mezcla de rutas por defecto ("MÉTODO URI=peso"), tomada de las ramas de process_request
+DEFAULT_MIX = (
+    "GET /=40,GET /secure=15,POST /=10,POST /secure=10,"
+    "HEAD /=10,OPTIONS *=5,PUT /item=5,DELETE /item=5"
+)
+
+# Token aceptado por authoritation_process para las rutas /secure
+AUTH_TOKEN = "12345"
+
+# Percentiles reportados
+PERCENTILES = (50, 90, 99, 99.9)
+
+# Ejecuciones por configuración; se reporta la mediana
+DEFAULT_REPEAT = 3
+
+# Caída de req/s o aumento de p99 tolerados frente a la línea base (20 %)
+DEFAULT_TOLERANCE = 0.2
+
+# Reporte de referencia con el que se compara por defecto (--baseline)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Segundos máximos de espera a que el servidor empiece a aceptar conexiones
+STARTUP_TIMEOUT = 10
+
+
+def parse_mix(spec):
+    """
+    Interpreta la mezcla de rutas "GET /=60,POST /secure=10".
+
+    Retorna:
+      (rutas, pesos) -> rutas es una lista de (método, uri).
+    """
+    routes, weights = [], []
+    for item in spec.split(","):
+        route, _, weight = item.strip().rpartition("=")
+        method, _, uri = route.partition(" ")
+        routes.append((method.upper(), uri or "/"))
+        weights.append(float(weight))
+    return routes, weights
+
+
+def route_request(method, uri, keep_alive):
+    """
+    Retorna (encabezados, cuerpo) de una ruta: /secure lleva el token y POST /secure
+    un cuerpo JSON válido.
+    """
+    headers = []
+    body = ""
+    if uri.startswith("/secure"):
+        headers.append(("Authorization", f"Bearer {AUTH_TOKEN}"))
+    if method == "POST":
+        body = '{"probe": true}'
+        headers.append(("Content-Type", "application/json"))
+        headers.append(("Content-Length", str(len(body))))
+    if not keep_alive:
+        headers.append(("Connection", "close"))
+    return headers, body
+
+
+def free_port():
+    """
+    Retorna un puerto TCP libre en la interfaz local.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, port, server_args=()):
+    """
+    Lanza server.py en un proceso aparte y espera a que acepte conexiones.
+    La salida del servidor (el mensaje de inicio y, con --access-log -, el registro
+    de accesos) se descarta.
+    """
+    command = [sys.executable, "server.py", "--host", "127.0.0.1", "--port", str(port)]
+    command += ["--mode", mode, *server_args]
+    process = subprocess.Popen(
+        command, cwd=HTTP_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server.py --mode {mode} exited with code {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    stop_server(process)
+    raise RuntimeError(f"server.py --mode {mode} did not start listening")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def percentile(sorted_values, p):
+    """
+    Percentil p (0-100) por el método del rango más cercano sobre una lista ordenada.
+    """
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class RawTransport:
+    """
+    Envía solicitudes ya serializadas por un socket y lee las respuestas con
+    client.ResponseReader; mide el servidor con el menor costo posible del lado cliente.
+    """
+
+    def __init__(self, port, routes, keep_alive):
+        self.port = port
+        self.keep_alive = keep_alive
+        self.requests = []
+        for method, uri in routes:
+            headers, body = route_request(method, uri, keep_alive)
+            data = build_request(method, "127.0.0.1", uri, headers, body).encode()
+            self.requests.append((method, data))
+        self.sock = None
+        self.reader = None
+
+    def send(self, index):
+        method, data = self.requests[index]
+        if self.sock is None:
+            self.sock = socket.create_connection(("127.0.0.1", self.port))
+            self.reader = ResponseReader(self.sock)
+        try:
+            self.sock.sendall(data)
+            head = self.reader.read_head(method)
+            if head is None:
+                raise ConnectionError("Connection closed before receiving a response")
+            self.reader.read_body(head)
+        except BaseException:
+            self.close()
+            raise
+        if not self.keep_alive or not head.reusable:
+            self.close()
+        return head.status[:3]
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+class SessionTransport:
+    """
+    Envía las solicitudes con client.Session, de modo que la medición incluye el costo
+    del cliente (construcción de la solicitud, pool y lectura de la respuesta).
+    """
+
+    def __init__(self, port, routes, keep_alive):
+        self.session = Session(verbose=False)
+        self.requests = []
+        for method, uri in routes:
+            headers, body = route_request(method, uri, keep_alive)
+            url = f"http://127.0.0.1:{port}{uri if uri != '*' else '/*'}"
+            self.requests.append((method, url, headers, body))
+
+    def send(self, index):
+        method, url, headers, body = self.requests[index]
+        with self.session.send(method, url, headers, body) as response:
+            response.read()
+        return response.status_code[:3]
+
+    def close(self):
+        self.session.close()
+
+
+TRANSPORTS = {"raw": RawTransport, "session": SessionTransport}
+
+
+def run_load(port, routes, weights, concurrency, duration, rate=None, keep_alive=True,
+             transport="raw", warmup=0.5, seed=0):
+    """
+    Carga el servidor durante warmup + duration segundos y mide solo la ventana final.
+
+    Parámetros:
+      port        -> Puerto del servidor
+      routes      -> Lista de (método, uri)
+      weights     -> Peso de cada ruta en la mezcla
+      concurrency -> Conexiones (hilos) simultáneas
+      duration    -> Segundos medidos
+      rate        -> Solicitudes por segundo en lazo abierto (None para lazo cerrado)
+      keep_alive  -> Si es False cada solicitud usa una conexión nueva
+      transport   -> "raw" (sockets) o "session" (client.Session)
+      warmup      -> Segundos iniciales que no se miden
+      seed        -> Semilla de la elección de rutas
+
+    Retorna:
+      Diccionario con requests, errors, rps, statuses y latency_ms por percentil.
+    """
+    start = time.perf_counter() + 0.05  # Todos los hilos arrancan a la vez
+    measure_from = start + warmup
+    deadline = measure_from + duration
+    slot = [0]
+    slot_lock = threading.Lock()
+    results = []
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        sender = TRANSPORTS[transport](port, routes, keep_alive)
+        latencies, statuses, errors = [], {}, 0
+        choices = range(len(routes))
+        time.sleep(max(0.0, start - time.perf_counter()))
+        while True:
+            if rate:
+                # Lazo abierto: cada hilo toma el siguiente instante programado
+                with slot_lock:
+                    scheduled = start + slot[0] / rate
+                    slot[0] += 1
+                if scheduled >= deadline:
+                    break
+                time.sleep(max(0.0, scheduled - time.perf_counter()))
+            else:
+                scheduled = time.perf_counter()
+                if scheduled >= deadline:
+                    break
+            route = rng.choices(choices, weights)[0]
+            try:
+                status = sender.send(route)
+            except OSError:
+                if scheduled >= measure_from:
+                    errors += 1
+                continue
+            if scheduled >= measure_from:
+                latencies.append(time.perf_counter() - scheduled)
+                statuses[status] = statuses.get(status, 0) + 1
+        sender.close()
+        results.append((latencies, statuses, errors))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies = sorted(value for result in results for value in result[0])
+    statuses = {}
+    for _, result_statuses, _ in results:
+        for status, count in result_statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+    return {
+        "requests": len(latencies),
+        "errors": sum(result[2] for result in results),
+        "rps": round(len(latencies) / duration, 1),
+        "statuses": statuses,
+        "latency_ms": {
+            f"p{p:g}": round(percentile(latencies, p) * 1000, 3) if latencies else None
+            for p in PERCENTILES
+        },
+    }
+
+
+def median_result(runs):
+    """
+    Combina las ejecuciones de una misma configuración: req/s y cada percentil de
+    latencia son la mediana de las ejecuciones; solicitudes, errores y estados se suman.
+    """
+    if len(runs) == 1:
+        return runs[0]
+    statuses = {}
+    for run in runs:
+        for status, count in run["statuses"].items():
+            statuses[status] = statuses.get(status, 0) + count
+    latency_ms = {}
+    for key in runs[0]["latency_ms"]:
+        values = [run["latency_ms"][key] for run in runs if run["latency_ms"][key] is not None]
+        latency_ms[key] = round(statistics.median(values), 3) if values else None
+    return {
+        "requests": sum(run["requests"] for run in runs),
+        "errors": sum(run["errors"] for run in runs),
+        "rps": round(statistics.median(run["rps"] for run in runs), 1),
+        "rps_runs": [run["rps"] for run in runs],
+        "statuses": statuses,
+        "latency_ms": latency_ms,
+    }
+
+
+def result_key(result):
+    """
+    Clave con la que se compara un resultado con la línea base.
+    """
+    loop = f"open{result['rate']:g}" if result["rate"] else f"closed{result['concurrency']}"
+    keep_alive = "keepalive" if result["keep_alive"] else "close"
+    return f"{result['mode']}/{keep_alive}/{loop}/{result['client']}"
+
+
+def find_regressions(results, baseline, tolerance):
+    """
+    Compara los resultados con la línea base (mismas claves de result_key).
+
+    Retorna:
+      Lista de mensajes, uno por métrica que empeoró más que tolerance.
+    """
+    base = {result_key(result): result for result in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        key = result_key(result)
+        reference = base.get(key)
+        if reference is None:
+            print(f"no baseline for {key}", file=sys.stderr)
+            continue
+        if result["rps"] < reference["rps"] * (1 - tolerance):
+            regressions.append(f"{key}: rps {result['rps']} < baseline {reference['rps']}")
+        p99, reference_p99 = result["latency_ms"]["p99"], reference["latency_ms"]["p99"]
+        if p99 is not None and reference_p99 and p99 > reference_p99 * (1 + tolerance):
+            regressions.append(f"{key}: p99 {p99} ms > baseline {reference_p99} ms")
+        if result["errors"] > reference["errors"] and result["errors"] > result["requests"] * 0.01:
+            regressions.append(f"{key}: {result['errors']} errors")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load generator for server.py")
+    parser.add_argument(
+        "--modes", default="threaded,pool,eventloop", help="Comma-separated server modes to compare"
+    )
+    parser.add_argument(
+        "--keep-alive", default="on,off", help="Comma-separated keep-alive settings: on, off"
+    )
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="Concurrent connections")
+    parser.add_argument("-d", "--duration", type=float, default=5.0, help="Measured seconds per run")
+    parser.add_argument("--warmup", type=float, default=0.5, help="Unmeasured seconds per run")
+    parser.add_argument(
+        "--rate", type=float, default=None, help="Open-loop target req/s (closed loop if omitted)"
+    )
+    parser.add_argument("--mix", default=DEFAULT_MIX, help='Route mix, e.g., "GET /=60,POST /=40"')
+    parser.add_argument(
+        "--client", choices=sorted(TRANSPORTS), default="raw", help="Load generator transport"
+    )
+    parser.add_argument(
+        "--server-args", default="", help='Extra server.py arguments, e.g., "--workers 4"'
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT, help="Runs per configuration (median reported)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the route mix")
+    parser.add_argument("-o", "--output", help="Write the JSON report to this file")
+    parser.add_argument(
+        "--baseline",
+        default=DEFAULT_BASELINE,
+        help="Fail if results regress against this JSON report (empty to skip)",
+    )
+    parser.add_argument("--save-baseline", metavar="PATH", help="Store the JSON report as baseline")
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed regression ratio"
+    )
+    args = parser.parse_args()
+
+    routes, weights = parse_mix(args.mix)
+    results = []
+    for mode in args.modes.split(","):
+        for keep_alive in args.keep_alive.split(","):
+            runs = []
+            for _ in range(args.repeat):
+                port = free_port()
+                server = start_server(mode, port, shlex.split(args.server_args))
+                try:
+                    runs.append(
+                        run_load(
+                            port,
+                            routes,
+                            weights,
+                            args.concurrency,
+                            args.duration,
+                            args.rate,
+                            keep_alive == "on",
+                            args.client,
+                            args.warmup,
+                            args.seed,
+                        )
+                    )
+                finally:
+                    stop_server(server)
+            result = {
+                "mode": mode,
+                "keep_alive": keep_alive == "on",
+                "concurrency": args.concurrency,
+                "rate": args.rate,
+                "client": args.client,
+                **median_result(runs),
+            }
+            results.append(result)
+            print(
+                f"{result_key(result)}: {result['rps']} req/s, "
+                f"p99 {result['latency_ms']['p99']} ms, {result['errors']} errors",
+                file=sys.stderr,
+            )
+
+    report = {
+        "mix": args.mix,
+        "duration": args.duration,
+        "repeat": args.repeat,
+        "server_args": args.server_args,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = find_regressions(results, json.load(file), args.tolerance)
+        for message in regressions:
+            print(f"regression: {message}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,78 @@
+"""
+Benchmark de arranque de la CLI: mide el tiempo de `python http_terminal.py --help`
+y falla si la mediana supera el presupuesto fijado. Importar client.py no debe
+hacer operaciones de red ni cargar módulos pesados (ssl, concurrent.futures).
+
+Uso:
+  python bench/startup.py [--runs 20] [--budget 0.15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Directorio con los módulos del protocolo HTTP
+HTTP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "HTTP_Protocol")
+
+# Tiempo máximo (segundos) permitido para la mediana de `http_terminal.py --help`
+DEFAULT_BUDGET = 0.15
+
+# Módulos que no deben cargarse al importar el cliente
+HEAVY_MODULES = ("ssl", "concurrent.futures", "tempfile")
+
+
+def time_command(command, runs):
+    """
+    Ejecuta el comando runs veces y retorna la lista de duraciones en segundos.
+    """
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=HTTP_DIR, stdout=subprocess.DEVNULL, check=True)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def loaded_heavy_modules():
+    """
+    Retorna los módulos de HEAVY_MODULES que quedan cargados tras importar http_terminal.
+    """
+    code = (
+        "import sys, http_terminal; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=HTTP_DIR, capture_output=True, text=True, check=True
+    )
+    return output.stdout.split()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CLI startup benchmark")
+    parser.add_argument("--runs", type=int, default=20, help="Number of timed runs")
+    parser.add_argument(
+        "--budget", type=float, default=DEFAULT_BUDGET, help="Max median seconds for --help"
+    )
+    args = parser.parse_args()
+
+    # Referencia: arranque del intérprete sin importar nada del proyecto
+    baseline = statistics.median(time_command([sys.executable, "-c", "pass"], args.runs))
+    durations = time_command([sys.executable, "http_terminal.py", "--help"], args.runs)
+    median = statistics.median(durations)
+    heavy = loaded_heavy_modules()
+
+    print(f"interpreter startup: {baseline * 1000:.1f} ms")
+    print(f"http_terminal --help: median {median * 1000:.1f} ms, min {min(durations) * 1000:.1f} ms")
+    print(f"budget: {args.budget * 1000:.0f} ms")
+
+    failed = False
+    if median > args.budget:
+        print("FAIL: startup exceeds budget")
+        failed = True
+    if heavy:
+        print(f"FAIL: heavy modules loaded at import: {', '.join(heavy)}")
+        failed = True
+    sys.exit(1 if failed else 0)
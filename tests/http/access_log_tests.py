@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import time
+
+from harness import evaluate, exchange, print_case, summary
+
+from access_log import AccessLog
+from server import ServerConfig
+
+# Pruebas del registro de accesos: escritura final explícita, descartes, rotación
+# local y rotación hecha por otro proceso (el supervisor de multiprocess_server).
+
+directory = tempfile.mkdtemp()
+
+def log_path(name):
+    return os.path.join(directory, name)
+
+def lines(*paths):
+    total = []
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                total.extend(file.read().splitlines())
+    return total
+
+def log_requests(access_log, count, uri="/"):
+    for index in range(count):
+        access_log.log(("127.0.0.1", 5000), "GET", f"{uri}{index}", "HTTP/1.1", "200", 10, 0.001)
+
+print_case("Final flush on close", "close() writes the pending records even with a long flush interval")
+access_log = AccessLog(log_path("flush.log"), "common", flush_interval=60)
+log_requests(access_log, 100)
+access_log.close()
+evaluate(
+    "Final flush on close",
+    len(lines(log_path("flush.log"))) == 100 and access_log.written == 100 and access_log.dropped == 0,
+    (len(lines(log_path("flush.log"))), access_log.written, access_log.dropped),
+)
+
+print_case("Records after close", "Records logged after close() are counted as dropped")
+log_requests(access_log, 3)
+evaluate("Records after close", access_log.dropped == 3, access_log.dropped)
+
+print_case("Local rotation", "A single process rotates the file past max_bytes without losing records")
+access_log = AccessLog(log_path("rotate.log"), "common", flush_interval=0, flush_bytes=1, max_bytes=2000, backups=50)
+for _ in range(10):
+    log_requests(access_log, 10)
+    time.sleep(0.05)
+access_log.close()
+rotated = [log_path("rotate.log")] + [log_path(f"rotate.log.{index}") for index in range(1, 51)]
+evaluate(
+    "Local rotation",
+    os.path.exists(log_path("rotate.log.1")) and len(lines(*rotated)) == 100,
+    len(lines(*rotated)),
+)
+
+print_case("Supervisor rotation", "Two writers share one file; only a third instance rotates it and the writers reopen")
+path = log_path("shared.log")
+writers = [AccessLog(path, "common", flush_interval=0, flush_bytes=1, max_bytes=1) for _ in range(2)]
+for writer in writers:
+    writer.external_rotation = True
+supervisor = AccessLog(path, "common", max_bytes=1, backups=5)
+for index, writer in enumerate(writers):
+    log_requests(writer, 5, f"/before{index}-")
+time.sleep(0.2)
+supervisor.rotate_if_needed()
+for index, writer in enumerate(writers):
+    log_requests(writer, 5, f"/after{index}-")
+for writer in writers:
+    writer.close()
+before, after = lines(path + ".1"), lines(path)
+evaluate(
+    "Supervisor rotation",
+    len(before) == 10 and all("/before" in line for line in before)
+    and len(after) == 10 and all("/after" in line for line in after)
+    and not os.path.exists(path + ".2"),
+    (len(before), len(after)),
+)
+
+print_case("Server access log", "handle_client logs the request line, status and User-Agent")
+access_log = AccessLog(log_path("server.log"), "combined")
+config = ServerConfig(metrics=False, access_log=access_log)
+exchange([b"GET /secure HTTP/1.1\r\nHost: x\r\nUser-Agent: probe/1.0\r\nConnection: close\r\n\r\n"], config)
+access_log.close()
+logged = lines(log_path("server.log"))
+evaluate(
+    "Server access log",
+    len(logged) == 1 and '"GET /secure HTTP/1.1" 401' in logged[0] and logged[0].endswith('"probe/1.0"'),
+    logged,
+)
+
+shutil.rmtree(directory)
+
+summary()
@@ -0,0 +1,75 @@
+import asyncio
+
+from harness import evaluate, print_case, scripted_handler, start_listener, start_server, summary
+
+import async_client
+from server import ServerConfig
+
+# Pruebas del cliente asyncio: solicitudes concurrentes sobre conexiones reutilizadas
+# y reintento ante conexiones cerradas por el servidor.
+
+async def run_session(port, requests, timeout):
+    """
+    Envía las solicitudes en orden por una misma AsyncSession.
+
+    Retorna:
+      Lista con el código de estado o la excepción de cada solicitud.
+    """
+    outcomes = []
+    async with async_client.AsyncSession(timeout=timeout) as session:
+        for method in requests:
+            try:
+                status, _, _ = await session.request(
+                    method, f"http://127.0.0.1:{port}/", body="x" if method == "POST" else ""
+                )
+                outcomes.append(status)
+            except Exception as e:
+                outcomes.append(e)
+    return outcomes
+
+def run(action, requests, timeout=async_client.DEFAULT_TIMEOUT):
+    received = []
+    listener, port, accepted = start_listener(scripted_handler(action, received))
+    outcomes = asyncio.run(run_session(port, requests, timeout))
+    listener.close()
+    return outcomes, len(accepted), received
+
+config = ServerConfig(metrics=False)
+
+print_case("Concurrent requests", "gather_requests over 20 URLs with at most 4 in flight")
+listener, port, accepted = start_server(config)
+results = asyncio.run(async_client.gather_requests([f"http://127.0.0.1:{port}/"] * 20, concurrency=4))
+listener.close()
+evaluate(
+    "Concurrent requests",
+    all(not isinstance(result, BaseException) and result[0].startswith("200") for result in results)
+    and len(accepted) <= 4,
+    f"connections accepted: {len(accepted)}",
+)
+
+print_case("Stale connection retry", "A GET whose reused connection closes without a response is sent again")
+outcomes, connections, received = run("close", ["GET", "GET"])
+evaluate(
+    "Stale connection retry",
+    outcomes == ["200 OK", "200 OK"] and connections == 2 and len(received) == 3,
+    (outcomes, connections, received),
+)
+
+print_case("No POST retry", "A POST whose reused connection closes after sending it is not sent again")
+outcomes, connections, received = run("close", ["GET", "POST"])
+evaluate(
+    "No POST retry",
+    outcomes[0] == "200 OK" and isinstance(outcomes[1], Exception)
+    and received.count(b"POST / HTTP/1.1") == 1,
+    (outcomes, connections, received),
+)
+
+print_case("No retry on timeout", "A GET that times out on a reused connection is not sent again")
+outcomes, connections, received = run("hang", ["GET", "GET"], timeout=0.5)
+evaluate(
+    "No retry on timeout",
+    outcomes[0] == "200 OK" and isinstance(outcomes[1], asyncio.TimeoutError) and connections == 1,
+    (outcomes, connections, received),
+)
+
+summary()
@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+
+from harness import evaluate, print_case, read_request, start_listener, summary
+
+import client
+from http_cache import HTTPCache
+
+# Pruebas de la caché del cliente: respuestas frescas sin contactar al servidor,
+# revalidación con 304, no-store, Vary y cuerpos grandes guardados en disco.
+
+LARGE_BODY = b"0123456789abcdef" * 32 * 1024  # 512 KB
+
+# Encabezados de cada ruta del servidor de prueba
+ROUTES = {
+    "/fresh": ['Cache-Control: max-age=60', 'ETag: "fresh-1"'],
+    "/stale": ['Cache-Control: no-cache', 'ETag: "stale-1"'],
+    "/nostore": ["Cache-Control: no-store"],
+    "/vary": ["Cache-Control: max-age=60", "Vary: Accept-Language"],
+    "/large": ["Cache-Control: max-age=60"],
+}
+
+requests_seen = []  # (uri, If-None-Match) de cada solicitud que llegó al servidor
+
+def handler(connection, address):
+    with connection:
+        while True:
+            head = read_request(connection)
+            if head is None:
+                return
+            lines = head.decode().split("\r\n")
+            uri = lines[0].split(" ")[1]
+            if_none_match = None
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                if name.lower() == "if-none-match":
+                    if_none_match = value.strip()
+            requests_seen.append((uri, if_none_match))
+
+            headers = ROUTES[uri]
+            etag = next((header.split(": ", 1)[1] for header in headers if header.startswith("ETag")), None)
+            if etag is not None and if_none_match == etag:
+                status, body = "304 Not Modified", b""
+            else:
+                status, body = "200 OK", LARGE_BODY if uri == "/large" else f"body of {uri}".encode()
+            response = f"HTTP/1.1 {status}\r\n" + "".join(header + "\r\n" for header in headers)
+            if status.startswith("200"):
+                response += f"Content-Length: {len(body)}\r\n"
+            connection.sendall(response.encode() + b"\r\n" + body)
+
+listener, port, _ = start_listener(handler)
+base = f"http://127.0.0.1:{port}"
+disk_dir = tempfile.mkdtemp()
+cache = HTTPCache(disk_dir=disk_dir, mmap_threshold=256 * 1024)
+session = client.Session(verbose=False, cache=cache)
+
+def fetch(uri, headers=""):
+    requests_seen.clear()
+    results = [session.request("GET", base + uri, headers) for _ in range(2)]
+    return results, list(requests_seen)
+
+print_case("Fresh hit", "A response with max-age is reused without contacting the server")
+results, seen = fetch("/fresh")
+evaluate(
+    "Fresh hit",
+    [result[2] for result in results] == ["body of /fresh"] * 2 and seen == [("/fresh", None)] and cache.hits == 1,
+    seen,
+)
+
+print_case("Revalidation", "A no-cache response is revalidated with If-None-Match and a 304 reuses the body")
+results, seen = fetch("/stale")
+evaluate(
+    "Revalidation",
+    [result[:1] + result[2:] for result in results] == [("200 OK", "body of /stale")] * 2
+    and seen == [("/stale", None), ("/stale", '"stale-1"')]
+    and cache.revalidations == 1,
+    (results, seen),
+)
+
+print_case("No-store", "A no-store response is fetched from the server every time")
+results, seen = fetch("/nostore")
+evaluate("No-store", seen == [("/nostore", None)] * 2, seen)
+
+print_case("Vary", "A cached response is reused only for the same Accept-Language")
+requests_seen.clear()
+for language in ("es", "es", "en"):
+    session.request("GET", base + "/vary", [("Accept-Language", language)])
+evaluate("Vary", [uri for uri, _ in requests_seen] == ["/vary", "/vary"], requests_seen)
+
+print_case("Disk cache", "A large body is stored on disk, served from the mapped file and removed by clear()")
+results, seen = fetch("/large")
+stored = os.listdir(disk_dir)
+with session.stream("GET", base + "/large") as response:
+    pieces = list(response.iter_content(chunk_size=64 * 1024))
+cache.clear()
+evaluate(
+    "Disk cache",
+    all(result[2].encode() == LARGE_BODY for result in results)
+    and seen == [("/large", None)]
+    and len(stored) == 1
+    and b"".join(pieces) == LARGE_BODY
+    and os.listdir(disk_dir) == [],
+    (seen, stored),
+)
+
+session.close()
+listener.close()
+shutil.rmtree(disk_dir)
+
+summary()
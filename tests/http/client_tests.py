@@ -0,0 +1,76 @@
+from harness import evaluate, print_case, scripted_handler, start_listener, start_server, summary
+
+import client
+from server import ServerConfig
+
+# Pruebas del pool de conexiones del cliente: reutilización de conexiones y
+# reintento ante conexiones cerradas por el servidor.
+
+class ShortTimeoutPool(client.ConnectionPool):
+    # Reduce el timeout de los sockets para no esperar los 10 segundos por defecto
+    def acquire(self, host, port, is_secure):
+        sock, reused = super().acquire(host, port, is_secure)
+        sock.settimeout(0.5)
+        return sock, reused
+
+def run(action, requests, pool=None):
+    """
+    Envía las solicitudes por una misma Session al manejador guionado.
+
+    Retorna:
+      (resultados o excepción de cada solicitud, conexiones aceptadas, líneas de solicitud recibidas)
+    """
+    received = []
+    listener, port, accepted = start_listener(scripted_handler(action, received))
+    session = client.Session(pool if pool is not None else client.ConnectionPool(), verbose=False)
+    outcomes = []
+    for method in requests:
+        try:
+            outcomes.append(session.request(method, f"http://127.0.0.1:{port}/", body="x" if method == "POST" else "")[0])
+        except Exception as e:
+            outcomes.append(e)
+    session.close()
+    listener.close()
+    return outcomes, len(accepted), received
+
+config = ServerConfig(metrics=False)
+
+print_case("Keep-alive reuse", "Two requests from a client Session share one TCP connection")
+listener, port, accepted = start_server(config)
+session = client.Session(client.ConnectionPool(), verbose=False)
+first = session.request("GET", f"http://127.0.0.1:{port}/")
+second = session.request("GET", f"http://127.0.0.1:{port}/")
+session.close()
+listener.close()
+evaluate(
+    "Keep-alive reuse",
+    first[0].startswith("200") and second[0].startswith("200") and len(accepted) == 1,
+    f"connections accepted: {len(accepted)}",
+)
+
+print_case("Stale connection retry", "A GET whose reused connection closes without a response is sent again")
+outcomes, connections, received = run("close", ["GET", "GET"])
+evaluate(
+    "Stale connection retry",
+    outcomes == ["200 OK", "200 OK"] and connections == 2 and len(received) == 3,
+    (outcomes, connections, received),
+)
+
+print_case("No POST retry", "A POST whose reused connection closes after sending it is not sent again")
+outcomes, connections, received = run("close", ["GET", "POST"])
+evaluate(
+    "No POST retry",
+    outcomes[0] == "200 OK" and isinstance(outcomes[1], ConnectionError)
+    and received.count(b"POST / HTTP/1.1") == 1,
+    (outcomes, connections, received),
+)
+
+print_case("No retry on timeout", "A GET that times out on a reused connection is not sent again")
+outcomes, connections, received = run("hang", ["GET", "GET"], ShortTimeoutPool())
+evaluate(
+    "No retry on timeout",
+    outcomes[0] == "200 OK" and isinstance(outcomes[1], TimeoutError) and connections == 1,
+    (outcomes, connections, received),
+)
+
+summary()
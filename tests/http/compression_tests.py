@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+
+from harness import evaluate, exchange, print_case, start_server, status_lines, summary
+
+import client
+from compression import decompress, negotiate_encoding
+from server import ServerConfig
+
+# Pruebas de la compresión de respuestas: negociación de Accept-Encoding, archivos
+# estáticos comprimidos, respuestas sin comprimir y decodificación en el cliente.
+
+def split_response(response):
+    """
+    Retorna (diccionario de encabezados en minúsculas, cuerpo) de una respuesta.
+    """
+    head, _, body = response.partition(b"\r\n\r\n")
+    headers = {}
+    for line in head.split(b"\r\n")[1:]:
+        key, _, value = line.partition(b":")
+        headers[key.strip().lower().decode()] = value.strip().decode()
+    return headers, body
+
+print_case("Encoding negotiation", "Accept-Encoding values with q-values, wildcards and refusals")
+cases = {
+    "gzip": "gzip",
+    "gzip;q=0.5, deflate": "deflate",
+    "gzip;q=0, deflate;q=0": None,
+    "identity": None,
+    "GZIP": "gzip",
+    "": None,
+}
+negotiated = {value: negotiate_encoding(value) for value in cases}
+evaluate("Encoding negotiation", negotiated == cases and negotiate_encoding("*") is not None, negotiated)
+
+document_root = tempfile.mkdtemp()
+text = ("line of compressible text\n" * 2000).encode()
+with open(os.path.join(document_root, "page.txt"), "wb") as file:
+    file.write(text)
+with open(os.path.join(document_root, "image.png"), "wb") as file:
+    file.write(os.urandom(4096))
+config = ServerConfig(metrics=False, document_root=document_root)
+
+def get(uri, extra_headers=b""):
+    return exchange(
+        [b"GET " + uri + b" HTTP/1.1\r\nHost: x\r\n" + extra_headers + b"Connection: close\r\n\r\n"], config
+    )
+
+print_case("Compressed static file", "GET /page.txt with accept-encoding: gzip")
+headers, body = split_response(get(b"/page.txt", b"accept-encoding: gzip\r\n"))
+evaluate(
+    "Compressed static file",
+    headers.get("content-encoding") == "gzip"
+    and headers.get("vary") == "Accept-Encoding"
+    and headers.get("etag", "").endswith('-gzip"')
+    and int(headers["content-length"]) == len(body) < len(text)
+    and decompress(body, "gzip") == text,
+    headers,
+)
+
+print_case("Identity without Accept-Encoding", "GET /page.txt without Accept-Encoding is sent as is")
+headers, body = split_response(get(b"/page.txt"))
+evaluate(
+    "Identity without Accept-Encoding",
+    "content-encoding" not in headers and body == text,
+    headers,
+)
+
+print_case("Incompressible type", "GET /image.png with Accept-Encoding: gzip is not compressed")
+headers, body = split_response(get(b"/image.png", b"Accept-Encoding: gzip\r\n"))
+evaluate("Incompressible type", "content-encoding" not in headers and len(body) == 4096, headers)
+
+print_case("Range without compression", "A Range request is answered from the identity representation")
+response = get(b"/page.txt", b"Accept-Encoding: gzip\r\nRange: bytes=0-3\r\n")
+headers, body = split_response(response)
+evaluate(
+    "Range without compression",
+    status_lines(response) == [b"HTTP/1.1 206 Partial Content"] and "content-encoding" not in headers and body == b"line",
+    headers,
+)
+
+print_case("Client decoding", "client.Session announces Accept-Encoding and decodes the compressed body")
+listener, port, _ = start_server(config)
+with client.Session(verbose=False) as session:
+    with session.stream("GET", f"http://127.0.0.1:{port}/page.txt") as response:
+        content_encoding = response.head.fields.get("content-encoding")
+        decoded = response.read()
+listener.close()
+evaluate("Client decoding", content_encoding in ("br", "gzip", "deflate") and decoded == text, content_encoding)
+
+shutil.rmtree(document_root)
+
+summary()
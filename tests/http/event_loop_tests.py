@@ -0,0 +1,122 @@
+import errno
+from threading import Thread
+
+from harness import connect, evaluate, free_port, print_case, read_all, status_lines, summary
+
+import event_loop
+from event_loop import Connection, TimerWheel, accept_connections, run_event_loop_server
+from server import ServerConfig
+
+# Pruebas del servidor con bucle de eventos: rueda de temporizadores, errores de
+# accept() y aislamiento de los errores de cada conexión.
+
+class Timed:
+    # Sustituto de Connection con solo los atributos que usa la rueda
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.timer_tick = None
+
+def expire_ticks(wheel, start, until, step):
+    """
+    Avanza la rueda de step en step desde start hasta until.
+
+    Retorna:
+      Diccionario id(conexión) -> instante en que venció.
+    """
+    expired = {}
+    now = start
+    while now <= until:
+        for conn in wheel.expire(now):
+            expired[id(conn)] = now
+        now += step
+    return expired
+
+print_case("TimerWheel expiry", "Deadlines expire at their tick, never early, including beyond one wheel turn")
+wheel = TimerWheel(0.0, resolution=0.25, slots=8)
+near, later, far = Timed(0.6), Timed(1.1), Timed(5.0)
+for conn in (near, later, far):
+    wheel.schedule(conn)
+expired = expire_ticks(wheel, 0.0, 6.0, 0.25)
+evaluate(
+    "TimerWheel expiry",
+    0.6 <= expired.get(id(near), -1) < 0.6 + 0.5
+    and 1.1 <= expired.get(id(later), -1) < 1.1 + 0.5
+    and 5.0 <= expired.get(id(far), -1) < 5.0 + 0.5,
+    expired,
+)
+
+print_case("TimerWheel reschedule", "Postponed deadlines move later, advanced ones earlier, closed ones never expire")
+wheel = TimerWheel(0.0, resolution=0.25, slots=8)
+postponed, advanced, closed = Timed(0.5), Timed(3.0), Timed(0.5)
+for conn in (postponed, advanced, closed):
+    wheel.schedule(conn)
+postponed.deadline = 2.0  # Se pospone sin tocar la rueda
+advanced.deadline = 1.0
+wheel.schedule(advanced)  # Adelantar agrega una entrada nueva
+closed.timer_tick = None  # Lo que hace close_connection
+expired = expire_ticks(wheel, 0.0, 4.0, 0.25)
+evaluate(
+    "TimerWheel reschedule",
+    2.0 <= expired.get(id(postponed), -1) < 2.5
+    and 1.0 <= expired.get(id(advanced), -1) < 1.5
+    and id(closed) not in expired,
+    expired,
+)
+
+class FailingListener:
+    # Socket de escucha que falla con los errores indicados y luego no tiene conexiones
+    def __init__(self, errors):
+        self.errors = list(errors)
+
+    def accept(self):
+        if self.errors:
+            raise OSError(self.errors.pop(0), "simulated")
+        raise BlockingIOError
+
+print_case("Accept errors", "ECONNABORTED is skipped; EMFILE and ENFILE pause accepting instead of raising")
+outcomes = []
+for errors in ([errno.ECONNABORTED], [errno.EMFILE], [errno.ENFILE]):
+    try:
+        outcomes.append(accept_connections(None, FailingListener(errors), ServerConfig(metrics=False)))
+    except OSError as e:
+        outcomes.append(e)
+evaluate("Accept errors", outcomes == [False, True, True], outcomes)
+
+# Servidor completo en un hilo sobre un puerto libre
+port = free_port()
+
+process_request = event_loop.process_request
+
+def failing_process_request(request, config):
+    if request.uri == "/boom":
+        raise RuntimeError("handler failure")
+    return process_request(request, config)
+
+event_loop.process_request = failing_process_request
+Thread(
+    target=run_event_loop_server, args=("127.0.0.1", port), kwargs={"config": ServerConfig(metrics=False)}, daemon=True
+).start()
+
+def fetch(raw):
+    with connect(port) as sock:
+        sock.sendall(raw)
+        return read_all(sock)
+
+print_case("Event loop pipelining", "GET / and GET /secure sent in one segment")
+response = fetch(b"GET / HTTP/1.1\r\nHost: x\r\n\r\nGET /secure HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+evaluate(
+    "Event loop pipelining",
+    status_lines(response) == [b"HTTP/1.1 200 OK", b"HTTP/1.1 401 Unauthorized"],
+    status_lines(response),
+)
+
+print_case("Handler failure isolation", "An exception serving one connection answers 500 and the loop keeps serving")
+failed = fetch(b"GET /boom HTTP/1.1\r\nHost: x\r\n\r\n")
+after = fetch(b"GET / HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+evaluate(
+    "Handler failure isolation",
+    status_lines(failed) == [b"HTTP/1.1 500 Internal Server Error"] and status_lines(after) == [b"HTTP/1.1 200 OK"],
+    (status_lines(failed), status_lines(after)),
+)
+
+summary()
@@ -0,0 +1,179 @@
+import os, sys
+import re
+import socket
+import time
+from threading import Thread
+
+# Agrega la carpeta "HTTP_Protocol" al sys.path
+ruta_actual = os.path.dirname(os.path.abspath(__file__))
+ruta_repo = os.path.abspath(os.path.join(ruta_actual, '..', '..'))
+sys.path.append(os.path.join(ruta_repo, "HTTP_Protocol"))
+
+from server import create_server_socket, handle_client
+
+# Utilidades compartidas por las pruebas de comportamiento (*_tests.py). Ninguna
+# necesita el servidor del puerto 8080: cada caso atiende sus conexiones con
+# handle_client sobre un par de sockets locales o un puerto efímero.
+
+# Almacena los resultados de las pruebas
+results = []
+
+def print_case(case, description):
+    print(f"\n👉 \033[1mCase: {case}\033[0m")
+    print(f"   📝 {description}")
+
+def evaluate(case, success, detail=""):
+    results.append({"case": case, "status": "Success" if success else "Failed", "detail": detail})
+    if success:
+        print(f"   ✅ \033[92mSuccess\033[0m")
+    else:
+        print(f"   ❌ \033[91mFailed\033[0m {detail}")
+
+def exchange(segments, config, pause=0.0):
+    """
+    Envía los segmentos a handle_client por un par de sockets y retorna todos los
+    bytes recibidos hasta que el servidor cierra la conexión.
+    """
+    server_side, client_side = socket.socketpair()
+    thread = Thread(target=handle_client, args=(server_side, config), daemon=True)
+    thread.start()
+    client_side.settimeout(10)
+    for segment in segments:
+        client_side.sendall(segment)
+        time.sleep(pause)
+    received = []
+    while True:
+        data = client_side.recv(65536)
+        if not data:
+            break
+        received.append(data)
+    client_side.close()
+    thread.join(10)
+    return b"".join(received)
+
+def status_lines(response):
+    # Una respuesta encadenada empieza justo tras el cuerpo de la anterior, sin salto de línea
+    return re.findall(rb"HTTP/1\.1 \d{3}[^\r\n]*", response)
+
+def free_port():
+    """
+    Retorna un puerto TCP libre de 127.0.0.1 para los servidores que crean su propio socket.
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+def connect(port, attempts=50):
+    """
+    Se conecta a 127.0.0.1:port, reintentando mientras el servidor aún no escucha.
+    """
+    for _ in range(attempts - 1):
+        try:
+            return socket.create_connection(("127.0.0.1", port), timeout=5)
+        except ConnectionRefusedError:
+            time.sleep(0.05)
+    return socket.create_connection(("127.0.0.1", port), timeout=5)
+
+def read_all(sock):
+    """
+    Retorna todos los bytes recibidos hasta que el servidor cierra la conexión.
+    """
+    received = b""
+    while True:
+        data = sock.recv(65536)
+        if not data:
+            return received
+        received += data
+
+def start_listener(handler):
+    """
+    Escucha en un puerto efímero de 127.0.0.1 y atiende cada conexión en un hilo
+    con handler(socket, dirección).
+
+    Retorna:
+      (socket de escucha, puerto, lista de direcciones aceptadas)
+    """
+    listener = create_server_socket("127.0.0.1", 0)
+    accepted = []
+
+    def accept_loop():
+        while True:
+            try:
+                connection, address = listener.accept()
+            except OSError:
+                return
+            accepted.append(address)
+            Thread(target=handler, args=(connection, address), daemon=True).start()
+
+    Thread(target=accept_loop, daemon=True).start()
+    return listener, listener.getsockname()[1], accepted
+
+def start_server(config):
+    """
+    Igual que start_listener, atendiendo cada conexión con handle_client.
+    """
+    return start_listener(lambda connection, address: handle_client(connection, config, address))
+
+# Respuesta mínima de los manejadores guionados
+SCRIPTED_RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+
+def read_request(connection):
+    """
+    Lee una solicitud completa (encabezados y cuerpo con Content-Length).
+
+    Retorna:
+      Los bytes de la solicitud, o None si el cliente cerró la conexión.
+    """
+    data = b""
+    while b"\r\n\r\n" not in data:
+        chunk = connection.recv(65536)
+        if not chunk:
+            return None
+        data += chunk
+    head, _, body = data.partition(b"\r\n\r\n")
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    while len(body) < length:
+        body += connection.recv(65536)
+    return head
+
+def scripted_handler(action, received):
+    """
+    Crea un manejador para start_listener que responde la primera solicitud de cada
+    conexión y no responde la segunda: con action "close" cierra la conexión y con
+    "hang" la mantiene abierta sin responder. Las líneas de solicitud se agregan a received.
+    """
+    def handler(connection, address):
+        with connection:
+            for index in range(2):
+                request = read_request(connection)
+                if request is None:
+                    return
+                received.append(request.split(b"\r\n", 1)[0])
+                if index == 0:
+                    connection.sendall(SCRIPTED_RESPONSE)
+                elif action == "close":
+                    return
+                else:
+                    time.sleep(2)
+                    return
+    return handler
+
+def summary():
+    print("\n🎉 \033[1mTest Summary\033[0m 🎉")
+    total_cases = len(results)
+    success_cases = sum(1 for result in results if result["status"] == "Success")
+    failed_cases = total_cases - success_cases
+
+    print(f"   ✅ Successful cases: {success_cases}/{total_cases}")
+
+    if failed_cases > 0:
+        print(f"   ❌ Failed cases: {failed_cases}/{total_cases}")
+        print("\n📋 \033[1mFailed Cases Details:\033[0m")
+        for result in results:
+            if result["status"] == "Failed":
+                print(f"   ❌ {result['case']}: {result['detail']}")
+        sys.exit(1)
@@ -0,0 +1,35 @@
+from harness import evaluate, exchange, print_case, status_lines, summary
+
+from request_parser import ParseError, RequestParser
+from server import ServerConfig
+
+# Pruebas de los límites de tamaño y de tiempo de las solicitudes (413, 431 y 408).
+
+print_case("Oversize body", "Content-Length above max_body_size is rejected before the body arrives")
+parser = RequestParser(max_body_size=100)
+parser.feed(b"POST / HTTP/1.1\r\nContent-Length: 101\r\n\r\n")
+try:
+    parsed = parser.next_request()
+except ParseError as e:
+    parsed = e.status
+evaluate("Oversize body", isinstance(parsed, str) and parsed.startswith("413"), parsed)
+
+limited = ServerConfig(metrics=False, max_header_size=1024, max_body_size=100, header_timeout=0.3, body_timeout=0.3)
+
+print_case("431 response", "Request headers larger than max_header_size")
+response = exchange([b"GET / HTTP/1.1\r\nX-Big: " + b"a" * 2048 + b"\r\n\r\n"], limited)
+evaluate("431 response", status_lines(response) == [b"HTTP/1.1 431 Request Header Fields Too Large"], status_lines(response))
+
+print_case("413 response", "Content-Length larger than max_body_size")
+response = exchange([b"POST / HTTP/1.1\r\nHost: x\r\nContent-Length: 1000\r\n\r\n"], limited)
+evaluate("413 response", status_lines(response) == [b"HTTP/1.1 413 Content Too Large"], status_lines(response))
+
+print_case("408 response", "Headers that never finish within header_timeout")
+response = exchange([b"GET / HTTP/1.1\r\nHost: x\r\n"], limited)
+evaluate("408 response", status_lines(response) == [b"HTTP/1.1 408 Request Timeout"], status_lines(response))
+
+print_case("408 on a slow body", "A body that stops arriving within body_timeout")
+response = exchange([b"POST / HTTP/1.1\r\nHost: x\r\nContent-Length: 50\r\n\r\nabc"], limited)
+evaluate("408 on a slow body", status_lines(response) == [b"HTTP/1.1 408 Request Timeout"], status_lines(response))
+
+summary()
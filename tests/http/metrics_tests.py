@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+
+from harness import evaluate, exchange, print_case, summary
+
+import metrics
+from access_log import AccessLog
+from server import ServerConfig
+
+# Pruebas de GET /metrics: formato de texto de Prometheus, contadores por método,
+# ruta y estado, etiquetas de ruta acotadas, métricas del pool y del registro de
+# accesos, y la opción metrics=False.
+
+def get(uri, config):
+    request = f"GET {uri} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode()
+    return exchange([request], config)
+
+def scrape(config):
+    head, _, body = get("/metrics", config).partition(b"\r\n\r\n")
+    return head.decode(), body.decode()
+
+def value(text, series):
+    """
+    Retorna el valor de la serie (nombre con etiquetas) en el texto exportado, o None.
+    """
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+ROOT_SERIES = 'http_requests_total{method="GET",route="/",status="200"}'
+config = ServerConfig()
+
+print_case("Exposition format", "GET /metrics answers Prometheus text with HELP/TYPE lines and histograms")
+get("/", config)
+head, body = scrape(config)
+evaluate(
+    "Exposition format",
+    head.startswith("HTTP/1.1 200")
+    and f"Content-Type: {metrics.CONTENT_TYPE}" in head
+    and "# TYPE http_requests_total counter" in body
+    and "# TYPE http_request_parse_seconds histogram" in body
+    and 'http_request_handle_seconds_bucket{route="/",le="+Inf"}' in body
+    and all(f"# TYPE {name}" in body for name in ("http_pool_queue_depth", "http_pool_active", "http_pool_rejected_total")),
+    body[:500],
+)
+
+print_case("Request counters", "Each request increments its method/route/status counter; any path maps to route \"/\"")
+before = value(scrape(config)[1], ROOT_SERIES) or 0
+get("/", config)
+get("/some/unknown/path", config)
+_, body = scrape(config)
+evaluate(
+    "Request counters",
+    value(body, ROOT_SERIES) == before + 2 and "/some/unknown/path" not in body,
+    (before, value(body, ROOT_SERIES)),
+)
+
+print_case("Access log metric", "With an access log the dropped-records counter is exported")
+directory = tempfile.mkdtemp()
+access_log = AccessLog(os.path.join(directory, "access.log"), "common")
+_, body = scrape(ServerConfig(access_log=access_log))
+access_log.close()
+shutil.rmtree(directory)
+_, without_log = scrape(config)
+evaluate(
+    "Access log metric",
+    value(body, "http_access_log_dropped_total") == 0 and "http_access_log_dropped_total" not in without_log,
+    body[-300:],
+)
+
+print_case("Metrics disabled", "With metrics=False there is no /metrics route and requests are not counted")
+disabled = ServerConfig(metrics=False)
+before = value(scrape(config)[1], ROOT_SERIES)
+head, body = scrape(disabled)
+get("/", disabled)
+evaluate(
+    "Metrics disabled",
+    "http_requests_total" not in body and value(scrape(config)[1], ROOT_SERIES) == before,
+    (head, body[:200]),
+)
+
+summary()
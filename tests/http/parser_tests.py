@@ -0,0 +1,98 @@
+from harness import evaluate, exchange, print_case, status_lines, summary
+
+from request_parser import ParseError, RequestParser
+from server import ServerConfig
+
+# Pruebas del análisis incremental de solicitudes y del pipelining en handle_client.
+
+def parse_all(parser):
+    try:
+        return [(request.method, request.uri, request.body) for request in parser]
+    except ParseError as e:
+        return e.status
+
+config = ServerConfig(metrics=False)
+pipelined = (
+    b"POST /a HTTP/1.1\r\nHost: x\r\nContent-Length: 5\r\n\r\nhello"
+    b"GET /b HTTP/1.1\r\nHost: x\r\n\r\n"
+    b"GET /c HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"
+)
+expected_requests = [("POST", "/a", b"hello"), ("GET", "/b", b""), ("GET", "/c", b"")]
+
+# Analizador incremental
+print_case("Pipelined requests in one segment", "Three requests fed to RequestParser at once")
+parser = RequestParser()
+parser.feed(pipelined)
+parsed = parse_all(parser)
+evaluate("Pipelined requests in one segment", parsed == expected_requests, parsed)
+
+print_case("Pipelined requests split across segments", "The same bytes fed to RequestParser one byte at a time")
+parser = RequestParser()
+parsed = []
+for index in range(len(pipelined)):
+    parser.feed(pipelined[index:index + 1])
+    parsed.extend(parse_all(parser))
+evaluate(
+    "Pipelined requests split across segments",
+    parsed == expected_requests and not parser.has_pending_data(),
+    parsed,
+)
+
+print_case("Oversize head", "Headers larger than max_header_size, with and without their terminator")
+parser = RequestParser(max_header_size=1024)
+parser.feed(b"GET / HTTP/1.1\r\nX-Big: " + b"a" * 2048)
+unterminated = parse_all(parser)
+parser = RequestParser(max_header_size=1024)
+parser.feed(b"GET / HTTP/1.1\r\nX-Big: " + b"a" * 2048 + b"\r\n\r\n")
+terminated = parse_all(parser)
+evaluate(
+    "Oversize head",
+    unterminated.startswith("431") and terminated.startswith("431"),
+    (unterminated, terminated),
+)
+
+print_case("Invalid Content-Length", "Non-ASCII digits and conflicting repeated values are rejected with 400")
+statuses = []
+for head in (
+    "POST / HTTP/1.1\r\nContent-Length: ²\r\n\r\n".encode(),
+    b"POST / HTTP/1.1\r\nContent-Length: 5\r\nContent-Length: 50\r\n\r\nhello",
+):
+    parser = RequestParser()
+    parser.feed(head)
+    statuses.append(parse_all(parser))
+parser = RequestParser()
+parser.feed(b"POST / HTTP/1.1\r\nContent-Length: 5\r\nContent-Length: 5\r\n\r\nhello")
+repeated = parse_all(parser)
+evaluate(
+    "Invalid Content-Length",
+    statuses == ["400 Bad Request", "400 Bad Request"] and repeated == [("POST", "/", b"hello")],
+    (statuses, repeated),
+)
+
+# Servidor (handle_client)
+print_case("Pipelined responses in order", "GET / and GET /secure sent in one segment")
+response = exchange(
+    [b"GET / HTTP/1.1\r\nHost: x\r\n\r\nGET /secure HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"],
+    config,
+)
+lines = status_lines(response)
+evaluate(
+    "Pipelined responses in order",
+    lines == [b"HTTP/1.1 200 OK", b"HTTP/1.1 401 Unauthorized"]
+    and response.find(b"Welcome") < response.find(b"Authorization header missing"),
+    lines,
+)
+
+print_case("Request split across segments", "A POST whose headers and body arrive in separate segments")
+response = exchange(
+    [b"POST / HTTP/1.1\r\nHo", b"st: x\r\nContent-Length: 4\r\nConnection: close\r\n\r\nab", b"cd"],
+    config,
+    pause=0.05,
+)
+evaluate("Request split across segments", status_lines(response) == [b"HTTP/1.1 200 OK"], status_lines(response))
+
+print_case("Non-ASCII Content-Length", "handle_client answers 400 and closes instead of failing the handler")
+response = exchange(["POST / HTTP/1.1\r\nHost: x\r\nContent-Length: ²\r\n\r\n".encode()], config)
+evaluate("Non-ASCII Content-Length", status_lines(response) == [b"HTTP/1.1 400 Bad Request"], status_lines(response))
+
+summary()
@@ -0,0 +1,57 @@
+from harness import evaluate, print_case, read_request, start_listener, start_server, summary
+
+import client
+from server import DEFAULT_CONFIG
+
+# Pruebas de la API de pipelining del cliente: orden de las respuestas, una sola
+# conexión para todo el pipeline, reenvío de las solicitudes sin respuesta cuando el
+# servidor cierra la conexión y rechazo de los métodos no idempotentes.
+
+print_case("Pipeline", "Pipelined requests share one connection and keep the request order")
+listener, port, accepted = start_server(DEFAULT_CONFIG)
+session = client.Session(verbose=False)
+results = client.pipeline(f"127.0.0.1:{port}", session).get("/").head("/").head("/").get("/").execute()
+evaluate(
+    "Pipeline",
+    [status[:3] for status, _, _ in results] == ["200"] * 4
+    and [body for _, _, body in results] == ["<h1>Welcome</h1>", "", "", "<h1>Welcome</h1>"]
+    and len(accepted) == 1,
+    (results, accepted),
+)
+session.close()
+listener.close()
+
+print_case("Pipeline fallback", "Requests left unanswered when the server closes are sent again on a new connection")
+requests_seen = []  # (conexión, uri) de cada solicitud respondida
+
+def closing_handler(connection, address):
+    # Responde una sola solicitud por conexión y la cierra sin leer el resto del pipeline
+    with connection:
+        head = read_request(connection)
+        if head is None:
+            return
+        uri = head.split(b"\r\n", 1)[0].split(b" ")[1].decode()
+        requests_seen.append((address, uri))
+        connection.sendall(f"HTTP/1.1 200 OK\r\nContent-Length: {len(uri)}\r\n\r\n{uri}".encode())
+
+listener, port, accepted = start_listener(closing_handler)
+session = client.Session(verbose=False)
+results = client.pipeline(f"127.0.0.1:{port}", session).get("/a").get("/b").get("/c").execute()
+evaluate(
+    "Pipeline fallback",
+    [body for _, _, body in results] == ["/a", "/b", "/c"]
+    and [uri for _, uri in requests_seen] == ["/a", "/b", "/c"]
+    and len(accepted) == 3,
+    (results, requests_seen),
+)
+session.close()
+listener.close()
+
+print_case("Non-idempotent methods", "POST cannot be added to a pipeline")
+try:
+    client.pipeline("127.0.0.1:1", client.Session(verbose=False)).get("/").request("POST", "/", "", "data")
+    evaluate("Non-idempotent methods", False, "POST accepted")
+except ValueError as error:
+    evaluate("Non-idempotent methods", "POST" in str(error), str(error))
+
+summary()
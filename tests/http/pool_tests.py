@@ -0,0 +1,56 @@
+import time
+from threading import Thread
+
+from harness import connect, evaluate, free_port, print_case, read_all, status_lines, summary
+
+from server import PoolCounters, ServerConfig, run_pool_server
+
+# Pruebas del modo pool: control de admisión con 503 cuando no hay hilo libre ni
+# lugar en la cola, y atención de las conexiones encoladas al liberarse un hilo.
+
+port = free_port()
+counters = PoolCounters()
+Thread(
+    target=run_pool_server,
+    args=("127.0.0.1", port),
+    kwargs={"workers": 1, "queue_size": 1, "counters": counters, "config": ServerConfig(metrics=False)},
+    daemon=True,
+).start()
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+print_case("Pool admission", "With one worker and one queue slot, a third connection is answered 503")
+busy = connect(port)  # Ocupa el único hilo mientras no envía nada
+wait_for(lambda: counters.snapshot()["active"] == 1)
+queued = connect(port)
+wait_for(lambda: counters.snapshot()["queue_depth"] == 1)
+rejected = connect(port)
+response = read_all(rejected)
+rejected.close()
+evaluate(
+    "Pool admission",
+    status_lines(response) == [b"HTTP/1.1 503 Service Unavailable"] and counters.snapshot()["rejected"] == 1,
+    (status_lines(response), counters.snapshot()),
+)
+
+print_case("Queued connection served", "The queued connection is served once the worker is free")
+busy.sendall(b"GET / HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+first = read_all(busy)
+queued.sendall(b"GET / HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+second = read_all(queued)
+busy.close()
+queued.close()
+wait_for(lambda: counters.snapshot()["completed"] == 2)
+evaluate(
+    "Queued connection served",
+    status_lines(first) == [b"HTTP/1.1 200 OK"]
+    and status_lines(second) == [b"HTTP/1.1 200 OK"]
+    and counters.snapshot() == {"queue_depth": 0, "active": 0, "completed": 2, "rejected": 1},
+    counters.snapshot(),
+)
+
+summary()
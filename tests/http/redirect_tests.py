@@ -0,0 +1,112 @@
+from harness import evaluate, print_case, read_request, start_listener, summary
+
+import client
+
+# Pruebas de las redirecciones del cliente: el mapa de redirecciones permanentes
+# (301/308 recordados por la sesión), la conservación del método en 307/308 y la
+# detección de ciclos y cadenas demasiado largas.
+
+# uri -> (estado, Location)
+REDIRECTS = {
+    "/old": ("301 Moved Permanently", "/new"),
+    "/moved-post": ("308 Permanent Redirect", "/echo"),
+    "/temp-post": ("307 Temporary Redirect", "/echo"),
+    "/see-other": ("303 See Other", "/echo"),
+    "/loop-a": ("302 Found", "/loop-b"),
+    "/loop-b": ("302 Found", "/loop-a"),
+}
+
+requests_seen = []  # (método, uri) de cada solicitud que llegó al servidor
+
+def handler(connection, address):
+    with connection:
+        while True:
+            head = read_request(connection)
+            if head is None:
+                return
+            method, uri, _ = head.split(b"\r\n", 1)[0].decode().split(" ")
+            requests_seen.append((method, uri))
+            if uri in REDIRECTS:
+                status, location = REDIRECTS[uri]
+                response = f"HTTP/1.1 {status}\r\nLocation: {location}\r\nContent-Length: 0\r\n\r\n"
+            elif uri.startswith("/chain/"):
+                # Cadena sin fin: /chain/1 -> /chain/2 -> ...
+                following = int(uri.rsplit("/", 1)[1]) + 1
+                response = f"HTTP/1.1 302 Found\r\nLocation: /chain/{following}\r\nContent-Length: 0\r\n\r\n"
+            else:
+                body = f"{method} {uri}"
+                response = f"HTTP/1.1 200 OK\r\nContent-Length: {len(body)}\r\n\r\n{body}"
+            connection.sendall(response.encode())
+
+listener, port, _ = start_listener(handler)
+base = f"http://127.0.0.1:{port}"
+session = client.Session(verbose=False, max_redirects=5)
+
+def fetch(method, uri, body=""):
+    requests_seen.clear()
+    return session.request(method, base + uri, "", body)[2]
+
+print_case("Permanent redirect", "A 301 is remembered: the second GET goes straight to the target")
+first, second = fetch("GET", "/old"), fetch("GET", "/old")
+evaluate(
+    "Permanent redirect",
+    first == second == "GET /new"
+    and requests_seen == [("GET", "/new")]
+    and session.permanent_redirects.get(base + "/old") == ("301", base + "/new"),
+    (requests_seen, session.permanent_redirects),
+)
+
+print_case("Permanent redirect method", "A remembered 301 is not applied to POST; a 308 keeps method and body")
+requests_seen.clear()
+status = session.request("POST", base + "/old", "", "data")[0]
+post_seen = list(requests_seen)
+first, second = fetch("POST", "/moved-post", "data"), fetch("POST", "/moved-post", "data")
+evaluate(
+    "Permanent redirect method",
+    status.startswith("301")
+    and post_seen == [("POST", "/old")]
+    and first == second == "POST /echo"
+    and requests_seen == [("POST", "/echo")],
+    (status, post_seen, requests_seen),
+)
+
+print_case("Temporary redirects", "A 307 keeps the method and is not remembered; a 303 switches to GET")
+temporary = [fetch("POST", "/temp-post", "data") for _ in range(2)]
+temporary_seen = list(requests_seen)
+see_other = fetch("POST", "/see-other", "data")
+evaluate(
+    "Temporary redirects",
+    temporary == ["POST /echo"] * 2
+    and temporary_seen == [("POST", "/temp-post"), ("POST", "/echo")]
+    and base + "/temp-post" not in session.permanent_redirects
+    and see_other == "GET /echo",
+    (temporary, temporary_seen, see_other),
+)
+
+def raises(method, uri):
+    try:
+        fetch(method, uri)
+    except ValueError as error:
+        return str(error)
+    return None
+
+print_case("Redirect loop", "A redirect back to an already visited URL raises ValueError")
+error = raises("GET", "/loop-a")
+evaluate(
+    "Redirect loop",
+    error is not None and "loop" in error and requests_seen == [("GET", "/loop-a"), ("GET", "/loop-b")],
+    (error, requests_seen),
+)
+
+print_case("Too many redirects", "A chain longer than max_redirects raises ValueError after max_redirects + 1 requests")
+error = raises("GET", "/chain/1")
+evaluate(
+    "Too many redirects",
+    error == "Too many redirects" and len(requests_seen) == session.max_redirects + 1,
+    (error, requests_seen),
+)
+
+session.close()
+listener.close()
+
+summary()
@@ -17,4 +17,15 @@ if [[ $? -ne 0 ]]; then
   exit 1
 fi
 
+# Pruebas de comportamiento (no usan el servidor iniciado arriba)
+for test_file in ./tests/http/*_tests.py; do
+  python3 "$test_file"
+
+  if [[ $? -ne 0 ]]; then
+    echo "HTTP behaviour tests failed: $test_file"
+    kill $SERVER_PID
+    exit 1
+  fi
+done
+
 kill $SERVER_PID
\ No newline at end of file
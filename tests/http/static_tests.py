@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+
+from harness import evaluate, exchange, print_case, status_lines, summary
+
+import static_files
+from server import ServerConfig
+
+# Pruebas de los archivos estáticos: rangos, solicitudes condicionales, rutas con
+# bytes nulos y caché de rutas resueltas.
+
+document_root = tempfile.mkdtemp()
+with open(os.path.join(document_root, "file.txt"), "wb") as file:
+    file.write(b"0123456789" * 10)
+static = ServerConfig(metrics=False, document_root=document_root, compression=False)
+
+def get(extra_headers=b""):
+    return exchange(
+        [b"GET /file.txt HTTP/1.1\r\nHost: x\r\n" + extra_headers + b"Connection: close\r\n\r\n"], static
+    )
+
+def header_value(response, name):
+    for line in response.partition(b"\r\n\r\n")[0].split(b"\r\n"):
+        key, _, value = line.partition(b":")
+        if key.lower() == name:
+            return value.strip()
+    return None
+
+print_case("Range request", "GET /file.txt with Range: bytes=10-19")
+response = get(b"Range: bytes=10-19\r\n")
+head, _, body = response.partition(b"\r\n\r\n")
+evaluate(
+    "Range request",
+    status_lines(response) == [b"HTTP/1.1 206 Partial Content"]
+    and b"Content-Range: bytes 10-19/100" in head
+    and body == b"0123456789",
+    (status_lines(response), body),
+)
+
+print_case("Lowercase Range header", "GET /file.txt with range: bytes=0-4")
+response = get(b"range: bytes=0-4\r\n")
+evaluate(
+    "Lowercase Range header",
+    status_lines(response) == [b"HTTP/1.1 206 Partial Content"] and response.endswith(b"\r\n\r\n01234"),
+    status_lines(response),
+)
+
+etag = header_value(get(), b"etag")
+
+print_case("If-None-Match request", "GET /file.txt with the ETag of a previous response")
+response = get(b"If-None-Match: " + etag + b"\r\n")
+evaluate(
+    "If-None-Match request",
+    status_lines(response) == [b"HTTP/1.1 304 Not Modified"] and response.endswith(b"\r\n\r\n"),
+    status_lines(response),
+)
+
+print_case("Lowercase If-None-Match header", "GET /file.txt with if-none-match and the same ETag")
+response = get(b"if-none-match: " + etag + b"\r\n")
+evaluate("Lowercase If-None-Match header", status_lines(response) == [b"HTTP/1.1 304 Not Modified"], status_lines(response))
+
+print_case("NUL byte in path", "GET /file.txt%00.png falls through to the non-file route")
+response = exchange([b"GET /file.txt%00.png HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"], static)
+evaluate("NUL byte in path", status_lines(response) == [b"HTTP/1.1 200 OK"], status_lines(response))
+
+print_case("Resolved path cache", "Repeated lookups of one URI resolve the path only once within the TTL")
+calls = []
+realpath = os.path.realpath
+os.path.realpath = lambda path: calls.append(path) or realpath(path)
+try:
+    paths = {static_files.resolve_path(document_root, "/cached.txt?v=" + str(index)) for index in range(5)}
+finally:
+    os.path.realpath = realpath
+evaluate(
+    "Resolved path cache",
+    paths == {os.path.join(realpath(document_root), "cached.txt")} and len(calls) == 2,
+    f"realpath calls: {len(calls)}",
+)
+
+shutil.rmtree(document_root)
+
+summary()
@@ -0,0 +1,102 @@
+from harness import evaluate, exchange, print_case, start_server, status_lines, summary
+
+import client
+from responses import STREAM_BUFFER_SIZE
+from server import ServerConfig
+
+# Pruebas de las respuestas en streaming: cuerpos chunked para HTTP/1.1, cuerpos
+# delimitados por el cierre para HTTP/1.0 y lectura por partes en el cliente.
+
+config = ServerConfig(metrics=False, compression=False)
+payload = b"abcdefghij" * 20000  # 200 KB, por encima de STREAM_MIN_SIZE
+expected = b"POST request successful! Plain text body received: " + payload + b"."
+
+def post(version):
+    return exchange(
+        [
+            b"POST /secure " + version + b"\r\nHost: x\r\nAuthorization: Bearer 12345\r\n"
+            b"Content-Length: " + str(len(payload)).encode() + b"\r\nConnection: close\r\n\r\n" + payload
+        ],
+        config,
+    )
+
+def dechunk(body):
+    """
+    Retorna (cuerpo reensamblado, tamaños de los fragmentos) o None si la delimitación es inválida.
+    """
+    data, sizes, position = b"", [], 0
+    while True:
+        end = body.find(b"\r\n", position)
+        if end < 0:
+            return None
+        size = int(body[position:end], 16)
+        if size == 0:
+            return (data, sizes) if body[end + 2:] == b"\r\n" else None
+        data += body[end + 2:end + 2 + size]
+        sizes.append(size)
+        position = end + 2 + size + 2
+
+print_case("Chunked response", "A large POST /secure echo over HTTP/1.1 is sent chunked in bounded pieces")
+response = post(b"HTTP/1.1")
+head, _, body = response.partition(b"\r\n\r\n")
+decoded = dechunk(body)
+evaluate(
+    "Chunked response",
+    status_lines(response) == [b"HTTP/1.1 200 OK"]
+    and b"Transfer-Encoding: chunked" in head
+    and b"Content-Length" not in head
+    and decoded is not None
+    and decoded[0] == expected
+    and max(decoded[1]) <= STREAM_BUFFER_SIZE,
+    head,
+)
+
+print_case("HTTP/1.0 streaming", "The same echo for an HTTP/1.0 client is delimited by closing the connection")
+response = post(b"HTTP/1.0")
+head, _, body = response.partition(b"\r\n\r\n")
+evaluate(
+    "HTTP/1.0 streaming",
+    b"Transfer-Encoding" not in head and b"Connection: close" in head and body == expected,
+    head,
+)
+
+print_case("Chunked TRACE echo", "TRACE with a large header block is echoed through the streaming path")
+big_header = b"X-Filler: " + b"f" * (70 * 1024) + b"\r\n"
+request = b"TRACE / HTTP/1.1\r\nHost: x\r\n" + big_header + b"Connection: close\r\n\r\n"
+response = exchange([request], ServerConfig(metrics=False, compression=False, max_header_size=128 * 1024))
+head, _, body = response.partition(b"\r\n\r\n")
+decoded = dechunk(body)
+evaluate(
+    "Chunked TRACE echo",
+    b"Transfer-Encoding: chunked" in head and decoded is not None and decoded[0] == request,
+    head[:80],
+)
+
+listener, port, accepted = start_server(config)
+url = f"http://127.0.0.1:{port}/secure"
+headers = [("Authorization", "Bearer 12345")]
+
+print_case("Client streaming", "Session.stream yields the chunked body in pieces of at most chunk_size")
+with client.Session(verbose=False) as session:
+    with session.stream("POST", url, headers, payload.decode()) as response:
+        pieces = list(response.iter_content(chunk_size=8192))
+evaluate(
+    "Client streaming",
+    b"".join(pieces) == expected and max(len(piece) for piece in pieces) <= 8192 and len(pieces) > 1,
+    f"{len(pieces)} pieces",
+)
+
+print_case("Client keep-alive after chunked body", "A fully read chunked response leaves the connection reusable")
+connections_before = len(accepted)
+with client.Session(verbose=False) as session:
+    first = session.request("POST", url, headers, payload.decode())
+    second = session.request("GET", f"http://127.0.0.1:{port}/")
+connections = len(accepted) - connections_before
+evaluate(
+    "Client keep-alive after chunked body",
+    first[0] == "200 OK" and first[2].encode() == expected and second[0] == "200 OK" and connections == 1,
+    f"connections: {connections}",
+)
+listener.close()
+
+summary()
@@ -1,5 +1,6 @@
 import os, sys
 import json
+import re
 
 # Obtén la ruta absoluta del directorio actual (donde está test.py)
 ruta_actual = os.path.dirname(os.path.abspath(__file__))
@@ -14,12 +15,19 @@ sys.path.append(ruta_client)
 # Importa la función request desde client.py
 from client import request
 
+def unescape_shell(text):
+    r"""
+    Quita las barras invertidas de escape de shell (\" -> ", \  -> espacio).
+    """
+    return re.sub(r"\\(.)", r"\1", text)
+
 def make_request(method, path, headers=None, data=None):
     # Construye la URL completa
     url = f"http://localhost:8080{path}"
     
-    # Convierte los encabezados de JSON a un diccionario si se proporcionan
-    headers_dict = json.loads(headers) if headers else {}
+    # Los encabezados llegan escapados como en la línea de comandos ({\"Clave\":\ \"valor\"}):
+    # se quitan las barras de escape antes de convertirlos de JSON a un diccionario
+    headers_dict = json.loads(unescape_shell(headers)) if headers else {}
     
     # Realiza la solicitud HTTP utilizando la función request del cliente
     status, response_headers, body = request(method, url, headers=headers_dict, body=data)